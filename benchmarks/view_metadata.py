@@ -0,0 +1,87 @@
+"""
+Benchmark ViewMetadata construction from the "values" wire format.
+
+Compares the single-pass model validator with the previous __init__ based
+conversion for views with many fields. The time of each path is also shown
+relative to the legacy __init__; model_validate is the path parse_response
+takes.
+
+Usage:
+    python -m benchmarks.view_metadata [--fields 250] [--objects 2000]
+"""
+import argparse
+import timeit
+from typing import Any
+
+from pythonik.models.metadata.views import MetadataValues, ViewMetadata
+
+
+class LegacyViewMetadata(ViewMetadata):
+    """ViewMetadata as constructed before the model validator was added"""
+
+    def __init__(self, **data: Any) -> None:
+        if "metadata_values" not in data or data["metadata_values"] is None:
+            metadata_values = {}
+            has_values = any(
+                "values" in item for item in data.values() if isinstance(item, dict)
+            )
+            if has_values:
+                for key, value in list(data.items()):
+                    if isinstance(value, dict) and "values" in value:
+                        values_list = value.get("values", [])
+                        if values_list is None:
+                            metadata_values[key] = {"field_values": None}
+                        else:
+                            metadata_values[key] = {"field_values": values_list}
+                data["metadata_values"] = MetadataValues(root=metadata_values)
+        super().__init__(**data)
+
+
+def make_payload(fields: int) -> dict:
+    payload = {
+        "date_created": "2024-01-01T00:00:00Z",
+        "date_modified": "2024-01-01T00:00:00Z",
+        "object_id": "c3c8d1c4-0000-0000-0000-000000000000",
+        "object_type": "assets",
+        "version_id": "c3c8d1c4-0000-0000-0000-000000000001",
+    }
+    for i in range(fields):
+        if i % 3 == 0:
+            values = [{"value": f"tag-{i}-{j}"} for j in range(3)]
+        elif i % 3 == 1:
+            values = [{"value": i}]
+        else:
+            values = None
+        payload[f"field_{i}"] = {"values": values}
+    return payload
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--fields", type=int, default=250)
+    parser.add_argument("--objects", type=int, default=2000)
+    args = parser.parse_args()
+
+    payload = make_payload(args.fields)
+    expected = ViewMetadata(**payload).model_dump()
+    assert LegacyViewMetadata(**dict(payload)).model_dump() == expected
+
+    runs = {
+        "legacy __init__": lambda: LegacyViewMetadata(**dict(payload)),
+        "model validator": lambda: ViewMetadata(**payload),
+        "model_validate": lambda: ViewMetadata.model_validate(payload),
+    }
+    print(f"{args.objects} objects with {args.fields} fields each")
+    legacy = None
+    for name, run in runs.items():
+        seconds = min(timeit.repeat(run, number=args.objects, repeat=3))
+        legacy = legacy or seconds
+        print(
+            f"{name:>16}: {seconds:.3f}s "
+            f"({args.objects / seconds:,.0f} objects/s, "
+            f"{seconds / legacy:.2f}x legacy time)"
+        )
+
+
+if __name__ == "__main__":
+    main()
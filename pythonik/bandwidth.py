@@ -0,0 +1,209 @@
+import threading
+import time
+from collections import deque
+from enum import IntEnum
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, Optional
+
+
+DEFAULT_QUANTUM = 64 * 1024
+
+
+class Priority(IntEnum):
+    """Priority classes for the bandwidth scheduler, most urgent first."""
+
+    CONTROL = 0  # Iconik API calls, never delayed
+    INTERACTIVE = 1  # transfers someone is waiting on
+    BULK = 2  # background transfers, use whatever capacity is left
+
+
+class TokenBucket:
+    """
+    A token bucket refilled at `rate` tokens per second, holding at most
+    `burst` seconds worth of tokens. Not thread safe on its own. `clock`
+    returns the current time in seconds.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = self.rate * burst
+        self.tokens = self.capacity
+        self._clock = clock
+        self._updated = clock()
+
+    def refill(self) -> None:
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` tokens are available, 0 if they already are"""
+        self.refill()
+        return max(0.0, (min(amount, self.capacity) - self.tokens) / self.rate)
+
+    def consume(self, amount: float) -> None:
+        """Take `amount` tokens, possibly going into debt"""
+        self.refill()
+        self.tokens -= amount
+
+
+class RateLimiter:
+    """
+    Thread-safe limiter allowing `rate` operations per second, with bursts
+    of up to `burst` seconds worth of operations.
+    """
+
+    def __init__(self, rate: float, burst: float = 1.0):
+        self._bucket = TokenBucket(rate, burst)
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until one more operation may start"""
+        while True:
+            with self._lock:
+                wait = self._bucket.wait_time(1)
+                if wait == 0:
+                    self._bucket.consume(1)
+                    return
+            time.sleep(wait)
+
+
+class BandwidthScheduler:
+    """
+    Byte-rate scheduler shared by every transfer of a client.
+
+    Transfers call `acquire` before moving bytes. Bytes are granted in
+    quanta, strictly by priority class and round-robin between the waiting
+    transfers of a class, so concurrent transfers get a fair share of the
+    capacity. CONTROL traffic (API requests) is never delayed, but it is
+    counted against the overall cap so bulk transfers only get the capacity
+    it leaves over.
+
+    Args:
+        max_bytes_per_second: Overall cap, None for no overall cap
+        priority_limits: Optional cap in bytes per second per priority class
+        burst: Seconds worth of bytes that can be sent at once after idling
+        quantum: Largest number of bytes granted to a transfer in one turn
+        clock: Time source in seconds, time.monotonic by default
+    """
+
+    def __init__(
+        self,
+        max_bytes_per_second: Optional[float] = None,
+        priority_limits: Optional[Dict[Priority, float]] = None,
+        burst: float = 1.0,
+        quantum: int = DEFAULT_QUANTUM,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._total = (
+            TokenBucket(max_bytes_per_second, burst, clock)
+            if max_bytes_per_second
+            else None
+        )
+        self._classes = {
+            Priority(priority): TokenBucket(limit, burst, clock)
+            for priority, limit in (priority_limits or {}).items()
+        }
+        self.quantum = quantum
+        self._condition = threading.Condition()
+        self._queues = {priority: deque() for priority in Priority}
+        self.bytes_granted = {priority: 0 for priority in Priority}
+
+    @property
+    def limited(self) -> bool:
+        return self._total is not None or bool(self._classes)
+
+    def acquire(self, nbytes: int, priority: Priority = Priority.BULK) -> None:
+        """Block until `nbytes` may be sent or received at `priority`"""
+        if nbytes <= 0:
+            return
+        if not self.limited or priority == Priority.CONTROL:
+            with self._condition:
+                self._debit(nbytes, priority)
+            return
+
+        ticket = object()
+        queue = self._queues[priority]
+        remaining = nbytes
+        with self._condition:
+            queue.append(ticket)
+            try:
+                while remaining > 0:
+                    piece = min(remaining, self.quantum)
+                    wait = self._wait_time(ticket, piece, priority)
+                    if wait == 0:
+                        self._debit(piece, priority)
+                        remaining -= piece
+                        # go to the back of the line so others get a turn
+                        queue.popleft()
+                        if remaining > 0:
+                            queue.append(ticket)
+                        self._condition.notify_all()
+                    else:
+                        self._wait(wait)
+            finally:
+                if ticket in queue:
+                    queue.remove(ticket)
+                    self._condition.notify_all()
+
+    def _wait_time(self, ticket, piece: int, priority: Priority) -> Optional[float]:
+        """How long `ticket` should wait before taking `piece` bytes, None if it's not its turn"""
+        for more_urgent in Priority:
+            if more_urgent >= priority:
+                break
+            # more urgent transfers go first unless their own class cap holds them back
+            class_bucket = self._classes.get(more_urgent)
+            if self._queues[more_urgent] and (
+                class_bucket is None or class_bucket.wait_time(self.quantum) == 0
+            ):
+                return None
+        if self._queues[priority][0] is not ticket:
+            return None
+
+        buckets = [self._total, self._classes.get(priority)]
+        return max(
+            (bucket.wait_time(piece) for bucket in buckets if bucket is not None),
+            default=0.0,
+        )
+
+    def _wait(self, timeout: Optional[float]) -> None:
+        """Wait, holding the condition, until woken or `timeout` seconds passed"""
+        self._condition.wait(timeout)
+
+    def _debit(self, nbytes: int, priority: Priority) -> None:
+        self.bytes_granted[priority] += nbytes
+        for bucket in (self._total, self._classes.get(priority)):
+            if bucket is not None:
+                bucket.consume(nbytes)
+
+    def throttle(
+        self, chunks: Iterable[bytes], priority: Priority = Priority.BULK
+    ) -> Iterator[bytes]:
+        """Yield `chunks`, pacing them to the scheduler"""
+        for chunk in chunks:
+            self.acquire(len(chunk), priority)
+            yield chunk
+
+    def reader(self, stream: BinaryIO, priority: Priority = Priority.BULK) -> "ThrottledReader":
+        """Wrap a binary stream so reads from it are paced to the scheduler"""
+        return ThrottledReader(stream, self, priority)
+
+
+class ThrottledReader:
+    """File-like wrapper whose `read` waits for the bandwidth scheduler."""
+
+    def __init__(self, stream: BinaryIO, scheduler: BandwidthScheduler, priority: Priority):
+        self._stream = stream
+        self._scheduler = scheduler
+        self._priority = priority
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._stream.read(size)
+        self._scheduler.acquire(len(data), self._priority)
+        return data
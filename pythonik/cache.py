@@ -0,0 +1,278 @@
+import hashlib
+import json
+import re
+import threading
+import time
+from calendar import timegm
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, Union
+
+
+DEFAULT_SCHEMA_TTL = 300.0
+DEFAULT_SEARCH_TTL = 30.0
+DEFAULT_SEARCH_CACHE_BYTES = 64 * 1024 * 1024
+# keep signed URLs from being served this close to their expiry
+SIGNED_URL_MARGIN = 5.0
+
+_EXPIRES_PATTERN = re.compile(r"[?&]Expires=(\d+)")
+_DURATION_PATTERN = re.compile(
+    r"[?&]X-(?:Goog|Amz)-Date=(\d{8}T\d{6}Z)[^\s\"']*?[?&]X-(?:Goog|Amz)-Expires=(\d+)"
+    r"|[?&]X-(?:Goog|Amz)-Expires=(\d+)[^\s\"']*?[?&]X-(?:Goog|Amz)-Date=(\d{8}T\d{6}Z)"
+)
+
+
+class CacheEntry:
+    """A cached API response together with its parsed model."""
+
+    __slots__ = ("response", "data", "stored_at", "etag", "last_modified")
+
+    def __init__(self, response: Any, data: Any):
+        self.response = response
+        self.data = data
+        self.stored_at = time.monotonic()
+        headers = getattr(response, "headers", None) or {}
+        self.etag = headers.get("ETag")
+        self.last_modified = headers.get("Last-Modified")
+
+    def age(self) -> float:
+        return time.monotonic() - self.stored_at
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Headers asking the server to answer 304 if the entry is still current"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class SchemaCache:
+    """
+    Thread-safe cache for metadata views and fields.
+
+    Entries are served for `ttl` seconds. With `revalidate`, an expired entry
+    that carried an ETag or Last-Modified header is revalidated with a
+    conditional GET instead of being fetched again. MetadataSpec invalidates
+    entries when views or fields are changed through the same client.
+
+    Cached responses and models are shared between callers and must be
+    treated as read-only.
+
+    Args:
+        ttl: Seconds an entry is served without asking the server
+        revalidate: Whether to revalidate expired entries with conditional GETs
+    """
+
+    def __init__(self, ttl: float = DEFAULT_SCHEMA_TTL, revalidate: bool = False):
+        self.ttl = ttl
+        self.revalidate = revalidate
+        self._entries: Dict[Tuple[Hashable, ...], CacheEntry] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+
+    def get(self, key: Tuple[Hashable, ...]) -> Optional[CacheEntry]:
+        """Return the entry for `key`, fresh or not"""
+        with self._lock:
+            return self._entries.get(key)
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        return entry.age() < self.ttl
+
+    def put(self, key: Tuple[Hashable, ...], response: Any, data: Any) -> CacheEntry:
+        entry = CacheEntry(response, data)
+        with self._lock:
+            self._entries[key] = entry
+        return entry
+
+    def touch(self, key: Tuple[Hashable, ...]) -> None:
+        """Mark the entry for `key` as fresh again, e.g. after a 304"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.stored_at = time.monotonic()
+
+    def invalidate(self, kind: Optional[str] = None, name: Optional[str] = None) -> None:
+        """
+        Drop cached entries.
+
+        Args:
+            kind: Only drop entries of this kind ("view", "views", "field" or
+                "fields"), or everything if None
+            name: Only drop entries for this view ID or field name
+        """
+        with self._lock:
+            if kind is None:
+                self._entries.clear()
+                return
+            for key in list(self._entries):
+                if key[0] == kind and (name is None or key[1] == name):
+                    del self._entries[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _canonical_json(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def search_cache_key(
+    body: Union[Dict[str, Any], str],
+    params: Optional[Dict[str, Any]],
+    identity: Optional[Dict[str, Any]] = None,
+) -> str:
+    """
+    Canonical hash of a dumped search body, its query parameters and the
+    identity of the caller, e.g. the URL and credentials the search is sent
+    with, so callers with different credentials never share an entry. The
+    body may also be given as canonical JSON, e.g. CompiledSearch.json.
+    """
+    body_json = body if isinstance(body, str) else _canonical_json(body)
+    canonical = (
+        f"[{body_json},{_canonical_json(params or {})},"
+        f"{_canonical_json(identity or {})}]"
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def signed_url_expiry(text: str) -> Optional[float]:
+    """
+    Earliest expiry, as a Unix timestamp, of the signed GCS or S3 URLs in
+    `text`, or None if it contains none.
+    """
+    expiries = [float(match) for match in _EXPIRES_PATTERN.findall(text)]
+    for date_a, expires_a, expires_b, date_b in _DURATION_PATTERN.findall(text):
+        signed_at = timegm(time.strptime(date_a or date_b, "%Y%m%dT%H%M%SZ"))
+        expiries.append(signed_at + float(expires_a or expires_b))
+    return min(expiries, default=None)
+
+
+class _SearchEntry:
+    __slots__ = ("response", "data", "size", "expires_at")
+
+    def __init__(self, response: Any, data: Any, size: int, expires_at: float):
+        self.response = response
+        self.data = data
+        self.size = size
+        self.expires_at = expires_at
+
+
+class SearchCache:
+    """
+    Thread-safe cache of search responses, keyed by a canonical hash of the
+    search body, query parameters and the URL and credentials (App-ID and
+    Auth-Token) of the search.
+
+    Entries are served for `ttl` seconds, or until shortly before the
+    earliest expiry of the signed URLs they contain, if that is sooner.
+    When the expiry of requested signed URLs cannot be read from the
+    response, `signed_url_ttl` applies instead. The least recently used
+    entries are evicted once the cached response bodies exceed `max_bytes`.
+    Concurrent identical searches share a single request.
+
+    Cached responses and models are shared between callers and must be
+    treated as read-only.
+
+    Args:
+        ttl: Seconds an entry is served
+        max_bytes: Most bytes of response bodies kept
+        signed_url_ttl: Seconds an entry with signed URLs of unknown expiry
+            is served
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_SEARCH_TTL,
+        max_bytes: int = DEFAULT_SEARCH_CACHE_BYTES,
+        signed_url_ttl: float = DEFAULT_SEARCH_TTL,
+    ):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.signed_url_ttl = signed_url_ttl
+        self._entries: "OrderedDict[str, _SearchEntry]" = OrderedDict()
+        self._in_flight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.shared = 0
+
+    def get_or_fetch(
+        self,
+        key: str,
+        fetch: Callable[[], Tuple[Any, Any]],
+        signed_urls: bool = False,
+    ) -> Tuple[Any, Any]:
+        """
+        Return the cached (response, data) for `key`, calling `fetch` on a
+        miss. Only one call to `fetch` runs per key at a time; concurrent
+        callers wait for it and share its result.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry.response, entry.data
+                self._remove(key)
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self._in_flight[key] = Future()
+                self.misses += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            response, data = fetch()
+        except BaseException as e:
+            with self._lock:
+                del self._in_flight[key]
+            future.set_exception(e)
+            raise
+        with self._lock:
+            del self._in_flight[key]
+            if response.ok:
+                self._store(key, response, data, signed_urls)
+        future.set_result((response, data))
+        return response, data
+
+    def _store(self, key: str, response: Any, data: Any, signed_urls: bool) -> None:
+        size = len(response.content or b"")
+        if size > self.max_bytes:
+            return
+        now = time.monotonic()
+        ttl = self.ttl
+        if signed_urls:
+            expiry = signed_url_expiry(response.text)
+            if expiry is None:
+                ttl = min(ttl, self.signed_url_ttl)
+            else:
+                ttl = min(ttl, expiry - time.time() - SIGNED_URL_MARGIN)
+        if ttl <= 0:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = _SearchEntry(response, data, size, now + ttl)
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: str) -> None:
+        self.bytes -= self._entries.pop(key).size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,13 +1,19 @@
+from typing import Optional
+
 from urllib3.util import Retry
 from requests import Session
 from requests.adapters import HTTPAdapter
 
+from pythonik.bandwidth import BandwidthScheduler
+from pythonik.cache import SchemaCache, SearchCache
+from pythonik.models.search.profile import SearchProfile
 from pythonik.specs.assets import AssetSpec
 from pythonik.specs.files import FilesSpec
 from pythonik.specs.jobs import JobSpec
 from pythonik.specs.metadata import MetadataSpec
 from pythonik.specs.search import SearchSpec
 from pythonik.specs.collection import CollectionSpec
+from pythonik.stats import MetadataStats
 
 
 # Iconik APIs
@@ -16,7 +22,38 @@ class PythonikClient:
     Iconik Client
     """
 
-    def __init__(self, app_id: str, auth_token: str, timeout: int, base_url: str  = "https://app.iconik.io" ):
+    def __init__(
+        self,
+        app_id: str,
+        auth_token: str,
+        timeout: int,
+        base_url: str = "https://app.iconik.io",
+        max_bandwidth: Optional[float] = None,
+        bandwidth: Optional[BandwidthScheduler] = None,
+        schema_cache: Optional[SchemaCache] = None,
+        search_cache: Optional[SearchCache] = None,
+        search_profile: Optional[SearchProfile] = None,
+    ):
+        """
+        Args:
+            app_id: Iconik application ID
+            auth_token: Iconik auth token
+            timeout: Request timeout in seconds
+            base_url: Base URL of the Iconik environment
+            max_bandwidth: Overall cap in bytes per second for transfers to and
+                from storage, shared by every transfer made through this client;
+                no BandwidthScheduler is created without it or `bandwidth`
+            bandwidth: A BandwidthScheduler to use instead of creating one from
+                max_bandwidth, e.g. to share a cap between clients or to set
+                per-priority limits
+            schema_cache: Optional SchemaCache for metadata views and fields,
+                shared by every MetadataSpec created by this client
+            search_cache: Optional SearchCache for search results, shared by
+                every SearchSpec created by this client
+            search_profile: Default search options for every search made
+                through this client, e.g. SearchProfile.lean() for bulk
+                workers that need no signed URLs or search history
+        """
         self.session = Session()
         self.base_url = base_url
         retry_strategy = Retry(
@@ -32,21 +69,44 @@ class PythonikClient:
             "Accept": "application/json",
         }
         self.timeout = timeout
+        if bandwidth is None and max_bandwidth:
+            bandwidth = BandwidthScheduler(max_bandwidth)
+        # without a scheduler, requests and transfers are not paced or counted
+        self.bandwidth = bandwidth
+        self.schema_cache = schema_cache
+        self.search_cache = search_cache
+        self.search_profile = search_profile
+        self.metadata_stats = MetadataStats()
 
     def collections(self):
-        return CollectionSpec(self.session, self.timeout, self.base_url)
+        return CollectionSpec(self.session, self.timeout, self.base_url, self.bandwidth)
 
     def assets(self):
-        return AssetSpec(self.session, self.timeout, self.base_url)
+        return AssetSpec(self.session, self.timeout, self.base_url, self.bandwidth)
 
     def files(self):
-        return FilesSpec(self.session, self.timeout, self.base_url)
+        return FilesSpec(self.session, self.timeout, self.base_url, self.bandwidth)
 
     def metadata(self):
-        return MetadataSpec(self.session, self.timeout, self.base_url)
+        return MetadataSpec(
+            self.session,
+            self.timeout,
+            self.base_url,
+            self.bandwidth,
+            schema_cache=self.schema_cache,
+            stats=self.metadata_stats,
+        )
 
     def search(self):
-        return SearchSpec(self.session, self.timeout, self.base_url)
+        return SearchSpec(
+            self.session,
+            self.timeout,
+            self.base_url,
+            self.bandwidth,
+            metadata=self.metadata(),
+            cache=self.search_cache,
+            profile=self.search_profile,
+        )
 
     def jobs(self):
-        return JobSpec(self.session, self.timeout, self.base_url)
+        return JobSpec(self.session, self.timeout, self.base_url, self.bandwidth)
@@ -0,0 +1,225 @@
+import csv
+import sys
+from datetime import date, datetime
+from typing import IO, Any, Callable, Dict, Iterable, List, Mapping, Optional, Union
+
+from pythonik.models.metadata.fields import FieldResponse, IconikFieldType
+
+
+DEFAULT_MULTI_SEPARATOR = "|"
+
+# low-cardinality string columns whose values are interned to share memory
+INTERNED_FIELD_TYPES = frozenset(
+    {IconikFieldType.DROPDOWN.value, IconikFieldType.TAG_CLOUD.value}
+)
+
+
+def _to_bool(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        if value.lower() in ("true", "yes", "1"):
+            return True
+        if value.lower() in ("false", "no", "0"):
+            return False
+    raise ValueError(f"{value!r} is not a boolean")
+
+
+def _to_str(value: Any) -> str:
+    return value if isinstance(value, str) else str(value)
+
+
+CONVERTERS: Dict[str, Callable[[Any], Any]] = {
+    IconikFieldType.INTEGER.value: int,
+    IconikFieldType.FLOAT.value: float,
+    IconikFieldType.BOOLEAN.value: _to_bool,
+}
+
+
+def _parse_date(value: str) -> date:
+    return date.fromisoformat(value[:10])
+
+
+def _parse_datetime(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+class Column:
+    """
+    Values of one metadata field, one entry per row.
+
+    Entries are converted to the Python type matching the field type, or
+    are lists of such values for multi-value fields. Missing values and
+    values that could not be converted are None; the latter are counted
+    in `invalid`.
+    """
+
+    __slots__ = ("name", "field_type", "multi", "values", "invalid", "_convert")
+
+    def __init__(self, name: str, field_type: Optional[str] = None, multi: bool = False):
+        self.name = name
+        self.field_type = field_type or IconikFieldType.STRING.value
+        self.multi = multi
+        self.values: List[Any] = []
+        self.invalid = 0
+        convert = CONVERTERS.get(self.field_type, _to_str)
+        if self.field_type in INTERNED_FIELD_TYPES:
+            self._convert = lambda value: sys.intern(_to_str(value))
+        else:
+            self._convert = convert
+
+    def _convert_one(self, value: Any) -> Any:
+        if value is None:
+            return None
+        try:
+            return self._convert(value)
+        except (TypeError, ValueError):
+            self.invalid += 1
+            return None
+
+    def append(self, raw: Any) -> None:
+        """Append a row from a list of raw values, a single value or None"""
+        if isinstance(raw, dict):
+            # {"value": ...} as found in field_values
+            raw = raw.get("value")
+        if raw is None or raw == []:
+            self.values.append(None)
+            return
+        if not isinstance(raw, list):
+            raw = [raw]
+        values = [
+            self._convert_one(item.get("value") if isinstance(item, dict) else item)
+            for item in raw
+        ]
+        self.values.append(values if self.multi else values[0])
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class MetadataTable:
+    """
+    Columnar table of object metadata: an `id` list plus one Column per
+    field.
+
+    Args:
+        fields: Field definitions by field name, as FieldResponse models or
+            field type strings. Fields without a definition are string
+            columns.
+    """
+
+    def __init__(self, fields: Mapping[str, Union[FieldResponse, str, None]]):
+        self.ids: List[str] = []
+        self.columns: Dict[str, Column] = {}
+        for name, definition in fields.items():
+            if isinstance(definition, FieldResponse):
+                column = Column(name, definition.field_type, bool(definition.multi))
+            else:
+                column = Column(name, definition)
+            self.columns[name] = column
+
+    def append(self, object_id: str, metadata: Optional[Mapping[str, Any]]) -> None:
+        """
+        Append a row.
+
+        Args:
+            object_id: ID of the object the metadata belongs to
+            metadata: Metadata by field name, either as lists of values (as in
+                search results) or as {"field_values": [...]} entries (as in
+                ViewMetadata.metadata_values)
+        """
+        metadata = metadata or {}
+        self.ids.append(object_id)
+        for name, column in self.columns.items():
+            raw = metadata.get(name)
+            if isinstance(raw, dict) and "field_values" in raw:
+                raw = raw["field_values"]
+            column.append(raw)
+
+    def extend(self, objects: Iterable[Mapping[str, Any]]) -> None:
+        """Append rows from objects with `id` and `metadata` keys, e.g. raw search results"""
+        for obj in objects:
+            self.append(obj.get("id"), obj.get("metadata"))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def to_pydict(self) -> Dict[str, List[Any]]:
+        """Return the columns as a dict of lists, `id` first"""
+        data = {"id": self.ids}
+        for name, column in self.columns.items():
+            data[name] = column.values
+        return data
+
+    def to_csv(self, file: IO[str], multi_separator: str = DEFAULT_MULTI_SEPARATOR) -> None:
+        """
+        Write the table as CSV with a header row.
+
+        Args:
+            file: Text file opened with newline=""
+            multi_separator: Separator joining the values of multi-value fields
+        """
+
+        def cell(value: Any) -> Any:
+            if value is None:
+                return ""
+            if isinstance(value, list):
+                return multi_separator.join("" if v is None else str(v) for v in value)
+            return value
+
+        writer = csv.writer(file)
+        writer.writerow(["id", *self.columns])
+        columns = [column.values for column in self.columns.values()]
+        for object_id, *row in zip(self.ids, *columns):
+            writer.writerow([object_id, *(cell(value) for value in row)])
+
+    def to_arrow(self):
+        """
+        Return the table as a pyarrow.Table with typed columns.
+
+        Raises:
+            ImportError: If pyarrow is not installed
+        """
+        try:
+            import pyarrow as pa
+        except ImportError as e:
+            raise ImportError("to_arrow requires pyarrow: pip install pyarrow") from e
+
+        arrow_types = {
+            IconikFieldType.INTEGER.value: pa.int64(),
+            IconikFieldType.FLOAT.value: pa.float64(),
+            IconikFieldType.BOOLEAN.value: pa.bool_(),
+            IconikFieldType.DATE.value: pa.date32(),
+            IconikFieldType.DATETIME.value: pa.timestamp("us", tz="UTC"),
+        }
+        parsers = {
+            IconikFieldType.DATE.value: _parse_date,
+            IconikFieldType.DATETIME.value: _parse_datetime,
+        }
+
+        arrays = {"id": pa.array(self.ids, pa.string())}
+        for name, column in self.columns.items():
+            arrow_type = arrow_types.get(column.field_type, pa.string())
+            values = column.values
+            parse = parsers.get(column.field_type)
+            if parse is not None:
+                values = self._parse_column(column, parse)
+            if column.multi:
+                arrow_type = pa.list_(arrow_type)
+            arrays[name] = pa.array(values, arrow_type)
+        return pa.table(arrays)
+
+    @staticmethod
+    def _parse_column(column: Column, parse: Callable[[str], Any]) -> List[Any]:
+        def parse_one(value):
+            try:
+                return None if value is None else parse(value)
+            except ValueError:
+                return None
+
+        if column.multi:
+            return [
+                None if row is None else [parse_one(value) for value in row]
+                for row in column.values
+            ]
+        return [parse_one(value) for value in column.values]
@@ -0,0 +1,52 @@
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Iterable, Iterator, Optional, Tuple
+
+
+def bounded_map(
+    fn: Callable[[Any], Any],
+    items: Iterable[Any],
+    max_workers: int = 8,
+    max_in_flight: Optional[int] = None,
+) -> Iterator[Tuple[Any, Any, Optional[BaseException]]]:
+    """
+    Run `fn` over `items` on a thread pool, yielding results as they complete.
+
+    `items` is consumed lazily: at most `max_in_flight` calls are pending at any
+    time, so arbitrarily long iterators can be processed in constant memory.
+
+    Args:
+        fn: Callable applied to each item
+        items: Iterable of items, consumed lazily
+        max_workers: Number of worker threads
+        max_in_flight: Maximum number of submitted but unfinished calls
+            (defaults to twice max_workers)
+
+    Yields:
+        Tuples of (item, result, error); `error` is the exception raised by
+        `fn` for that item, in which case `result` is None
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+    max_in_flight = max(max_in_flight or max_workers * 2, max_workers)
+
+    iterator = iter(items)
+    pending = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < max_in_flight:
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending[executor.submit(fn, item)] = item
+
+            if not pending:
+                return
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                item = pending.pop(future)
+                error = future.exception()
+                yield item, (None if error else future.result()), error
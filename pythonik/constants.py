@@ -1,3 +1,5 @@
 S3_UPLOADID_KEY = "UploadId"
 GCS_UPLOADID_KEY = "X-GUploader-UploadID"
 GCS_KEYFRAME_LOCATION_KEY = "Location"
+# failures kept in the reports of bulk operations, the rest are only counted
+MAX_REPORTED_FAILURES = 100
@@ -5,3 +5,21 @@ class PythonikException(Exception):
 class UnexpectedStorageMethodForProxy(PythonikException):
     """Raised when an unexpected storage method is called for a proxy."""
     pass
+
+
+class TransferError(PythonikException):
+    """Raised when a transfer to or from storage returns unexpected data."""
+    pass
+
+
+class ChangeFeedError(PythonikException):
+    """Raised when a change feed cannot record its position."""
+    pass
+
+
+class MetadataValidationError(PythonikException):
+    """Raised when metadata values do not match their field definitions."""
+
+    def __init__(self, errors):
+        self.errors = list(errors)
+        super().__init__("; ".join(self.errors))
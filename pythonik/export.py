@@ -0,0 +1,340 @@
+import copy
+import gzip
+import json
+import os
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from pythonik.client import PythonikClient
+from pythonik.models.search.export import (
+    ExportManifest,
+    ExportShard,
+    ExportShardResult,
+)
+from pythonik.models.search.search_body import SearchBody
+from pythonik.paging import PageSize
+from pythonik.specs.base import Spec
+from pythonik.specs.search import ID_SCAN_SORT, LEAN_SEARCH_PARAMS
+
+
+DEFAULT_EXPORT_FORMAT = "ndjson.gz"
+EXPORT_EXTENSIONS = {
+    "ndjson": ".ndjson",
+    "ndjson.gz": ".ndjson.gz",
+    "parquet": ".parquet",
+}
+MANIFEST_NAME = "manifest.json"
+# indexed columns of Parquet exports, next to the full object as JSON
+PARQUET_COLUMNS = ("id", "object_type", "title", "status", "date_created", "date_modified")
+MAX_UUID = "ffffffff-ffff-ffff-ffff-ffffffffffff"
+
+# (client settings, search body, shard, output path, file format, per_page)
+ShardTask = Tuple[
+    Dict[str, Any], Dict[str, Any], ExportShard, str, str, Optional[PageSize]
+]
+
+
+def _bound(value: Union[str, date, datetime]) -> str:
+    return value.isoformat() if isinstance(value, (date, datetime)) else str(value)
+
+
+def date_shards(
+    field: str, boundaries: Sequence[Union[str, date, datetime]]
+) -> List[ExportShard]:
+    """
+    Shards between consecutive boundaries of a date field, e.g. the first
+    day of each month. Objects without a value for the field, or outside
+    the boundaries, are not exported.
+
+    Args:
+        field: The date field, e.g. "date_created"
+        boundaries: At least two ascending boundaries
+
+    Returns:
+        One ExportShard per pair of consecutive boundaries
+    """
+    if len(boundaries) < 2:
+        raise ValueError("date_shards needs at least two boundaries")
+    bounds = [_bound(boundary) for boundary in boundaries]
+    return [
+        ExportShard(
+            name=f"{field}-{i:04d}",
+            field=field,
+            min=bounds[i],
+            max=bounds[i + 1],
+            include_max=i == len(bounds) - 2,
+        )
+        for i in range(len(bounds) - 1)
+    ]
+
+
+def id_shards(count: int) -> List[ExportShard]:
+    """
+    Shards splitting the range of UUID object IDs into `count` equal parts.
+
+    Args:
+        count: Number of shards
+
+    Returns:
+        ExportShards covering every ID
+    """
+    if count < 1:
+        raise ValueError("count must be at least 1")
+    step = 2**128 // count
+    bounds = [str(uuid.UUID(int=i * step)) for i in range(count)] + [MAX_UUID]
+    return [
+        ExportShard(
+            name=f"id-{i:04d}",
+            field="id",
+            min=bounds[i],
+            max=bounds[i + 1],
+            include_max=i == count - 1,
+        )
+        for i in range(count)
+    ]
+
+
+def _parse_datetime(value: Any) -> Optional[datetime]:
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _at_bound(value: Any, bound: str) -> bool:
+    """Whether a value equals a shard's upper bound"""
+    if value is None:
+        return False
+    if str(value) == bound:
+        return True
+    parsed, parsed_bound = _parse_datetime(value), _parse_datetime(bound)
+    return parsed is not None and parsed == parsed_bound
+
+
+def _shard_body(body: Dict[str, Any], shard: ExportShard) -> Dict[str, Any]:
+    bounds = {"min": shard.min, "max": shard.max}
+    term = {"name": shard.field, "range": {k: v for k, v in bounds.items() if v}}
+    body = dict(body)
+    original = body.get("filter")
+    body["filter"] = {
+        "operator": "AND",
+        "terms": [term],
+        "filters": [original] if original else [],
+    }
+    body["sort"] = ID_SCAN_SORT
+    body["search_after"] = []
+    if body.get("include_fields"):
+        # the shard field is needed to drop objects on the upper bound
+        body["include_fields"] = list(
+            dict.fromkeys([*body["include_fields"], "id", shard.field])
+        )
+    return body
+
+
+class _NdjsonWriter:
+    def __init__(self, path: str, compress: bool):
+        self._file = gzip.open(path, "wb") if compress else open(path, "wb")
+
+    def write(self, objects: List[Dict[str, Any]]) -> None:
+        self._file.write(
+            b"".join(json.dumps(obj).encode() + b"\n" for obj in objects)
+        )
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class _ParquetWriter:
+    def __init__(self, path: str):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._pa = pa
+        self._schema = pa.schema(
+            [(column, pa.string()) for column in PARQUET_COLUMNS] + [("json", pa.string())]
+        )
+        self._writer = pq.ParquetWriter(path, self._schema, compression="zstd")
+
+    def write(self, objects: List[Dict[str, Any]]) -> None:
+        columns = {
+            column: [_cell(obj.get(column)) for obj in objects]
+            for column in PARQUET_COLUMNS
+        }
+        columns["json"] = [json.dumps(obj) for obj in objects]
+        self._writer.write_table(
+            self._pa.Table.from_pydict(columns, schema=self._schema)
+        )
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+def _cell(value: Any) -> Optional[str]:
+    return None if value is None else str(value)
+
+
+def _open_writer(path: str, file_format: str):
+    if file_format == "parquet":
+        return _ParquetWriter(path)
+    return _NdjsonWriter(path, compress=file_format == "ndjson.gz")
+
+
+def _export_shard(task: ShardTask) -> ExportShardResult:
+    """Export one shard; runs in a worker process"""
+    settings, body, shard, path, file_format, per_page = task
+    started = time.monotonic()
+    result = ExportShardResult(name=shard.name, path=os.path.basename(path))
+    # every shard tunes its own AdaptivePageSize
+    per_page = copy.copy(per_page)
+    writer = None
+    try:
+        search = PythonikClient(**settings).search()
+        writer = _open_writer(path, file_format)
+        pages = search.iter_pages(
+            _shard_body(body, shard), per_page=per_page, params=LEAN_SEARCH_PARAMS
+        )
+        for objects in pages:
+            result.pages += 1
+            if not shard.include_max and shard.max is not None:
+                objects = [
+                    obj for obj in objects if not _at_bound(obj.get(shard.field), shard.max)
+                ]
+            writer.write(objects)
+            result.objects += len(objects)
+    except Exception as e:
+        result.error = str(e)
+    finally:
+        if writer is not None:
+            writer.close()
+    if os.path.exists(path):
+        result.bytes = os.path.getsize(path)
+    result.elapsed = time.monotonic() - started
+    return result
+
+
+class SearchExporter:
+    """
+    Exports every object matching a search to one file per shard, with a
+    process pool working on several shards at once.
+
+    Each worker process creates its own client from this client's
+    credentials and streams its shard's pages, sorted by id, as raw dicts
+    straight to its file, without building models. Shards split the search
+    on a date or ID key (see date_shards and id_shards) into ranges that
+    include their lower and exclude their upper bound, so no object is
+    written twice. A manifest with each shard's file and counts is written
+    to `directory`/manifest.json.
+
+    Formats are "ndjson", "ndjson.gz" and "parquet" (requires pyarrow). The
+    Parquet files have string columns for id, object_type, title, status,
+    date_created and date_modified plus the full object as JSON.
+
+    Args:
+        client: The PythonikClient whose credentials the workers use
+        directory: Directory the files and the manifest are written to
+        file_format: Format of the shard files
+        processes: Number of worker processes, the CPU count if None; 1
+            exports in the calling process
+        per_page: The number of documents for each page, or an
+            AdaptivePageSize each shard starts from; an AdaptivePageSize
+            with default settings if None
+    """
+
+    def __init__(
+        self,
+        client: PythonikClient,
+        directory: str,
+        file_format: str = DEFAULT_EXPORT_FORMAT,
+        processes: Optional[int] = None,
+        per_page: Optional[PageSize] = None,
+    ):
+        if file_format not in EXPORT_EXTENSIONS:
+            raise ValueError(
+                f"Unknown export format {file_format}, "
+                f"expected one of {', '.join(EXPORT_EXTENSIONS)}"
+            )
+        self.settings = {
+            "app_id": client.session.headers["App-ID"],
+            "auth_token": client.session.headers["Auth-Token"],
+            "timeout": client.timeout,
+            "base_url": client.base_url,
+        }
+        self.directory = directory
+        self.file_format = file_format
+        self.processes = processes
+        self.per_page = per_page
+
+    def run(
+        self,
+        search_body: Union[SearchBody, Dict[str, Any]],
+        shards: Iterable[ExportShard],
+        exclude_defaults: bool = True,
+    ) -> ExportManifest:
+        """
+        Export a search.
+
+        Args:
+            search_body: Search parameters, either as SearchBody model or dict;
+                its sort is replaced
+            shards: The shards to export, e.g. id_shards(16)
+            exclude_defaults: Whether to exclude default values when dumping Pydantic models for the request body
+
+        Returns:
+            ExportManifest with a result per shard; failed shards have an
+            error and a partial file
+
+        Raises:
+            ImportError: If the format is "parquet" and pyarrow is not
+                installed
+        """
+        if self.file_format == "parquet":
+            try:
+                import pyarrow.parquet  # noqa: F401
+            except ImportError as e:
+                raise ImportError(
+                    "Parquet exports require pyarrow: pip install pyarrow"
+                ) from e
+
+        started = time.monotonic()
+        manifest = ExportManifest(
+            file_format=self.file_format,
+            search_body=dict(
+                Spec._prepare_model_data(search_body, exclude_defaults=exclude_defaults)
+            ),
+            started=datetime.now(timezone.utc).isoformat(),
+        )
+        os.makedirs(self.directory, exist_ok=True)
+        extension = EXPORT_EXTENSIONS[self.file_format]
+        tasks = [
+            (
+                self.settings,
+                manifest.search_body,
+                shard,
+                os.path.join(self.directory, shard.name + extension),
+                self.file_format,
+                self.per_page,
+            )
+            for shard in shards
+        ]
+
+        if self.processes == 1:
+            results = [_export_shard(task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=self.processes) as pool:
+                results = list(pool.map(_export_shard, tasks))
+
+        manifest.shards = results
+        manifest.elapsed = time.monotonic() - started
+        self._write_manifest(manifest)
+        return manifest
+
+    def _write_manifest(self, manifest: ExportManifest) -> None:
+        path = os.path.join(self.directory, MANIFEST_NAME)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            f.write(manifest.model_dump_json(indent=2))
+        os.replace(tmp_path, path)
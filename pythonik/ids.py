@@ -0,0 +1,108 @@
+import uuid
+from collections.abc import Sequence
+from typing import Iterable, Iterator, List, Union
+
+
+ID_SIZE = 16
+
+
+class IdArray(Sequence):
+    """
+    Compact sequence of UUID object IDs, stored as 16 bytes each in one
+    bytearray instead of a list of strings (about 16 rather than 90 bytes
+    per ID).
+
+    An ID equal to the last one appended is skipped, so IDs appended in
+    sorted order, as SearchSpec.scan_ids returns them, are deduplicated.
+    Membership tests use a binary search while the IDs are sorted.
+
+    Args:
+        ids: Initial IDs
+    """
+
+    __slots__ = ("_data", "_sorted")
+
+    def __init__(self, ids: Iterable[str] = ()):
+        self._data = bytearray()
+        self._sorted = True
+        self.extend(ids)
+
+    def append(self, object_id: Union[str, uuid.UUID]) -> bool:
+        """
+        Append an ID.
+
+        Returns:
+            False if the ID was skipped as a repeat of the last one
+
+        Raises:
+            ValueError: If the ID is not a UUID
+        """
+        raw = object_id.bytes if isinstance(object_id, uuid.UUID) else uuid.UUID(object_id).bytes
+        if self._data:
+            last = bytes(self._data[-ID_SIZE:])
+            if raw == last:
+                return False
+            if raw < last:
+                self._sorted = False
+        self._data += raw
+        return True
+
+    def extend(self, ids: Iterable[Union[str, uuid.UUID]]) -> int:
+        """Append IDs, returning how many were added"""
+        return sum(self.append(object_id) for object_id in ids)
+
+    @property
+    def sorted(self) -> bool:
+        """Whether the IDs are in ascending order"""
+        return self._sorted
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the IDs"""
+        return len(self._data)
+
+    def _raw(self, index: int) -> bytes:
+        start = index * ID_SIZE
+        return bytes(self._data[start : start + ID_SIZE])
+
+    def __len__(self) -> int:
+        return len(self._data) // ID_SIZE
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("IdArray index out of range")
+        return str(uuid.UUID(bytes=self._raw(index)))
+
+    def __iter__(self) -> Iterator[str]:
+        view = memoryview(self._data)
+        for start in range(0, len(view), ID_SIZE):
+            yield str(uuid.UUID(bytes=bytes(view[start : start + ID_SIZE])))
+
+    def __contains__(self, object_id) -> bool:
+        try:
+            raw = uuid.UUID(str(object_id)).bytes
+        except ValueError:
+            return False
+        if not self._sorted:
+            start = self._data.find(raw)
+            while start != -1 and start % ID_SIZE:
+                start = self._data.find(raw, start + 1)
+            return start != -1
+        low, high = 0, len(self)
+        while low < high:
+            middle = (low + high) // 2
+            if self._raw(middle) < raw:
+                low = middle + 1
+            else:
+                high = middle
+        return low < len(self) and self._raw(low) == raw
+
+    def to_list(self) -> List[str]:
+        return list(self)
+
+    def __repr__(self) -> str:
+        return f"IdArray(<{len(self)} ids>)"
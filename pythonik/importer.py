@@ -0,0 +1,331 @@
+import csv
+import json
+import os
+import time
+from itertools import islice
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from loguru import logger
+
+from pythonik.columnar import DEFAULT_MULTI_SEPARATOR
+from pythonik.concurrency import bounded_map
+from pythonik.bandwidth import RateLimiter
+from pythonik.constants import MAX_REPORTED_FAILURES
+from pythonik.models.metadata.bulk import (
+    MetadataImportFailure,
+    MetadataImportReport,
+    MetadataWriteItem,
+)
+from pythonik.specs.metadata import (
+    DEFAULT_METADATA_WRITE_RETRIES,
+    DEFAULT_METADATA_WRITE_WORKERS,
+    MetadataSpec,
+)
+
+
+DEFAULT_CHECKPOINT_EVERY = 1000
+NDJSON_EXTENSIONS = (".ndjson", ".jsonl", ".json")
+
+# (record number, byte offset after the record or None, record or None,
+# why the record could not be read or None)
+Record = Tuple[int, Optional[int], Optional[Dict[str, Any]], Optional[str]]
+
+
+class MetadataImporter:
+    """
+    Streams metadata records from an NDJSON or CSV file into a view.
+
+    Records are read one at a time and written concurrently through
+    bulk_write_metadata's retry logic, so memory use does not depend on the
+    file size. Columns are mapped to the view's fields by field name or
+    label, using get_view (served by the client's SchemaCache, if any);
+    `mapping` overrides or extends that. Empty values are left out rather
+    than clearing the field. In CSV files the values of multi-value fields
+    are split on `multi_separator`. Records are numbered from 1, NDJSON
+    records by their non-empty line; a line that is not a JSON object is
+    reported as a failed record and the import goes on.
+
+    With a `checkpoint_path`, progress is saved every `checkpoint_every`
+    records as the number of records that are done (written, skipped or
+    failed) with no unfinished record before them. Running the import
+    again resumes after that record.
+
+    Args:
+        spec: The MetadataSpec used to write
+        view_id: The view the metadata is written to
+        object_type: The type of the objects, e.g. "assets"
+        id_column: The column holding the object ID
+        mapping: Optional column name to field name mapping
+        multi_separator: Separator of multiple values in a CSV cell
+        concurrency: Number of writes in flight
+        requests_per_second: Optional cap on write requests per second
+        retries: How many times a failed write is retried
+        checkpoint_path: File to save progress to and resume from
+        checkpoint_every: Records between checkpoints
+        **kwargs: Additional kwargs passed to every write, e.g. validate=True
+    """
+
+    def __init__(
+        self,
+        spec: MetadataSpec,
+        view_id: str,
+        object_type: str = "assets",
+        id_column: str = "id",
+        mapping: Optional[Dict[str, str]] = None,
+        multi_separator: str = DEFAULT_MULTI_SEPARATOR,
+        concurrency: int = DEFAULT_METADATA_WRITE_WORKERS,
+        requests_per_second: Optional[float] = None,
+        retries: int = DEFAULT_METADATA_WRITE_RETRIES,
+        checkpoint_path: Optional[str] = None,
+        checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY,
+        **kwargs,
+    ):
+        self.spec = spec
+        self.view_id = view_id
+        self.object_type = object_type
+        self.id_column = id_column
+        self.mapping = dict(mapping or {})
+        self.multi_separator = multi_separator
+        self.concurrency = concurrency
+        self.requests_per_second = requests_per_second
+        self.retries = retries
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = checkpoint_every
+        self.write_kwargs = kwargs
+
+    def run(self, path: str, file_format: Optional[str] = None) -> MetadataImportReport:
+        """
+        Import a file.
+
+        Args:
+            path: Path of the NDJSON or CSV file
+            file_format: "ndjson" or "csv"; guessed from the extension if None
+
+        Returns:
+            MetadataImportReport with counts and the first failures
+
+        Raises:
+            ValueError: If the format cannot be determined
+            requests.HTTPError: If the view cannot be fetched
+        """
+        started = time.monotonic()
+        if file_format is None:
+            if path.lower().endswith(".csv"):
+                file_format = "csv"
+            elif path.lower().endswith(NDJSON_EXTENSIONS):
+                file_format = "ndjson"
+        if file_format not in ("ndjson", "csv"):
+            raise ValueError(f"Cannot determine the format of {path}, pass file_format")
+
+        view = self.spec.get_view(self.view_id)
+        view.response.raise_for_status()
+        fields = {field.name: field for field in view.data.view_fields}
+        labels = {
+            field.label.lower(): field.name
+            for field in view.data.view_fields
+            if field.label
+        }
+
+        report = MetadataImportReport(path=path)
+        checkpoint = self._load_checkpoint(path)
+        report.resumed_from = checkpoint["records"]
+        progress = _Progress(checkpoint["records"], checkpoint.get("offset"))
+        columns: Dict[str, Optional[str]] = {}
+        limiter = (
+            RateLimiter(self.requests_per_second) if self.requests_per_second else None
+        )
+
+        def items() -> Iterator[Tuple[int, MetadataWriteItem]]:
+            for number, offset, record, error in self._read(path, file_format, progress):
+                report.records += 1
+                progress.start(number, offset)
+                if error is not None:
+                    self._record_failure(report, number, None, None, error)
+                    self._finish(progress, number, path)
+                    continue
+                item = self._to_item(record, fields, labels, columns)
+                if item is None:
+                    if record.get(self.id_column) in (None, ""):
+                        self._record_failure(
+                            report, number, None, None, f"{self.id_column} missing"
+                        )
+                    else:
+                        report.skipped += 1
+                    self._finish(progress, number, path)
+                    continue
+                yield number, item
+
+        def write(numbered: Tuple[int, MetadataWriteItem]):
+            return self.spec.write_metadata_item(
+                numbered[1], limiter, self.retries, **self.write_kwargs
+            )
+
+        for (number, item), result, error in bounded_map(
+            write, items(), self.concurrency
+        ):
+            if error is not None:
+                self._record_failure(report, number, item.object_id, None, str(error))
+            elif result.success:
+                report.written += 1
+            else:
+                self._record_failure(
+                    report, number, item.object_id, result.status_code, result.error
+                )
+            self._finish(progress, number, path)
+
+        self._save_checkpoint(path, progress)
+        report.unmapped_columns = sorted(
+            column for column, field in columns.items() if field is None
+        )
+        report.elapsed = time.monotonic() - started
+        return report
+
+    def _to_item(
+        self,
+        record: Dict[str, Any],
+        fields: Dict[str, Any],
+        labels: Dict[str, str],
+        columns: Dict[str, Optional[str]],
+    ) -> Optional[MetadataWriteItem]:
+        object_id = record.get(self.id_column)
+        if object_id in (None, ""):
+            return None
+        metadata_values = {}
+        for column, value in record.items():
+            if column == self.id_column:
+                continue
+            if column not in columns:
+                # resolve each column once
+                name = self.mapping.get(column, column)
+                if name not in fields:
+                    name = labels.get(str(column).lower())
+                columns[column] = name
+            name = columns[column]
+            if name is None or value is None or value == "" or value == []:
+                continue
+            if isinstance(value, list):
+                values = value
+            elif isinstance(value, str) and fields[name].multi:
+                values = [v for v in value.split(self.multi_separator) if v != ""]
+            else:
+                values = [value]
+            metadata_values[name] = {"field_values": [{"value": v} for v in values]}
+        if not metadata_values:
+            return None
+        return MetadataWriteItem(
+            object_type=self.object_type,
+            object_id=str(object_id),
+            view_id=self.view_id,
+            metadata={"metadata_values": metadata_values},
+        )
+
+    @staticmethod
+    def _record_failure(report, number, object_id, status_code, error) -> None:
+        report.failed += 1
+        if len(report.failures) < MAX_REPORTED_FAILURES:
+            report.failures.append(
+                MetadataImportFailure(
+                    record=number,
+                    object_id=object_id,
+                    status_code=status_code,
+                    error=error,
+                )
+            )
+
+    def _finish(self, progress: "_Progress", number: int, path: str) -> None:
+        if progress.finish(number) and self.checkpoint_path:
+            if progress.records - progress.saved >= self.checkpoint_every:
+                self._save_checkpoint(path, progress)
+
+    def _read(self, path: str, file_format: str, progress: "_Progress") -> Iterator[Record]:
+        number = progress.records
+        if file_format == "ndjson":
+            with open(path, "rb") as f:
+                if progress.offset is not None:
+                    f.seek(progress.offset)
+                else:
+                    for _ in islice(f, number):
+                        pass
+                while True:
+                    line = f.readline()
+                    if not line:
+                        return
+                    if not line.strip():
+                        continue
+                    number += 1
+                    try:
+                        record = json.loads(line)
+                    except ValueError as e:
+                        yield number, f.tell(), None, f"Invalid JSON: {e}"
+                        continue
+                    if not isinstance(record, dict):
+                        yield (
+                            number,
+                            f.tell(),
+                            None,
+                            f"Expected a JSON object, got {type(record).__name__}",
+                        )
+                        continue
+                    yield number, f.tell(), record, None
+        else:
+            with open(path, newline="", encoding="utf-8") as f:
+                reader = csv.DictReader(f)
+                for record in islice(reader, number, None):
+                    number += 1
+                    yield number, None, record, None
+
+    def _load_checkpoint(self, path: str) -> Dict[str, Any]:
+        empty = {"records": 0, "offset": None}
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return empty
+        with open(self.checkpoint_path) as f:
+            checkpoint = json.load(f)
+        if checkpoint.get("path") != os.path.abspath(path):
+            logger.warning(
+                "Ignoring checkpoint {} written for {}",
+                self.checkpoint_path,
+                checkpoint.get("path"),
+            )
+            return empty
+        return checkpoint
+
+    def _save_checkpoint(self, path: str, progress: "_Progress") -> None:
+        if not self.checkpoint_path:
+            return
+        tmp_path = self.checkpoint_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(
+                {
+                    "path": os.path.abspath(path),
+                    "records": progress.records,
+                    "offset": progress.offset,
+                },
+                f,
+            )
+        os.replace(tmp_path, self.checkpoint_path)
+        progress.saved = progress.records
+
+
+class _Progress:
+    """Tracks the last record with no unfinished record before it."""
+
+    def __init__(self, records: int, offset: Optional[int]):
+        self.records = records
+        self.offset = offset
+        self.saved = records
+        self._offsets: Dict[int, Optional[int]] = {}
+        self._finished: set = set()
+
+    def start(self, number: int, offset: Optional[int]) -> None:
+        self._offsets[number] = offset
+
+    def finish(self, number: int) -> bool:
+        """Mark a record done; return whether the watermark moved"""
+        self._finished.add(number)
+        moved = False
+        while self.records + 1 in self._finished:
+            self.records += 1
+            self._finished.remove(self.records)
+            self.offset = self._offsets.pop(self.records)
+            moved = True
+        return moved
@@ -0,0 +1,350 @@
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import chain, compress
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from pydantic import BaseModel
+
+from pythonik.query import Q, term_value
+
+
+DEFAULT_INDEXED_FIELDS = (
+    "media_type",
+    "status",
+    "object_type",
+    "in_collections",
+    "file_names",
+    "date_created",
+    "date_modified",
+)
+METADATA_PREFIX = "metadata."
+# a posting list at least 1/32 of the index, as large as its bitmap, keeps
+# its bitmap cached
+DENSE_POSTING_RATIO = 32
+# range queries OR together the bitmaps of at most this many blocks of a
+# field's value order, plus the objects of the blocks at either end
+MAX_RANGE_BLOCKS = 128
+MIN_RANGE_BLOCK = 4096
+
+# bitmaps with at least 1 in 16 bits set are listed bit by bit, others by
+# their non-zero bytes
+DENSE_MEMBERS_RATIO = 16
+
+_BINARY_DIGITS = bytes.maketrans(b"01", b"\x00\x01")
+_NONZERO_BYTES = re.compile(rb"[^\x00]+")
+_BYTE_BITS = [tuple(bit for bit in range(8) if byte >> bit & 1) for byte in range(256)]
+
+
+def _values(raw: Any) -> List[str]:
+    if raw is None:
+        return []
+    if not isinstance(raw, list):
+        raw = [raw]
+    values = []
+    for value in raw:
+        if isinstance(value, dict):
+            # {"value": ...} as found in field_values
+            value = value.get("value")
+        if value is not None and value != "":
+            values.append(term_value(value))
+    return values
+
+
+def _number(value: str) -> Optional[float]:
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+if hasattr(int, "bit_count"):
+    _popcount = int.bit_count
+else:  # Python < 3.10
+
+    def _popcount(bitmap: int) -> int:
+        return bin(bitmap).count("1")
+
+
+def _bitmap(numbers: Iterable[int], size: int) -> int:
+    """Bitmap, as an int, with the bits of `numbers` set"""
+    bits = bytearray((size + 7) >> 3)
+    for number in numbers:
+        bits[number >> 3] |= 1 << (number & 7)
+    return int.from_bytes(bits, "little")
+
+
+def _members(bitmap: int) -> List[int]:
+    """The set bits of a bitmap, ascending"""
+    if _popcount(bitmap) * DENSE_MEMBERS_RATIO >= bitmap.bit_length():
+        # one 0/1 byte per bit, lowest first
+        bits = bin(bitmap)[:1:-1].encode().translate(_BINARY_DIGITS)
+        return list(compress(range(len(bits)), bits))
+    data = bitmap.to_bytes((bitmap.bit_length() + 7) >> 3, "little")
+    members: List[int] = []
+    for run in _NONZERO_BYTES.finditer(data):
+        offset = run.start() << 3
+        for byte in run.group():
+            members.extend([offset + bit for bit in _BYTE_BITS[byte]])
+            offset += 8
+    return members
+
+
+class _RangeOrder:
+    """
+    The postings of a field concatenated in the order of its values, with
+    a bitmap per block of that order, so a range of values is a slice.
+    """
+
+    def __init__(self, postings: Dict[str, array], values: List[str], size: int):
+        self.order = array("I")
+        self.starts = [0]
+        for value in values:
+            self.order.extend(postings[value])
+            self.starts.append(len(self.order))
+        self.size = size
+        self.block = max(MIN_RANGE_BLOCK, -(-len(self.order) // MAX_RANGE_BLOCKS))
+        self.blocks = [
+            _bitmap(self.order[i : i + self.block], size)
+            for i in range(0, len(self.order), self.block)
+        ]
+
+    def bitmap(self, first: int, last: int) -> int:
+        """Bitmap of the objects with the values first..last-1"""
+        start, end = self.starts[first], self.starts[last]
+        block = self.block
+        first_block, last_block = -(-start // block), end // block
+        if first_block >= last_block:
+            return _bitmap(self.order[start:end], self.size)
+        result = _bitmap(
+            chain(
+                self.order[start : first_block * block],
+                self.order[last_block * block : end],
+            ),
+            self.size,
+        )
+        for bits in self.blocks[first_block:last_block]:
+            result |= bits
+        return result
+
+
+class ObjectIndex:
+    """
+    In-memory inverted index over search results for local filtering.
+
+    Objects are numbered in the order they are added, and each indexed
+    field keeps a posting list, an array of object numbers, per value.
+    Queries are evaluated on bitmaps, Python ints with a bit per object:
+    AND and OR are bitwise, `missing` is the complement of the field's
+    presence bitmap, and the bitmaps of dense posting lists are cached.
+    Ranges combine cached bitmaps of blocks of the field's values in sorted
+    order with the objects at the edges of the range.
+
+    Queries are Q filters, the same ones used to build searches: terms
+    with value, value_in, exists or missing, ranges, and their AND/OR
+    combinations. Range bounds are inclusive. They compare numerically
+    when the bounds and all of a field's values are numbers, and as
+    strings otherwise, which orders ISO dates correctly.
+
+    Metadata fields are indexed as "metadata.<name>".
+
+    Args:
+        fields: Top-level fields to index
+        metadata_fields: Metadata fields to index
+        keep_objects: Whether to keep the objects for `objects()`; only
+            their IDs are kept otherwise
+    """
+
+    def __init__(
+        self,
+        fields: Iterable[str] = DEFAULT_INDEXED_FIELDS,
+        metadata_fields: Iterable[str] = (),
+        keep_objects: bool = True,
+    ):
+        self.fields = list(fields) + [METADATA_PREFIX + name for name in metadata_fields]
+        self.keep_objects = keep_objects
+        self.ids: List[Optional[str]] = []
+        self._objects: List[Dict[str, Any]] = []
+        self._postings: Dict[str, Dict[str, array]] = {name: {} for name in self.fields}
+        self._present: Dict[str, array] = {name: array("I") for name in self.fields}
+        self._sorted_keys: Dict[str, Tuple[bool, List[Any], List[str]]] = {}
+        # (posting length, bitmap) of dense postings and of presence, keyed
+        # by (name, value) and (name, None); postings only grow, so a stale
+        # bitmap is brought up to date with the numbers added since
+        self._bitmaps: Dict[Tuple[str, Optional[str]], Tuple[int, int]] = {}
+        self._range_orders: Dict[str, Dict[bool, _RangeOrder]] = {}
+
+    # loading
+
+    def add(self, obj: Union[BaseModel, Dict[str, Any]]) -> int:
+        """Index an object, e.g. an Object model or a raw search result; return its number"""
+        if isinstance(obj, BaseModel):
+            obj = obj.model_dump(mode="json", by_alias=True)
+        number = len(self.ids)
+        self.ids.append(obj.get("id"))
+        if self.keep_objects:
+            self._objects.append(obj)
+        metadata = obj.get("metadata") or {}
+        for name in self.fields:
+            if name.startswith(METADATA_PREFIX):
+                values = _values(metadata.get(name[len(METADATA_PREFIX):]))
+            else:
+                values = _values(obj.get(name))
+            if not values:
+                continue
+            self._present[name].append(number)
+            postings = self._postings[name]
+            for value in dict.fromkeys(values):
+                posting = postings.get(value)
+                if posting is None:
+                    posting = postings[value] = array("I")
+                posting.append(number)
+            self._sorted_keys.pop(name, None)
+            self._range_orders.pop(name, None)
+        return number
+
+    def extend(self, objects: Iterable[Union[BaseModel, Dict[str, Any]]]) -> None:
+        """Index objects, e.g. `obj for page in spec.iter_pages(body) for obj in page`"""
+        for obj in objects:
+            self.add(obj)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    # queries
+
+    def search(self, query: Q) -> List[int]:
+        """
+        Return the numbers of the objects matching a filter, ascending.
+
+        Raises:
+            ValueError: If the filter uses a field that is not indexed
+        """
+        return _members(self._match(query))
+
+    def count(self, query: Q) -> int:
+        """
+        Return the number of objects matching a filter.
+
+        Raises:
+            ValueError: If the filter uses a field that is not indexed
+        """
+        return _popcount(self._match(query))
+
+    def search_ids(self, query: Q) -> List[Optional[str]]:
+        """Return the IDs of the objects matching a filter"""
+        return [self.ids[number] for number in self.search(query)]
+
+    def objects(self, query: Q) -> List[Dict[str, Any]]:
+        """
+        Return the objects matching a filter.
+
+        Raises:
+            ValueError: If the index does not keep objects
+        """
+        if not self.keep_objects:
+            raise ValueError("The index was built with keep_objects=False")
+        return [self._objects[number] for number in self.search(query)]
+
+    def values(self, field: str) -> Dict[str, int]:
+        """Return the number of objects per value of an indexed field"""
+        return {value: len(posting) for value, posting in self._field(field).items()}
+
+    def _field(self, name: str) -> Dict[str, array]:
+        postings = self._postings.get(name)
+        if postings is None:
+            raise ValueError(f"{name} is not an indexed field")
+        return postings
+
+    def _all(self) -> int:
+        return (1 << len(self)) - 1
+
+    def _posting_bitmap(self, key: Tuple[str, Optional[str]], posting: array) -> int:
+        """Bitmap of a posting list, cached when the posting is dense"""
+        cached = self._bitmaps.get(key)
+        if cached is not None:
+            length, bitmap = cached
+            if length < len(posting):
+                bitmap |= _bitmap(posting[length:], len(self))
+                self._bitmaps[key] = (len(posting), bitmap)
+            return bitmap
+        bitmap = _bitmap(posting, len(self))
+        if len(posting) * DENSE_POSTING_RATIO >= len(self):
+            self._bitmaps[key] = (len(posting), bitmap)
+        return bitmap
+
+    def _match(self, query: Q) -> int:
+        matches = [self._term(term) for term in query.terms]
+        matches.extend(self._match(child) for child in query.children)
+        if not matches:
+            return self._all()
+        result = matches[0]
+        if query.operator.upper() == "OR":
+            for match in matches[1:]:
+                result |= match
+        else:
+            for match in matches[1:]:
+                result &= match
+        return result
+
+    def _term(self, term: Dict[str, Any]) -> int:
+        name = term["name"]
+        postings = self._field(name)
+        result = self._all()
+        if "value" in term:
+            value = term["value"]
+            posting = postings.get(value)
+            result &= 0 if posting is None else self._posting_bitmap((name, value), posting)
+        if "value_in" in term:
+            matches = 0
+            for value in term["value_in"]:
+                posting = postings.get(value)
+                if posting is not None:
+                    matches |= self._posting_bitmap((name, value), posting)
+            result &= matches
+        if term.get("range") is not None:
+            result &= self._range(name, term["range"])
+        if term.get("exists"):
+            result &= self._posting_bitmap((name, None), self._present[name])
+        if term.get("missing"):
+            result &= self._all() ^ self._posting_bitmap((name, None), self._present[name])
+        return result
+
+    def _keys(self, name: str) -> Tuple[bool, List[Any], List[str]]:
+        """(numeric, sorted comparable keys, values in the same order)"""
+        keys = self._sorted_keys.get(name)
+        if keys is None:
+            values = list(self._postings[name])
+            numbers = [_number(value) for value in values]
+            numeric = bool(values) and None not in numbers
+            pairs = sorted(zip(numbers if numeric else values, values))
+            keys = self._sorted_keys[name] = (
+                numeric,
+                [key for key, _ in pairs],
+                [value for _, value in pairs],
+            )
+        return keys
+
+    def _range(self, name: str, bounds: Dict[str, Any]) -> int:
+        numeric, keys, values = self._keys(name)
+        low, high = bounds.get("min"), bounds.get("max")
+        if numeric:
+            low_number = None if low is None else _number(low)
+            high_number = None if high is None else _number(high)
+            if (low is None or low_number is not None) and (
+                high is None or high_number is not None
+            ):
+                low, high = low_number, high_number
+            else:
+                # a bound that is not a number, compare as strings
+                numeric = False
+                keys = values = sorted(values)
+        start = 0 if low is None else bisect_left(keys, low)
+        end = len(keys) if high is None else bisect_right(keys, high)
+        if start >= end:
+            return 0
+        orders = self._range_orders.setdefault(name, {})
+        order = orders.get(numeric)
+        if order is None:
+            order = orders[numeric] = _RangeOrder(self._postings[name], values, len(self))
+        return order.bitmap(start, end)
@@ -0,0 +1,325 @@
+import json
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from pydantic import BaseModel
+
+from pythonik.models.metadata.views import ViewMetadata
+from pythonik.models.search.search_body import SearchBody
+from pythonik.models.search.watermark import Watermark
+from pythonik.paging import PageSize
+from pythonik.specs.metadata import MetadataSpec
+from pythonik.specs.search import SearchSpec
+from pythonik.watermarks import WatermarkStore
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS objects (
+    id TEXT PRIMARY KEY,
+    object_type TEXT,
+    title TEXT,
+    status TEXT,
+    date_modified TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS objects_title ON objects (title);
+CREATE INDEX IF NOT EXISTS objects_type ON objects (object_type, date_modified);
+CREATE TABLE IF NOT EXISTS memberships (
+    collection_id TEXT NOT NULL,
+    object_id TEXT NOT NULL,
+    PRIMARY KEY (collection_id, object_id)
+);
+CREATE INDEX IF NOT EXISTS memberships_object ON memberships (object_id);
+CREATE TABLE IF NOT EXISTS metadata_values (
+    object_id TEXT NOT NULL,
+    field TEXT NOT NULL,
+    value TEXT
+);
+CREATE INDEX IF NOT EXISTS metadata_values_lookup ON metadata_values (field, value);
+CREATE INDEX IF NOT EXISTS metadata_values_object ON metadata_values (object_id);
+CREATE TABLE IF NOT EXISTS view_metadata (
+    object_id TEXT NOT NULL,
+    view_id TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (object_id, view_id)
+);
+CREATE TABLE IF NOT EXISTS watermarks (
+    key TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+"""
+
+
+class LocalMirror(WatermarkStore):
+    """
+    Local SQLite replica of Iconik objects and their metadata.
+
+    `sync` loads every object matching a search on the first run and then
+    only the objects modified since, through SearchSpec.changes; the mirror
+    is its own watermark store, and each page of changes is committed
+    together with its watermark. Objects are stored as JSON with indexed
+    columns for ID, title, type and collection membership. The values of
+    `indexed_fields` are indexed too, so `find` can filter on them.
+    Reads never touch the network.
+
+    Deleted objects are kept with their status; pass `status` to `find` to
+    leave them out.
+
+    Args:
+        path: Path of the SQLite database, ":memory:" for a private
+            in-memory mirror
+        indexed_fields: Metadata fields to index for lookups
+    """
+
+    def __init__(self, path: str = ":memory:", indexed_fields: Iterable[str] = ()):
+        self.path = path
+        self.indexed_fields = list(indexed_fields)
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        with self._lock:
+            self._db.executescript(SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self) -> "LocalMirror":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    # loading
+
+    def sync(
+        self,
+        search: SearchSpec,
+        search_body: Union[SearchBody, Dict[str, Any]],
+        key: str = "default",
+        per_page: Optional[PageSize] = None,
+        **kwargs,
+    ) -> int:
+        """
+        Bring the mirror up to date with a search.
+
+        Args:
+            search: The SearchSpec to read changes from
+            search_body: The search selecting the mirrored objects
+            key: Name of this search's watermark, to mirror several searches
+            per_page: The number of documents for each page, or an
+                AdaptivePageSize; an AdaptivePageSize with default settings
+                if None
+            **kwargs: Additional kwargs passed to SearchSpec.changes
+
+        Returns:
+            The number of objects stored
+
+        Raises:
+            requests.HTTPError: If a search request fails
+        """
+        count = 0
+        # changes saves the watermark after each page, which commits the
+        # page's objects in the same transaction
+        changes = search.changes(search_body, self, key=key, per_page=per_page, **kwargs)
+        for obj in changes:
+            self._upsert(obj)
+            count += 1
+        return count
+
+    def upsert(self, objects: Iterable[Union[BaseModel, Dict[str, Any]]]) -> None:
+        """Store objects, e.g. an Asset from AssetSpec.get or raw search results"""
+        with self._lock:
+            for obj in objects:
+                if isinstance(obj, BaseModel):
+                    obj = obj.model_dump(mode="json", by_alias=True)
+                self._upsert(obj)
+            self._db.commit()
+
+    def _upsert(self, obj: Dict[str, Any]) -> None:
+        object_id = obj["id"]
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO objects "
+                "(id, object_type, title, status, date_modified, data) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    object_id,
+                    obj.get("object_type"),
+                    obj.get("title"),
+                    obj.get("status"),
+                    obj.get("date_modified"),
+                    json.dumps(obj),
+                ),
+            )
+            self._db.execute("DELETE FROM memberships WHERE object_id = ?", (object_id,))
+            self._db.executemany(
+                "INSERT OR IGNORE INTO memberships (collection_id, object_id) "
+                "VALUES (?, ?)",
+                [
+                    (collection_id, object_id)
+                    for collection_id in obj.get("in_collections") or []
+                ],
+            )
+            self._db.execute("DELETE FROM metadata_values WHERE object_id = ?", (object_id,))
+            metadata = obj.get("metadata") or {}
+            self._db.executemany(
+                "INSERT INTO metadata_values (object_id, field, value) VALUES (?, ?, ?)",
+                [
+                    (object_id, field, _index_value(value))
+                    for field in self.indexed_fields
+                    for value in _as_list(metadata.get(field))
+                ],
+            )
+
+    def load_view_metadata(
+        self,
+        metadata: MetadataSpec,
+        keys: Iterable[Tuple[str, str, str]],
+        **kwargs,
+    ) -> None:
+        """
+        Fetch and store the ViewMetadata of (object_type, object_id, view_id)
+        pairs with MetadataSpec.get_metadata_for_views.
+        """
+        result = metadata.get_metadata_for_views(keys, **kwargs)
+        with self._lock:
+            for key, view_metadata in result.items():
+                if view_metadata is not None:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO view_metadata (object_id, view_id, data) "
+                        "VALUES (?, ?, ?)",
+                        (key.object_id, key.view_id, view_metadata.model_dump_json()),
+                    )
+            self._db.commit()
+
+    # WatermarkStore
+
+    def load(self, key: str) -> Optional[Watermark]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT data FROM watermarks WHERE key = ?", (key,)
+            ).fetchone()
+        return Watermark.model_validate_json(row["data"]) if row else None
+
+    def save(self, key: str, watermark: Watermark) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO watermarks (key, data) VALUES (?, ?)",
+                (key, watermark.model_dump_json()),
+            )
+            self._db.commit()
+
+    # queries
+
+    def get(self, object_id: str) -> Optional[Dict[str, Any]]:
+        """Return a mirrored object as stored, or None"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT data FROM objects WHERE id = ?", (object_id,)
+            ).fetchone()
+        return json.loads(row["data"]) if row else None
+
+    def get_view_metadata(self, object_id: str, view_id: str) -> Optional[ViewMetadata]:
+        """Return stored ViewMetadata, or None"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT data FROM view_metadata WHERE object_id = ? AND view_id = ?",
+                (object_id, view_id),
+            ).fetchone()
+        return ViewMetadata.model_validate_json(row["data"]) if row else None
+
+    def find(
+        self,
+        object_type: Optional[str] = None,
+        title: Optional[str] = None,
+        title_like: Optional[str] = None,
+        collection_id: Optional[str] = None,
+        status: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Query mirrored objects. All given conditions must match.
+
+        Args:
+            object_type: Only objects of this type, e.g. "assets"
+            title: Exact title
+            title_like: SQL LIKE pattern for the title, e.g. "Trailer%"
+            collection_id: Only direct members of this collection
+            status: Only objects with this status, e.g. "ACTIVE"
+            metadata: Field values to match; fields must be in indexed_fields
+            limit: Maximum number of objects returned
+
+        Returns:
+            Matching objects as stored, ordered by title
+
+        Raises:
+            ValueError: If a metadata field is not indexed
+        """
+        clauses, params = [], []
+        for column, value in (
+            ("object_type", object_type),
+            ("title", title),
+            ("status", status),
+        ):
+            if value is not None:
+                clauses.append(f"o.{column} = ?")
+                params.append(value)
+        if title_like is not None:
+            clauses.append("o.title LIKE ?")
+            params.append(title_like)
+        if collection_id is not None:
+            clauses.append(
+                "o.id IN (SELECT object_id FROM memberships WHERE collection_id = ?)"
+            )
+            params.append(collection_id)
+        for field, value in (metadata or {}).items():
+            if field not in self.indexed_fields:
+                raise ValueError(f"{field} is not an indexed metadata field")
+            clauses.append(
+                "o.id IN (SELECT object_id FROM metadata_values "
+                "WHERE field = ? AND value = ?)"
+            )
+            params.extend([field, _index_value(value)])
+
+        query = "SELECT o.data FROM objects o"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY o.title, o.id"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self._db.execute(query, params).fetchall()
+        return [json.loads(row["data"]) for row in rows]
+
+    def collection_members(self, collection_id: str) -> List[str]:
+        """Return the IDs of the mirrored direct members of a collection"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT object_id FROM memberships WHERE collection_id = ? "
+                "ORDER BY object_id",
+                (collection_id,),
+            ).fetchall()
+        return [row["object_id"] for row in rows]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM objects").fetchone()[0]
+
+
+def _as_list(value: Any) -> List[Any]:
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def _index_value(value: Any) -> str:
+    if isinstance(value, dict):
+        # {"value": ...} as found in field_values
+        value = value.get("value")
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+from pythonik.models.assets.assets import AssetCreate
+
+
+class IngestItem(BaseModel):
+    """An original to register in Iconik and upload from a local path."""
+
+    asset: AssetCreate
+    file_path: str
+    storage_id: str
+    format_name: str = "ORIGINAL"
+    file_set_name: Optional[str] = None
+    directory_path: str = ""
+
+
+class IngestResult(BaseModel):
+    """Outcome of ingesting a single item.
+
+    `timings` maps each stage that ran to its latency in seconds. When
+    `success` is False, `stage` is the stage that failed.
+    """
+
+    file_path: str
+    asset_id: Optional[str] = None
+    format_id: Optional[str] = None
+    file_set_id: Optional[str] = None
+    file_id: Optional[str] = None
+    success: bool = False
+    stage: Optional[str] = None
+    status_code: Optional[int] = None
+    error: Optional[str] = None
+    rolled_back: bool = False
+    timings: Dict[str, float] = Field(default_factory=dict)
+
+
+class IngestReport(BaseModel):
+    """Results of an ingest run with the total time spent in each stage."""
+
+    results: List[IngestResult] = []
+    stage_seconds: Dict[str, float] = Field(default_factory=dict)
+    elapsed: float = 0.0
+
+    @property
+    def succeeded(self) -> int:
+        return sum(1 for result in self.results if result.success)
+
+    @property
+    def failed(self) -> int:
+        return len(self.results) - self.succeeded
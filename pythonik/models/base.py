@@ -11,6 +11,62 @@ class Response(BaseModel):
     response: Any
     data: Any
     # data: Optional[BaseModel] = None
+    not_found: bool = False
+    # a write that was not sent because it would change nothing; `response`
+    # is a SkippedWriteResponse and `data` holds the current values
+    skipped: bool = False
+
+
+class NotFoundResponse:
+    """
+    Wraps a 404 response whose error was intercepted.
+
+    raise_for_status does nothing, raise_for_status_404 raises the original
+    HTTPError, everything else is read from the wrapped response. The
+    wrapped response itself is left untouched.
+    """
+
+    __slots__ = ("_response",)
+
+    def __init__(self, response: Any):
+        self._response = response
+
+    def raise_for_status(self) -> None:
+        """Does nothing, the 404 was intercepted"""
+
+    def raise_for_status_404(self) -> None:
+        self._response.raise_for_status()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._response, name)
+
+
+class SkippedWriteResponse:
+    """
+    Stands in for the response of a write that was not sent because it
+    would change nothing.
+
+    It is ok, so callers checking `response.ok` treat the write as done,
+    and raise_for_status does nothing. No request was made, so there is no
+    status code and no content.
+    """
+
+    __slots__ = ()
+
+    ok = True
+    status_code = None
+    reason = "Skipped, nothing to change"
+    content = b""
+    text = ""
+
+    def raise_for_status(self) -> None:
+        """Does nothing, the write was skipped"""
+
+    def __bool__(self) -> bool:
+        return True
+
+    def __repr__(self) -> str:
+        return "<SkippedWriteResponse>"
 
 class ObjectType(str, Enum):
     ASSETS = "assets"
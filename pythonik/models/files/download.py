@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class DownloadResult(BaseModel):
+    """Outcome of a ranged download to a local file."""
+
+    path: str
+    size: Optional[int] = None
+    bytes_downloaded: int = 0
+    chunks: int = 0
+    resumed_chunks: int = 0
+    checksum_verified: Optional[bool] = None
+    success: bool = False
+    status_code: Optional[int] = None
+    error: Optional[str] = None
@@ -115,3 +115,37 @@ class Files(PaginatedResponse):
 
 class FileSets(PaginatedResponse):
     objects: Optional[List[FileSet]] = []
+
+
+class DirectoryIngestFailure(BaseModel):
+    """A directory ingest entry that failed.
+
+    `stage` is where it failed: "scan_directory" or "stat" when the local
+    tree could not be read, otherwise the request that failed, with its
+    `status_code` when there was a response.
+    """
+
+    path: str
+    stage: Optional[str] = None
+    status_code: Optional[int] = None
+    error: Optional[str] = None
+
+
+class DirectoryIngestResult(BaseModel):
+    """Counters for a directory ingest.
+
+    Only the first failures are kept in `failures` so memory stays flat on
+    very large trees; `failed` counts all of them.
+    """
+
+    file_set_id: Optional[str] = None
+    files_created: int = 0
+    directories_created: int = 0
+    bytes_registered: int = 0
+    uploaded: int = 0
+    failed: int = 0
+    failures: List[DirectoryIngestFailure] = []
+
+    @property
+    def success(self) -> bool:
+        return self.file_set_id is not None and self.failed == 0
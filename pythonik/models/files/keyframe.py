@@ -53,3 +53,25 @@ class Keyframe(BaseModel):
 
 class Keyframes(PaginatedResponse):
     objects: Optional[List[Keyframe]] = []
+
+
+class KeyframeUploadItem(BaseModel):
+    """A keyframe to create on an asset together with the local image to upload."""
+
+    keyframe: Keyframe
+    file_path: str
+
+
+class KeyframeUploadResult(BaseModel):
+    """Outcome of uploading a single keyframe.
+
+    `stage` is the last pipeline stage reached: "create", "upload_id",
+    "upload" or "update". When `success` is False it is the stage that failed.
+    """
+
+    file_path: Optional[str] = ""
+    keyframe_id: Optional[str] = None
+    success: bool = False
+    stage: Optional[str] = None
+    status_code: Optional[int] = None
+    error: Optional[str] = None
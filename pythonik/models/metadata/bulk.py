@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, List, Optional, Union
+
+from pydantic import BaseModel, Field
+
+from pythonik.models.mutation.metadata.mutate import UpdateMetadata
+
+
+class MetadataWriteItem(BaseModel):
+    """One metadata write for bulk_write_metadata. Without a view_id the
+    values are written directly to the object."""
+
+    object_type: str
+    object_id: str
+    view_id: Optional[str] = None
+    metadata: Union[UpdateMetadata, Dict[str, Any]]
+
+
+class MetadataWriteResult(BaseModel):
+    """Outcome of one bulk metadata write."""
+
+    object_type: str
+    object_id: str
+    view_id: Optional[str] = None
+    success: bool = False
+    skipped: bool = False
+    status_code: Optional[int] = None
+    attempts: int = 0
+    error: Optional[str] = None
+
+
+class MetadataWriteReport(BaseModel):
+    """Running totals of a bulk metadata write, updated as results arrive.
+    Skipped writes are counted as succeeded too."""
+
+    succeeded: int = 0
+    failed: int = 0
+    skipped: int = 0
+    retries: int = 0
+    started: float = Field(default_factory=time.monotonic)
+    elapsed: float = 0.0
+
+    @property
+    def total(self) -> int:
+        return self.succeeded + self.failed
+
+    @property
+    def throughput(self) -> float:
+        """Completed writes per second"""
+        return self.total / self.elapsed if self.elapsed else 0.0
+
+
+class MetadataImportFailure(BaseModel):
+    """A record that could not be imported."""
+
+    record: int
+    object_id: Optional[str] = None
+    status_code: Optional[int] = None
+    error: Optional[str] = None
+
+
+class MetadataImportReport(BaseModel):
+    """Outcome of a metadata import run."""
+
+    path: str
+    records: int = 0
+    resumed_from: int = 0
+    written: int = 0
+    skipped: int = 0
+    failed: int = 0
+    unmapped_columns: List[str] = []
+    failures: List[MetadataImportFailure] = []
+    elapsed: float = 0.0
+
+    @property
+    def success(self) -> bool:
+        return self.failed == 0
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Dict, Iterator, NamedTuple, Optional
+
+from pythonik.models.metadata.views import ViewMetadata
+
+
+class MetadataKey(NamedTuple):
+    """Identifies the metadata of one object in one view."""
+
+    object_type: str
+    object_id: str
+    view_id: Optional[str] = None
+
+
+class ViewMetadataSet(Mapping):
+    """
+    Read-only result of fetching metadata for many (object, view) pairs,
+    mapping each MetadataKey to its ViewMetadata.
+
+    Pairs that returned 404 map to the intercept_404 model, or to None, and
+    are listed in `missing`. Pairs whose request failed otherwise map to
+    None and their status codes, or error messages for connection errors,
+    are in `failed`. The ViewMetadata models are shared and must be treated
+    as read-only.
+    """
+
+    def __init__(
+        self,
+        metadata: Dict[MetadataKey, Optional[ViewMetadata]],
+        missing: frozenset = frozenset(),
+        failed: Optional[Dict[MetadataKey, object]] = None,
+    ):
+        self._metadata = MappingProxyType(dict(metadata))
+        self.missing = frozenset(missing)
+        self.failed = MappingProxyType(dict(failed or {}))
+
+    def __getitem__(self, key) -> Optional[ViewMetadata]:
+        return self._metadata[MetadataKey(*key)]
+
+    def __iter__(self) -> Iterator[MetadataKey]:
+        return iter(self._metadata)
+
+    def __len__(self) -> int:
+        return len(self._metadata)
+
+    def views(self, object_type: str, object_id: str) -> Mapping:
+        """Return the metadata of one object, keyed by view ID"""
+        return MappingProxyType(
+            {
+                key.view_id: value
+                for key, value in self._metadata.items()
+                if key.object_type == object_type and key.object_id == object_id
+            }
+        )
+
+    @property
+    def ok(self) -> bool:
+        """Whether every request succeeded or was not found"""
+        return not self.failed
+
+    def __repr__(self) -> str:
+        return (
+            f"ViewMetadataSet({len(self)} entries, {len(self.missing)} missing, "
+            f"{len(self.failed)} failed)"
+        )
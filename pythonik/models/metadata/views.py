@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, RootModel
+from pydantic import BaseModel, RootModel, model_validator
 
 
 class FieldValue(BaseModel):
@@ -90,46 +90,29 @@ class ViewMetadata(BaseModel):
     object_type: Optional[str] = ""
     version_id: Optional[str] = ""
 
-    def __init__(self, **data: Any) -> None:
-        """Initialize with fallback for metadata_values.
+    @model_validator(mode="before")
+    @classmethod
+    def _values_to_metadata_values(cls, data: Any) -> Any:
+        """Fall back to the "values" format for metadata_values.
 
-        This method transforms the input data structure when 'metadata_values'
-        is not provided by moving 'values' fields to 'field_values' within a
-        nested structure.
+        When 'metadata_values' is not provided, every top-level field of the
+        form {"values": [...]} is moved to 'field_values' within a nested
+        metadata_values structure. This is done in a single pass, leaving the
+        nested models to be validated once by pydantic.
 
         Args:
-            **data: Input data for initialization
+            data: Input data for validation
         """
-        if "metadata_values" not in data or data["metadata_values"] is None:
-            metadata_values = {}
-
-            # Check if any dictionary in values contains a 'values' key
-            has_values = any(
-                "values" in item
-                for item in data.values()
-                if isinstance(item, dict)
-            )
-
-            if has_values:
-                # Transform each field
-                for key, value in list(data.items()):
-                    if isinstance(value, dict) and "values" in value:
-                        # Get the values list, ensuring it's not None
-                        values_list = value.get("values", [])
-                        if values_list is None:
-                            # If values is None, create an empty FieldValues with None
-                            metadata_values[key] = {
-                                "field_values": None
-                            }
-                        else:
-                            # Otherwise, use the values list
-                            metadata_values[key] = {
-                                "field_values": values_list
-                            }
-                        # Don't remove the key from the original data to preserve it
-
-                # Set metadata_values in the data dictionary
-                data["metadata_values"] = MetadataValues(root=metadata_values)
-
-        # Initialize with all data fields
-        super().__init__(**data)
+        if not isinstance(data, dict) or data.get("metadata_values") is not None:
+            return data
+
+        metadata_values = {}
+        for key, value in data.items():
+            if isinstance(value, dict) and "values" in value:
+                # None is kept as None rather than becoming an empty list
+                metadata_values[key] = {"field_values": value["values"]}
+
+        if not metadata_values:
+            return data
+        # the original keys are kept, pydantic ignores them
+        return {**data, "metadata_values": metadata_values}
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel
+
+
+class ExportShard(BaseModel):
+    """
+    One slice of an export: the objects whose `field` is in [min, max).
+    The last shard of a key includes its max.
+    """
+
+    name: str
+    field: str
+    min: Optional[str] = None
+    max: Optional[str] = None
+    include_max: bool = False
+
+
+class ExportShardResult(BaseModel):
+    """Output file and counts of one exported shard."""
+
+    name: str
+    path: str
+    objects: int = 0
+    pages: int = 0
+    bytes: int = 0
+    elapsed: float = 0.0
+    error: Optional[str] = None
+
+
+class ExportManifest(BaseModel):
+    """Description of a sharded export, written next to its files."""
+
+    file_format: str
+    search_body: Dict[str, Any] = {}
+    started: str
+    elapsed: float = 0.0
+    shards: List[ExportShardResult] = []
+
+    @property
+    def objects(self) -> int:
+        return sum(shard.objects for shard in self.shards)
+
+    @property
+    def success(self) -> bool:
+        return all(shard.error is None for shard in self.shards)
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel
+
+
+class FacetBucket(BaseModel):
+    """One value of a facet and the number of matching objects."""
+
+    key: Any = None
+    doc_count: int = 0
+
+
+class Facet(BaseModel):
+    """Buckets of one faceted field."""
+
+    buckets: List[FacetBucket] = []
+    doc_count_error_upper_bound: Optional[int] = None
+    sum_other_doc_count: Optional[int] = None
+
+
+class SearchFacets(BaseModel):
+    """Total and facets of a search, without its objects."""
+
+    total: int = 0
+    facets: Dict[str, Facet] = {}
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel
+
+
+class SearchProfile(BaseModel):
+    """
+    Default search options for every search of a client.
+
+    Options left as None are not sent. Arguments passed to a search call,
+    and include_fields or exclude_fields set in its body, take precedence.
+    """
+
+    generate_signed_url: Optional[bool] = None
+    generate_signed_download_url: Optional[bool] = None
+    generate_signed_proxy_url: Optional[bool] = None
+    save_search_history: Optional[bool] = None
+    include_fields: Optional[List[str]] = None
+    exclude_fields: Optional[List[str]] = None
+
+    @classmethod
+    def lean(
+        cls,
+        include_fields: Optional[List[str]] = None,
+        exclude_fields: Optional[List[str]] = None,
+    ) -> "SearchProfile":
+        """Profile for machine consumers: no signed URLs and no search history"""
+        return cls(
+            generate_signed_url=False,
+            generate_signed_download_url=False,
+            generate_signed_proxy_url=False,
+            save_search_history=False,
+            include_fields=include_fields,
+            exclude_fields=exclude_fields,
+        )
+
+    def params(self) -> Dict[str, Any]:
+        """The query parameters this profile sets"""
+        return self.model_dump(
+            exclude_none=True, exclude={"include_fields", "exclude_fields"}
+        )
+
+    def apply_projection(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """Return the body with this profile's projections where it sets none"""
+        projection = {
+            key: value
+            for key, value in (
+                ("include_fields", self.include_fields),
+                ("exclude_fields", self.exclude_fields),
+            )
+            if value is not None and not body.get(key)
+        }
+        return {**body, **projection} if projection else body
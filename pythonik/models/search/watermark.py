@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+from typing import Any, List, Optional
+
+from pydantic import BaseModel
+
+
+class Watermark(BaseModel):
+    """Position of a change feed: the last object seen, in (date_modified, id) order."""
+
+    date_modified: str
+    object_id: Optional[str] = None
+    search_after: List[Any] = []
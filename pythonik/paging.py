@@ -0,0 +1,180 @@
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+import requests
+
+
+DEFAULT_INITIAL_PAGE_SIZE = 100
+DEFAULT_MIN_PAGE_SIZE = 10
+DEFAULT_MAX_PAGE_SIZE = 500
+DEFAULT_TARGET_PAGE_SECONDS = 1.0
+
+# sends a page request: (per_page, page number or None, cursor or None)
+PageSender = Callable[[int, Optional[int], Any], requests.Response]
+
+
+class AdaptivePageSize:
+    """
+    Page size for auto-paginating readers, tuned from the observed latency
+    and size of each page.
+
+    After every page the size moves towards the number of objects that
+    would take `target_seconds` to fetch, and that would stay below
+    `max_page_bytes` if given. It at most doubles from one page to the
+    next and is halved when a request times out.
+
+    With page numbers, changing the size would move the offset of the next
+    page, so the size is only doubled or halved, and only doubled when the
+    offset is a multiple of the new size.
+
+    Args:
+        initial: Size of the first page
+        minimum: Smallest size
+        maximum: Largest size
+        target_seconds: Time a page should take
+        max_page_bytes: Optional largest response size in bytes
+    """
+
+    def __init__(
+        self,
+        initial: int = DEFAULT_INITIAL_PAGE_SIZE,
+        minimum: int = DEFAULT_MIN_PAGE_SIZE,
+        maximum: int = DEFAULT_MAX_PAGE_SIZE,
+        target_seconds: float = DEFAULT_TARGET_PAGE_SECONDS,
+        max_page_bytes: Optional[int] = None,
+    ):
+        if not 1 <= minimum <= initial <= maximum:
+            raise ValueError("Expected 1 <= minimum <= initial <= maximum")
+        self.size = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target_seconds = target_seconds
+        self.max_page_bytes = max_page_bytes
+        self.timeouts = 0
+
+    @classmethod
+    def fixed(cls, size: int) -> "AdaptivePageSize":
+        """A page size that never changes"""
+        return cls(size, size, size)
+
+    def _ideal(self, elapsed: float, nbytes: int, count: int) -> int:
+        ideal = self.target_seconds / max(elapsed / count, 1e-6)
+        if self.max_page_bytes:
+            ideal = min(ideal, self.max_page_bytes / max(nbytes / count, 1))
+        return int(ideal)
+
+    def observe(
+        self, elapsed: float, nbytes: int, count: int, offset: Optional[int] = None
+    ) -> int:
+        """
+        Update the size from a fetched page.
+
+        Args:
+            elapsed: Seconds the request took
+            nbytes: Size of the response body
+            count: Number of objects in the page
+            offset: With page numbers, the offset of the next page
+
+        Returns:
+            The size of the next page
+        """
+        if count <= 0:
+            return self.size
+        ideal = self._ideal(elapsed, nbytes, count)
+        if offset is None:
+            self.size = max(self.minimum, min(self.maximum, 2 * self.size, ideal))
+            return self.size
+
+        size = self.size
+        if ideal > size:
+            while 2 * size <= min(ideal, self.maximum) and offset % (2 * size) == 0:
+                size *= 2
+        else:
+            while size % 2 == 0 and max(ideal, self.minimum) <= size // 2:
+                size //= 2
+        self.size = size
+        return size
+
+    def shrink(self, offset: Optional[int] = None) -> bool:
+        """
+        Halve the size after a timeout.
+
+        Args:
+            offset: With page numbers, the offset of the page being fetched
+
+        Returns:
+            False if the size cannot shrink any further
+        """
+        self.timeouts += 1
+        size = self.size // 2
+        if size < self.minimum or (offset is not None and self.size % 2):
+            return False
+        self.size = size
+        return True
+
+
+# a fixed page size or an AdaptivePageSize
+PageSize = Union[int, AdaptivePageSize]
+
+
+def as_page_size(per_page: Optional[PageSize]) -> AdaptivePageSize:
+    """Return per_page as AdaptivePageSize, a new default one if None"""
+    if per_page is None:
+        return AdaptivePageSize()
+    if isinstance(per_page, AdaptivePageSize):
+        return per_page
+    return AdaptivePageSize.fixed(per_page)
+
+
+def adaptive_pages(
+    pager: AdaptivePageSize,
+    send: PageSender,
+    next_cursor: Optional[Callable[[List[Dict[str, Any]]], Any]] = None,
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Fetch every page of a paginated endpoint with a tuned page size.
+
+    Args:
+        pager: The page size
+        send: Sends the request for a page
+        next_cursor: Returns the cursor of the next page from the objects of
+            a page, e.g. the last `_sort` values; page numbers are used when
+            None
+
+    Yields:
+        Lists of objects as plain dicts
+
+    Raises:
+        requests.Timeout: If a request at the smallest size times out
+        requests.HTTPError: If a request fails
+    """
+    offset = 0
+    cursor = None
+    while True:
+        size = pager.size
+        page = None if next_cursor else offset // size + 1
+        started = time.monotonic()
+        try:
+            resp = send(size, page, cursor)
+        except requests.Timeout:
+            if pager.shrink(None if next_cursor else offset):
+                continue
+            raise
+        elapsed = time.monotonic() - started
+        resp.raise_for_status()
+        data = resp.json()
+        objects = data.get("objects") or []
+        offset += size
+        pager.observe(
+            elapsed, len(resp.content), len(objects), None if next_cursor else offset
+        )
+        if objects:
+            yield objects
+        if len(objects) < size:
+            return
+        if next_cursor:
+            cursor = next_cursor(objects)
+            if not cursor:
+                return
+        elif data.get("pages") is not None and page >= data["pages"]:
+            return
@@ -0,0 +1,222 @@
+import json
+from collections.abc import Mapping
+from datetime import date, datetime
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from pydantic import BaseModel
+
+
+JSON_SEPARATORS = (",", ":")
+
+
+def _dumps(value: Any) -> str:
+    """Canonical JSON, the form used for search cache keys"""
+    return json.dumps(value, sort_keys=True, separators=JSON_SEPARATORS, default=str)
+
+
+def term_value(value: Any) -> str:
+    """Format a value as it is sent in a filter term"""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+class Q:
+    """
+    Search filter built from terms combined with `&` (AND) and `|` (OR).
+
+    Example:
+        >>> f = Q.term("status", "ACTIVE") & Q.range("date_created", min="2024-01-01")
+        >>> body = f.compile(doc_types=["assets"], sort=[{"name": "id"}])
+        >>> spec.iter_pages(body)
+    """
+
+    __slots__ = ("operator", "terms", "children")
+
+    def __init__(
+        self,
+        operator: str = "AND",
+        terms: Sequence[Dict[str, Any]] = (),
+        children: Sequence["Q"] = (),
+    ):
+        self.operator = operator
+        self.terms: Tuple[Dict[str, Any], ...] = tuple(terms)
+        self.children: Tuple["Q", ...] = tuple(children)
+
+    @classmethod
+    def term(
+        cls,
+        name: str,
+        value: Any = None,
+        value_in: Optional[Sequence[Any]] = None,
+        exists: Optional[bool] = None,
+        missing: Optional[bool] = None,
+    ) -> "Q":
+        """
+        Match a field's value, one of several values, or its presence.
+
+        Args:
+            name: Name of the field, e.g. "status" or a metadata field
+            value: The value the field must have
+            value_in: Values of which the field must have one
+            exists: Whether the field must have a value
+            missing: Whether the field must have no value
+        """
+        term: Dict[str, Any] = {"name": name}
+        if value is not None:
+            term["value"] = term_value(value)
+        if value_in is not None:
+            term["value_in"] = [term_value(v) for v in value_in]
+        if exists is not None:
+            term["exists"] = exists
+        if missing is not None:
+            term["missing"] = missing
+        return cls(terms=[term])
+
+    @classmethod
+    def range(
+        cls,
+        name: str,
+        min: Any = None,
+        max: Any = None,
+        timezone: Optional[str] = None,
+    ) -> "Q":
+        """
+        Match a field's value within bounds, dates given as strings or
+        date/datetime objects.
+
+        Args:
+            name: Name of the field
+            min: Lower bound
+            max: Upper bound
+            timezone: Timezone of date bounds without one
+        """
+        bounds: Dict[str, Any] = {}
+        if min is not None:
+            bounds["min"] = term_value(min)
+        if max is not None:
+            bounds["max"] = term_value(max)
+        if timezone is not None:
+            bounds["timezone"] = timezone
+        return cls(terms=[{"name": name, "range": bounds}])
+
+    def _is_leaf(self) -> bool:
+        return len(self.terms) == 1 and not self.children
+
+    def _combine(self, operator: str, other: Any) -> "Q":
+        if not isinstance(other, Q):
+            return NotImplemented
+        terms: List[Dict[str, Any]] = []
+        children: List[Q] = []
+        for side in (self, other):
+            # flatten leaves and nodes with the same operator
+            if side._is_leaf() or side.operator == operator:
+                terms.extend(side.terms)
+                children.extend(side.children)
+            else:
+                children.append(side)
+        return Q(operator, terms, children)
+
+    def __and__(self, other: "Q") -> "Q":
+        return self._combine("AND", other)
+
+    def __or__(self, other: "Q") -> "Q":
+        return self._combine("OR", other)
+
+    def to_filter(self) -> Dict[str, Any]:
+        """Return the filter as the dict sent in a search body"""
+        result: Dict[str, Any] = {"operator": self.operator}
+        if self.terms:
+            result["terms"] = [dict(term) for term in self.terms]
+        if self.children:
+            result["filters"] = [child.to_filter() for child in self.children]
+        return result
+
+    def compile(self, **body: Any) -> "CompiledSearch":
+        """
+        Compile a search body with this filter.
+
+        Args:
+            **body: Other search body fields, e.g. doc_types, query, sort,
+                include_fields
+
+        Returns:
+            CompiledSearch to pass to SearchSpec.search or iter_pages
+        """
+        return CompiledSearch({**body, "filter": self.to_filter()})
+
+    def __repr__(self) -> str:
+        return f"Q({self.to_filter()!r})"
+
+
+class CompiledSearch(Mapping):
+    """
+    Read-only search body serialized once.
+
+    SearchSpec.search sends the stored bytes as they are, and paginated
+    readers only splice a new search_after into them for each page instead
+    of dumping the whole body again. It is a Mapping of the body's fields,
+    so it can be used wherever a dict body is accepted.
+
+    Args:
+        body: The search body as SearchBody model or dict
+        exclude_defaults: Whether to exclude default values when dumping a
+            SearchBody model
+    """
+
+    __slots__ = ("_body", "json", "_prefix", "_empty")
+
+    def __init__(
+        self,
+        body: Union[BaseModel, Mapping],
+        exclude_defaults: bool = True,
+    ):
+        if isinstance(body, BaseModel):
+            body = body.model_dump(exclude_defaults=exclude_defaults)
+        serialized = _dumps(dict(body))
+        # a private copy, so the caller's body can change without affecting it
+        data = json.loads(serialized)
+        without_search_after = {k: v for k, v in data.items() if k != "search_after"}
+        prefix = _dumps(without_search_after).encode()
+        object.__setattr__(self, "_body", MappingProxyType(data))
+        object.__setattr__(self, "json", serialized)
+        object.__setattr__(self, "_prefix", prefix[:-1])
+        object.__setattr__(self, "_empty", not without_search_after)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("CompiledSearch is read-only")
+
+    def encode(self, search_after: Optional[List[Any]] = None) -> bytes:
+        """
+        Return the request body, with `search_after` replacing the body's
+        own search_after when given.
+        """
+        if search_after is None:
+            search_after = self._body.get("search_after")
+        if not search_after:
+            return self._prefix + b"}"
+        separator = b"" if self._empty else b","
+        return b"".join(
+            (
+                self._prefix,
+                separator,
+                b'"search_after":',
+                _dumps(search_after).encode(),
+                b"}",
+            )
+        )
+
+    def __getitem__(self, key: str) -> Any:
+        return self._body[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._body)
+
+    def __len__(self) -> int:
+        return len(self._body)
+
+    def __repr__(self) -> str:
+        return f"CompiledSearch({self.json})"
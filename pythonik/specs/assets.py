@@ -1,10 +1,15 @@
-from typing import Union, Dict, Any
+import os
+import time
+from requests import RequestException
+from concurrent.futures import ThreadPoolExecutor
+from typing import Union, Dict, Any, Callable, Iterable, Iterator, List, Tuple
 from typing import Optional
 
 from pythonik.models.assets.assets import Asset, AssetCreate, BulkDelete
 from pythonik.models.assets.segments import (
     BulkDeleteSegmentsBody,
     SegmentBody,
+    SegmentDetailResponse,
     SegmentListResponse,
     SegmentResponse,
 )
@@ -14,9 +19,17 @@ from pythonik.models.assets.versions import (
     AssetVersionFromAssetCreate,
     AssetVersion,
 )
-from pythonik.models.base import Response
+from pythonik.bandwidth import BandwidthScheduler
+from pythonik.concurrency import bounded_map
+from pythonik.exceptions import UnexpectedStorageMethodForProxy
+from pythonik.models.assets.ingest import IngestItem, IngestReport, IngestResult
+from pythonik.models.base import FileType, Response
+from pythonik.models.files.file import FileCreate, FileSetCreate
+from pythonik.models.files.format import FormatCreate
+from pythonik.paging import PageSize, adaptive_pages, as_page_size
 from pythonik.specs.base import Spec
 from pythonik.specs.collection import CollectionSpec
+from pythonik.specs.files import DEFAULT_TRANSFER_WORKERS, FilesSpec
 
 BASE = "assets"
 DELETE_QUEUE = "delete_queue"
@@ -33,13 +46,36 @@ BULK_DELETE_URL = DELETE_QUEUE + "/bulk/"
 PURGE_ALL_URL = DELETE_QUEUE + "/purge/all/"
 BULK_DELETE_SEGMENTS_URL = SEGMENT_URL + "bulk/"
 
+# errors that fail a single ingest item instead of the whole run
+INGEST_ERRORS = (
+    OSError,
+    ValueError,
+    NotImplementedError,
+    RequestException,
+    UnexpectedStorageMethodForProxy,
+)
+
+# (stage, data or None if it failed, seconds, status code, error)
+IngestStageOutcome = Tuple[str, Any, float, Optional[int], Optional[str]]
+
 
 class AssetSpec(Spec):
     server = "API/assets/"
 
-    def __init__(self, session, timeout=3, base_url: str = "https://app.iconik.io"):
-        self._collection_spec = CollectionSpec(session=session, timeout=timeout)
-        return super().__init__(session, timeout, base_url)
+    def __init__(
+        self,
+        session,
+        timeout=3,
+        base_url: str = "https://app.iconik.io",
+        bandwidth: Optional[BandwidthScheduler] = None,
+    ):
+        self._collection_spec = CollectionSpec(
+            session=session, timeout=timeout, bandwidth=bandwidth
+        )
+        self._files_spec = FilesSpec(
+            session=session, timeout=timeout, base_url=base_url, bandwidth=bandwidth
+        )
+        return super().__init__(session, timeout, base_url, bandwidth)
 
     @property
     def collections(self) -> CollectionSpec:
@@ -51,6 +87,16 @@ class AssetSpec(Spec):
         """
         return self._collection_spec
 
+    @property
+    def files(self) -> FilesSpec:
+        """
+        Access the files API
+
+        Returns:
+            FilesSpec: An instance of FilesSpec for working with formats, file sets and files
+        """
+        return self._files_spec
+
     def permanently_delete(self, **kwargs) -> Response:
         """
         Purge all assets and collections from the delete queue (Permanently delete)
@@ -610,3 +656,281 @@ class AssetSpec(Spec):
 
         response = self._get(GET_SEGMENTS_URL.format(asset_id), params=params, **kwargs)
         return self.parse_response(response, SegmentListResponse)
+
+    def iter_segments(
+        self,
+        asset_id: str,
+        per_page: Optional[PageSize] = None,
+        params: Optional[Dict[str, Any]] = None,
+        **kwargs,
+    ) -> Iterator[List[SegmentDetailResponse]]:
+        """
+        Iterate over every page of an asset's segments.
+
+        Args:
+            asset_id: The asset ID to get segments for
+            per_page: The number of items for each page, or an
+                AdaptivePageSize; an AdaptivePageSize with default settings
+                if None
+            params: Filters passed to the query string, e.g.
+                {"segment_type": "MARKER"}, see get_segments
+            **kwargs: Additional kwargs to pass to each request
+
+        Yields:
+            Lists of segments
+
+        Raises:
+            requests.HTTPError: If a request fails
+            requests.Timeout: If a request times out at the smallest page size
+        """
+
+        filters = dict(params or {})
+
+        def send(size, page, cursor):
+            page_params = {**filters, "per_page": size, "page": page}
+            return self._get(
+                GET_SEGMENTS_URL.format(asset_id), params=page_params, **kwargs
+            )
+
+        for objects in adaptive_pages(as_page_size(per_page), send):
+            yield [SegmentDetailResponse.model_validate(obj) for obj in objects]
+
+    def ingest(
+        self,
+        items: Iterable[Union[IngestItem, Dict[str, Any]]],
+        max_workers: int = DEFAULT_TRANSFER_WORKERS,
+        rollback: bool = True,
+        **kwargs,
+    ) -> IngestReport:
+        """
+        Register and upload many originals, running assets in parallel.
+
+        Each item goes through create, create_asset_format,
+        create_asset_file_sets, create_asset_file and the upload of the
+        original. The file and asset are then closed and activated
+        concurrently. Items share a pool of `max_workers` threads and one
+        pooled storage session.
+
+        Args:
+            items: IngestItem models or dicts, consumed lazily
+            max_workers: Maximum number of assets ingested at once
+            rollback: If True, delete the objects created for an item that fails
+            **kwargs: Additional kwargs to pass to the Iconik API requests
+
+        Returns:
+            IngestReport with a result per item and the total time per stage
+        """
+        started = time.perf_counter()
+        report = IngestReport()
+        storage_session = self.files._storage_session(max_workers)
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as finalize_pool:
+                items = (
+                    item if isinstance(item, IngestItem) else IngestItem.model_validate(item)
+                    for item in items
+                )
+                for item, result, error in bounded_map(
+                    lambda i: self._ingest_item(
+                        i, storage_session, finalize_pool, rollback, **kwargs
+                    ),
+                    items,
+                    max_workers=max_workers,
+                ):
+                    if error is not None:
+                        result = IngestResult(file_path=item.file_path, error=str(error))
+                    report.results.append(result)
+                    for stage, seconds in result.timings.items():
+                        report.stage_seconds[stage] = (
+                            report.stage_seconds.get(stage, 0.0) + seconds
+                        )
+        finally:
+            storage_session.close()
+
+        report.elapsed = time.perf_counter() - started
+        return report
+
+    def _ingest_item(
+        self,
+        item: IngestItem,
+        storage_session,
+        finalize_pool: ThreadPoolExecutor,
+        rollback: bool,
+        **kwargs,
+    ) -> IngestResult:
+        """Run a single item through the ingest pipeline"""
+        result = IngestResult(file_path=item.file_path)
+        name = os.path.basename(item.file_path)
+        try:
+            size = os.path.getsize(item.file_path)
+
+            asset = self._ingest_stage(
+                result, "create_asset", lambda: self.create(item.asset, **kwargs)
+            )
+            if asset is None:
+                return result
+            result.asset_id = asset.id
+
+            format_ = self._ingest_stage(
+                result,
+                "create_format",
+                lambda: self.files.create_asset_format(
+                    asset.id, FormatCreate(name=item.format_name), **kwargs
+                ),
+            )
+            if format_ is None:
+                return self._rollback_ingest(result, rollback)
+            result.format_id = format_.id
+
+            file_set = self._ingest_stage(
+                result,
+                "create_file_set",
+                lambda: self.files.create_asset_file_sets(
+                    asset.id,
+                    FileSetCreate(
+                        format_id=format_.id,
+                        name=item.file_set_name or name,
+                        storage_id=item.storage_id,
+                        base_dir=item.directory_path,
+                    ),
+                    **kwargs,
+                ),
+            )
+            if file_set is None:
+                return self._rollback_ingest(result, rollback)
+            result.file_set_id = file_set.id
+
+            file = self._ingest_stage(
+                result,
+                "create_file",
+                lambda: self.files.create_asset_file(
+                    asset.id,
+                    FileCreate(
+                        file_set_id=file_set.id,
+                        format_id=format_.id,
+                        storage_id=item.storage_id,
+                        name=name,
+                        original_name=name,
+                        size=size,
+                        type=FileType.FILE.value,
+                        directory_path=item.directory_path,
+                        status="OPEN",
+                    ),
+                    **kwargs,
+                ),
+            )
+            if file is None:
+                return self._rollback_ingest(result, rollback)
+            result.file_id = file.id
+
+            uploaded = self._ingest_stage(
+                result,
+                "upload",
+                lambda: self.files.upload_asset_file(
+                    file, item.file_path, session=storage_session
+                ),
+                expect_data=False,
+            )
+            if uploaded is None:
+                return self._rollback_ingest(result, rollback)
+
+            # closing the file and activating the asset don't depend on each
+            # other; the outcomes are recorded here, on the item's thread
+            close_file = finalize_pool.submit(
+                self._run_ingest_stage,
+                "close_file",
+                lambda: self.files.partial_update_asset_file(
+                    asset.id, file.id, {"status": "CLOSED"}, **kwargs
+                ),
+            )
+            activate_asset = self._run_ingest_stage(
+                "activate_asset",
+                lambda: self.partial_update_asset(
+                    asset.id, {"status": "ACTIVE"}, **kwargs
+                ),
+            )
+            closed = self._record_stage(result, close_file.result())
+            activated = self._record_stage(result, activate_asset)
+            if closed is None or activated is None:
+                return self._rollback_ingest(result, rollback)
+        except INGEST_ERRORS as e:
+            result.error = str(e)
+            return self._rollback_ingest(result, rollback)
+
+        result.stage = None
+        result.success = True
+        return result
+
+    def _ingest_stage(
+        self,
+        result: IngestResult,
+        stage: str,
+        call: Callable[[], Response],
+        expect_data: bool = True,
+    ):
+        """
+        Run one ingest stage and record it in `result`.
+
+        Returns the parsed data of the response (or True when `expect_data`
+        is False), or None if the stage failed.
+        """
+        return self._record_stage(
+            result, self._run_ingest_stage(stage, call, expect_data)
+        )
+
+    @staticmethod
+    def _run_ingest_stage(
+        stage: str, call: Callable[[], Response], expect_data: bool = True
+    ) -> IngestStageOutcome:
+        """Run one ingest stage without touching the item's result"""
+        started = time.perf_counter()
+        try:
+            response = call()
+        except INGEST_ERRORS as e:
+            return stage, None, time.perf_counter() - started, None, str(e)
+        elapsed = time.perf_counter() - started
+
+        if not response.response.ok:
+            return (
+                stage,
+                None,
+                elapsed,
+                response.response.status_code,
+                response.response.text,
+            )
+        return stage, response.data if expect_data else True, elapsed, None, None
+
+    @staticmethod
+    def _record_stage(result: IngestResult, outcome: IngestStageOutcome):
+        """
+        Record a stage's latency and, if it is the item's first failure, its
+        error; return the stage's data or None if it failed.
+        """
+        stage, data, seconds, status_code, error = outcome
+        result.timings[stage] = seconds
+        if result.error is None:
+            result.stage = stage
+            if data is None:
+                result.status_code = status_code
+                result.error = error
+        return data
+
+    def _rollback_ingest(self, result: IngestResult, rollback: bool) -> IngestResult:
+        """Delete whatever was created for a failed item, newest first"""
+        if not rollback or result.asset_id is None:
+            return result
+
+        responses = []
+        try:
+            if result.file_id:
+                responses.append(
+                    self.files.delete_asset_file(result.asset_id, result.file_id)
+                )
+            if result.file_set_id:
+                responses.append(
+                    self.files.delete_asset_file_set(result.asset_id, result.file_set_id)
+                )
+            responses.append(self.delete(result.asset_id))
+        except RequestException:
+            return result
+        result.rolled_back = all(r.response.ok for r in responses)
+        return result
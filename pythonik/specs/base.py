@@ -4,6 +4,7 @@ from typing import Union, Type, Dict, Any, Optional
 from pydantic import BaseModel
 from requests import Request, Response, Session
 
+from pythonik.bandwidth import BandwidthScheduler, Priority
 from pythonik.models.base import Response as PythonikResponse
 
 class Spec:
@@ -15,9 +16,16 @@ class Spec:
     def set_class_attribute(cls, name, value):
         setattr(cls, name, value)
 
-    def __init__(self, session: Session, timeout: int = 3, base_url: str = "https://app.iconik.io"):
+    def __init__(
+        self,
+        session: Session,
+        timeout: int = 3,
+        base_url: str = "https://app.iconik.io",
+        bandwidth: Optional[BandwidthScheduler] = None,
+    ):
         self.session = session
         self.timeout = timeout
+        self.bandwidth = bandwidth
         self.set_class_attribute("base_url", base_url)
     
         
@@ -69,10 +77,12 @@ class Spec:
 
         url = self.gen_url(path)
         print(url)
-        request = Request(
-            method=method, url=url, headers=self.session.headers, **kwargs
-        )
+        headers = {**self.session.headers, **(kwargs.pop("headers", None) or {})}
+        request = Request(method=method, url=url, headers=headers, **kwargs)
         prepped_request = self.session.prepare_request(request)
+        if self.bandwidth is not None and isinstance(prepped_request.body, bytes):
+            # account for API traffic so transfers only use the capacity left over
+            self.bandwidth.acquire(len(prepped_request.body), Priority.CONTROL)
         response = self.session.send(prepped_request, timeout=self.timeout)
 
         return response
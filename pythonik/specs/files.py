@@ -1,19 +1,29 @@
+import hashlib
+import json
+import os
+import re
 from urllib.parse import urlparse
 from xml.dom.minidom import parseString
 from functools import wraps
 import warnings
-from typing import Union, Dict, Any
+from typing import Union, Dict, Any, Callable, Iterable, List, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
 
+from pythonik.bandwidth import Priority
+from pythonik.concurrency import bounded_map
 from pythonik.constants import (
     GCS_KEYFRAME_LOCATION_KEY,
     GCS_UPLOADID_KEY,
+    MAX_REPORTED_FAILURES,
     S3_UPLOADID_KEY,
 )
-from pythonik.exceptions import UnexpectedStorageMethodForProxy
-from pythonik.models.base import Response, StorageMethod
+from pythonik.exceptions import TransferError, UnexpectedStorageMethodForProxy
+from pythonik.models.base import FileType, Response, StorageMethod
 from pythonik.models.files.file import (
+    DirectoryIngestFailure,
+    DirectoryIngestResult,
     File,
     FileSetsFilesResponse,
     Files,
@@ -27,7 +37,10 @@ from pythonik.models.files.keyframe import (
     Keyframe,
     Keyframes,
     GCSKeyframeUploadResponse,
+    KeyframeUploadItem,
+    KeyframeUploadResult,
 )
+from pythonik.models.files.download import DownloadResult
 from pythonik.models.files.proxy import Proxies, Proxy
 from pythonik.specs.base import Spec, PythonikResponse
 from pythonik.models.files.storage import Storage, Storages
@@ -54,6 +67,13 @@ GET_ASSETS_VERSION_FILE_SETS_PATH = "assets/{}/versions/{}/file_sets/"
 GET_ASSETS_VERSION_FILES_PATH = "assets/{}/versions/{}/files/"
 GET_ASSETS_VERSION_FORMATS_PATH = "assets/{}/versions/{}/formats/"
 
+DEFAULT_TRANSFER_WORKERS = 8
+DEFAULT_DIRECTORY_INGEST_WORKERS = 16
+DEFAULT_DOWNLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+DOWNLOAD_BLOCK_SIZE = 64 * 1024
+DOWNLOAD_PROGRESS_SUFFIX = ".progress"
+CONTENT_RANGE_PATTERN = re.compile(r"bytes \d+-\d+/(\d+)")
+
 
 class FilesSpec(Spec):
     server = "API/files/"
@@ -282,10 +302,15 @@ class FilesSpec(Spec):
         )
         return self.parse_response(response, Keyframe)
 
-    def get_upload_id_for_keyframe(self, keyframe: Keyframe) -> PythonikResponse:
+    def get_upload_id_for_keyframe(
+        self, keyframe: Keyframe, session: Optional[requests.Session] = None
+    ) -> PythonikResponse:
         """
         Get upload ID for keyframe. This ID is required to upload keyframe files.
 
+        :param keyframe: Keyframe to upload
+        :param session: Optional session used to talk to the storage, so callers
+        uploading many keyframes can reuse pooled connections
         :return: PythonikResponse
         :raises UnexpectedStorageMethodForProxy: When keyframe exists on an unsupported storage method (i.e. Pythonik cannot
         automatically determine the upload ID)
@@ -305,7 +330,9 @@ class FilesSpec(Spec):
                 f" Pythonik supports {supported_methods}."
             )
 
-        upload_url_response = requests.post(upload_url, headers=headers)
+        upload_url_response = (session or requests).post(
+            upload_url, headers=headers, timeout=self.timeout
+        )
         if not upload_url_response.ok:
             return PythonikResponse(response=upload_url_response, data=None)
 
@@ -333,6 +360,594 @@ class FilesSpec(Spec):
 
         return PythonikResponse(response=upload_url_response, data=data)
 
+    def upload_keyframes(
+        self,
+        asset_id: str,
+        frames: Iterable[Union[KeyframeUploadItem, Tuple[Union[Keyframe, Dict[str, Any]], str]]],
+        max_workers: int = DEFAULT_TRANSFER_WORKERS,
+        exclude_defaults: bool = True,
+        priority: Priority = Priority.BULK,
+        **kwargs,
+    ) -> List[KeyframeUploadResult]:
+        """
+        Create, upload and close many keyframes for an asset concurrently.
+
+        Each frame goes through create_asset_keyframe, get_upload_id_for_keyframe,
+        the upload of the image to storage and update_keyframe. Frames are
+        processed on a pool of `max_workers` threads so the stages of different
+        frames overlap, and all storage traffic shares one pooled session.
+        A failing frame does not stop the others.
+
+        Args:
+            asset_id: The ID of the asset
+            frames: KeyframeUploadItem models or (keyframe, file_path) tuples
+            max_workers: Maximum number of frames in flight
+            exclude_defaults: Whether to exclude default values when dumping Pydantic models
+            priority: Bandwidth priority class of the uploads
+            **kwargs: Additional kwargs to pass to the Iconik API requests
+
+        Returns:
+            List of KeyframeUploadResult, in the same order as `frames`
+        """
+        items = (
+            (index, frame if isinstance(frame, KeyframeUploadItem)
+             else KeyframeUploadItem(keyframe=frame[0], file_path=frame[1]))
+            for index, frame in enumerate(frames)
+        )
+        results = {}
+        storage_session = self._storage_session(max_workers)
+        try:
+            for (index, item), result, error in bounded_map(
+                lambda indexed: self._upload_keyframe(
+                    asset_id, indexed[1], storage_session, exclude_defaults, priority, **kwargs
+                ),
+                items,
+                max_workers=max_workers,
+            ):
+                if error is not None:
+                    result = KeyframeUploadResult(file_path=item.file_path, error=str(error))
+                results[index] = result
+        finally:
+            storage_session.close()
+
+        return [results[index] for index in sorted(results)]
+
+    def _upload_keyframe(
+        self,
+        asset_id: str,
+        item: KeyframeUploadItem,
+        storage_session: requests.Session,
+        exclude_defaults: bool,
+        priority: Priority,
+        **kwargs,
+    ) -> KeyframeUploadResult:
+        """Run a single keyframe through the upload pipeline"""
+        result = KeyframeUploadResult(file_path=item.file_path, stage="create")
+        try:
+            created = self.create_asset_keyframe(
+                asset_id, item.keyframe, exclude_defaults=exclude_defaults, **kwargs
+            )
+            if not created.response.ok:
+                return self._failed_transfer(result, created.response)
+            keyframe = created.data
+            result.keyframe_id = keyframe.id
+
+            result.stage = "upload_id"
+            upload = self.get_upload_id_for_keyframe(keyframe, session=storage_session)
+            if not upload.response.ok:
+                return self._failed_transfer(result, upload.response)
+
+            result.stage = "upload"
+            uploaded = self._put_to_storage(
+                storage_session, upload.data.location, item.file_path, priority
+            )
+            if not uploaded.ok:
+                return self._failed_transfer(result, uploaded)
+
+            result.stage = "update"
+            closed = self.update_keyframe(
+                asset_id,
+                keyframe.id,
+                keyframe.model_copy(update={"status": "CLOSED"}),
+                exclude_defaults=exclude_defaults,
+                **kwargs,
+            )
+            if not closed.response.ok:
+                return self._failed_transfer(result, closed.response)
+        except (OSError, ValueError, NotImplementedError,
+                UnexpectedStorageMethodForProxy, requests.RequestException) as e:
+            result.error = str(e)
+            return result
+
+        result.success = True
+        return result
+
+    @staticmethod
+    def _failed_transfer(result, response: requests.Response):
+        """Record a failed HTTP response on a transfer result"""
+        result.status_code = response.status_code
+        result.error = response.text
+        return result
+
+    @staticmethod
+    def _storage_session(pool_size: int) -> requests.Session:
+        """Create a session whose connection pool fits `pool_size` concurrent transfers"""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def _put_to_storage(
+        self,
+        session: requests.Session,
+        upload_url: str,
+        file_path: str,
+        priority: Priority = Priority.BULK,
+    ) -> requests.Response:
+        """Stream a local file to a resumable upload URL, paced by the bandwidth scheduler"""
+        size = os.path.getsize(file_path)
+        with open(file_path, "rb") as f:
+            body = f if self.bandwidth is None else self.bandwidth.reader(f, priority)
+            return session.put(
+                upload_url,
+                data=body,
+                headers={"Content-Length": str(size)},
+                timeout=self.timeout,
+            )
+
+    def upload_asset_file(
+        self,
+        file: File,
+        file_path: str,
+        session: Optional[requests.Session] = None,
+        priority: Priority = Priority.BULK,
+    ) -> PythonikResponse:
+        """
+        Upload the contents of a local file to the storage location of a created File.
+
+        :param file: File returned by create_asset_file
+        :param file_path: Local path of the contents to upload
+        :param session: Optional session used to talk to the storage
+        :param priority: Bandwidth priority class of the upload
+        :return: PythonikResponse with the storage response
+        :raises UnexpectedStorageMethodForProxy: When the file is on an unsupported storage method
+        """
+        storage = session or requests
+        if file.storage_method == StorageMethod.GCS:
+            start_response = storage.post(
+                file.upload_url,
+                headers={
+                    "X-Goog-Resumable": "start",
+                    "Origin": self.base_url,
+                    "Referer": self.base_url,
+                },
+            )
+            if not start_response.ok:
+                return PythonikResponse(response=start_response, data=None)
+            upload_url = start_response.headers[GCS_KEYFRAME_LOCATION_KEY]
+        elif file.storage_method == StorageMethod.S3:
+            raise NotImplementedError(
+                "Pythonik does not currently support uploading files to S3"
+            )
+        else:
+            supported_methods = [StorageMethod.S3, StorageMethod.GCS]
+            raise UnexpectedStorageMethodForProxy(
+                f"Unexpected storage method: {file.storage_method}."
+                f" Pythonik supports {supported_methods}."
+            )
+
+        response = self._put_to_storage(storage, upload_url, file_path, priority)
+        return PythonikResponse(response=response, data=None)
+
+    def ingest_directory(
+        self,
+        asset_id: str,
+        path: str,
+        format_id: str,
+        storage_id: str,
+        file_set_name: Optional[str] = None,
+        base_dir: str = "",
+        upload: bool = False,
+        max_workers: int = DEFAULT_DIRECTORY_INGEST_WORKERS,
+        priority: Priority = Priority.BULK,
+        **kwargs,
+    ) -> DirectoryIngestResult:
+        """
+        Register a local directory tree as a file set, optionally uploading it.
+
+        Creates a file set and then one file record per entry of the tree
+        (directories as FileType.DIRECTORY, with `directory_path` relative to
+        `path`). The tree is walked with a streaming scandir and at most
+        `2 * max_workers` requests are in flight, so memory stays flat no
+        matter how many entries there are.
+
+        Directories that cannot be listed and entries that cannot be read are
+        recorded as failures without stopping the walk.
+
+        Args:
+            asset_id: The ID of the asset
+            path: Local directory to ingest
+            format_id: ID of the format the file set belongs to
+            storage_id: ID of the storage holding the files
+            file_set_name: Name of the file set, defaults to the directory name
+            base_dir: Base directory of the file set on the storage
+            upload: If True, upload the contents of every file and close it
+            max_workers: Maximum number of concurrent requests
+            priority: Bandwidth priority class of the uploads
+            **kwargs: Additional kwargs to pass to the Iconik API requests
+
+        Returns:
+            DirectoryIngestResult
+
+        Raises:
+            NotADirectoryError: If path is not a directory
+        """
+        if not os.path.isdir(path):
+            raise NotADirectoryError(path)
+
+        result = DirectoryIngestResult()
+        file_set_response = self.create_asset_file_sets(
+            asset_id,
+            FileSetCreate(
+                format_id=format_id,
+                name=file_set_name or os.path.basename(os.path.normpath(path)),
+                storage_id=storage_id,
+                base_dir=base_dir,
+            ),
+            **kwargs,
+        )
+        if not file_set_response.response.ok:
+            self._record_directory_failure(
+                result, path, "create_file_set", file_set_response.response
+            )
+            return result
+        result.file_set_id = file_set_response.data.id
+
+        storage_session = self._storage_session(max_workers) if upload else None
+        try:
+            for entry, outcome, error in bounded_map(
+                lambda e: self._ingest_directory_entry(
+                    asset_id, result.file_set_id, format_id, storage_id,
+                    e, storage_session, priority, **kwargs
+                ),
+                self._walk_directory(
+                    path,
+                    lambda local_path, stage, e: self._record_directory_failure(
+                        result, local_path, stage, str(e)
+                    ),
+                ),
+                max_workers=max_workers,
+            ):
+                if error is not None:
+                    outcome = (None, str(error))
+                stage, failure = outcome
+                if failure is not None:
+                    self._record_directory_failure(result, entry[2], stage, failure)
+                elif entry[3] == FileType.DIRECTORY:
+                    result.directories_created += 1
+                else:
+                    result.files_created += 1
+                    result.bytes_registered += entry[4]
+                    if upload and entry[3] == FileType.FILE:
+                        result.uploaded += 1
+        finally:
+            if storage_session is not None:
+                storage_session.close()
+
+        return result
+
+    @staticmethod
+    def _walk_directory(
+        root: str, on_error: Callable[[str, str, OSError], None]
+    ) -> Iterable[Tuple[str, str, str, FileType, int]]:
+        """
+        Lazily walk a directory tree without following symlinks.
+
+        Yields (directory_path, name, local_path, file_type, size) tuples, with
+        directory_path relative to root. A directory that cannot be listed or
+        an entry that cannot be stat'ed is passed to
+        `on_error(local_path, stage, error)` and the walk goes on.
+        """
+        stack = [""]
+        while stack:
+            relative_dir = stack.pop()
+            directory = os.path.join(root, relative_dir) if relative_dir else root
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_symlink():
+                                file_type, size = FileType.SYMLINK, 0
+                            elif entry.is_dir(follow_symlinks=False):
+                                file_type, size = FileType.DIRECTORY, 0
+                                stack.append(os.path.join(relative_dir, entry.name))
+                            else:
+                                file_type = FileType.FILE
+                                size = entry.stat(follow_symlinks=False).st_size
+                        except OSError as e:
+                            on_error(entry.path, "stat", e)
+                            continue
+                        yield relative_dir, entry.name, entry.path, file_type, size
+            except OSError as e:
+                on_error(directory, "scan_directory", e)
+
+    def _ingest_directory_entry(
+        self,
+        asset_id: str,
+        file_set_id: str,
+        format_id: str,
+        storage_id: str,
+        entry: Tuple[str, str, str, FileType, int],
+        storage_session: Optional[requests.Session],
+        priority: Priority,
+        **kwargs,
+    ):
+        """
+        Create the file record for one entry and upload it if requested.
+
+        Returns (stage, None) on success or (stage, failure) where failure is
+        the failing response or an error message.
+        """
+        directory_path, name, local_path, file_type, size = entry
+        upload = storage_session is not None and file_type == FileType.FILE
+        created = self.create_asset_file(
+            asset_id,
+            FileCreate(
+                file_set_id=file_set_id,
+                format_id=format_id,
+                storage_id=storage_id,
+                name=name,
+                original_name=name,
+                size=size,
+                type=file_type.value,
+                directory_path=directory_path.replace(os.sep, "/"),
+                status="OPEN" if upload else "CLOSED",
+            ),
+            **kwargs,
+        )
+        if not created.response.ok:
+            return "create_file", created.response
+        if not upload:
+            return "create_file", None
+
+        try:
+            uploaded = self.upload_asset_file(
+                created.data, local_path, session=storage_session, priority=priority
+            )
+        except (OSError, NotImplementedError, UnexpectedStorageMethodForProxy,
+                requests.RequestException) as e:
+            return "upload", str(e)
+        if not uploaded.response.ok:
+            return "upload", uploaded.response
+
+        closed = self.partial_update_asset_file(
+            asset_id, created.data.id, {"status": "CLOSED"}, **kwargs
+        )
+        if not closed.response.ok:
+            return "close_file", closed.response
+        return "close_file", None
+
+    @staticmethod
+    def _record_directory_failure(
+        result: DirectoryIngestResult, path: str, stage: Optional[str], failure
+    ) -> None:
+        result.failed += 1
+        if len(result.failures) >= MAX_REPORTED_FAILURES:
+            return
+        if isinstance(failure, requests.Response):
+            result.failures.append(
+                DirectoryIngestFailure(
+                    path=path,
+                    stage=stage,
+                    status_code=failure.status_code,
+                    error=failure.text,
+                )
+            )
+        else:
+            result.failures.append(
+                DirectoryIngestFailure(path=path, stage=stage, error=failure)
+            )
+
+    def download(
+        self,
+        source: Union[File, Proxy, Keyframe, str],
+        destination: str,
+        size: Optional[int] = None,
+        checksum: Optional[str] = None,
+        chunk_size: int = DEFAULT_DOWNLOAD_CHUNK_SIZE,
+        max_workers: int = DEFAULT_TRANSFER_WORKERS,
+        resume: bool = True,
+        priority: Priority = Priority.BULK,
+    ) -> DownloadResult:
+        """
+        Download a file, proxy or keyframe using concurrent HTTP Range requests.
+
+        The destination is preallocated and every range is written straight to
+        its offset. Completed ranges are logged next to the destination in a
+        `.progress` file, so calling download again after a failure only
+        fetches the missing ranges. Servers that ignore Range requests are
+        handled with a single streamed GET.
+
+        Args:
+            source: A File, Proxy or Keyframe with a signed `url`, or the URL itself
+            destination: Local path to write to
+            size: Expected size in bytes, defaults to `source.size`
+            checksum: Expected MD5 hex digest, defaults to `File.checksum`
+            chunk_size: Size of each ranged request in bytes
+            max_workers: Maximum number of concurrent range requests
+            resume: Whether to reuse ranges completed by a previous attempt
+            priority: Bandwidth priority class of the download
+
+        Returns:
+            DownloadResult
+
+        Raises:
+            ValueError: If no download URL is available
+        """
+        if isinstance(source, str):
+            url = source
+        else:
+            url = source.url
+            if size is None:
+                size = source.size or None
+            if checksum is None and isinstance(source, File):
+                checksum = source.checksum or None
+        if not url:
+            raise ValueError(
+                "source has no download URL, fetch it with a signed URL first"
+            )
+
+        result = DownloadResult(path=destination)
+        progress_path = destination + DOWNLOAD_PROGRESS_SUFFIX
+        session = self._storage_session(max_workers)
+        try:
+            with session.get(
+                url, headers={"Range": "bytes=0-0"}, stream=True, timeout=self.timeout
+            ) as probe:
+                if probe.status_code == 416:
+                    # the first byte is out of range, the object is empty
+                    open(destination, "wb").close()
+                    return self._verify_download(result, size, checksum, progress_path)
+                if not probe.ok:
+                    return self._failed_transfer(result, probe)
+                match = CONTENT_RANGE_PATTERN.match(probe.headers.get("Content-Range", ""))
+                if probe.status_code != 206 or match is None:
+                    # no range support, the probe is the whole file
+                    result.chunks = 1
+                    blocks = self._paced(probe.iter_content(DOWNLOAD_BLOCK_SIZE), priority)
+                    with open(destination, "wb") as f:
+                        for block in blocks:
+                            f.write(block)
+                            result.bytes_downloaded += len(block)
+                    return self._verify_download(result, size, checksum, progress_path)
+
+            total = int(match.group(1))
+            if size is not None and size != total:
+                result.error = f"Expected {size} bytes, storage reports {total}"
+                return result
+            size = total
+
+            chunks = [
+                (index, start, min(start + chunk_size, size) - 1)
+                for index, start in enumerate(range(0, size, chunk_size))
+            ]
+            result.chunks = len(chunks)
+            done = (
+                self._load_download_progress(progress_path, size, chunk_size)
+                if resume and os.path.exists(destination)
+                else set()
+            )
+            result.resumed_chunks = len(done)
+
+            with open(destination, "r+b" if done else "wb") as f:
+                f.truncate(size)
+            with open(progress_path, "a" if done else "w") as progress:
+                if not done:
+                    progress.write(json.dumps({"size": size, "chunk_size": chunk_size}) + "\n")
+                    progress.flush()
+                remaining = (chunk for chunk in chunks if chunk[0] not in done)
+                for chunk, written, error in bounded_map(
+                    lambda c: self._download_range(
+                        session, url, destination, c[1], c[2], priority
+                    ),
+                    remaining,
+                    max_workers=max_workers,
+                ):
+                    if error is not None:
+                        if result.error is None:
+                            result.error = str(error)
+                            response = getattr(error, "response", None)
+                            result.status_code = getattr(response, "status_code", None)
+                        continue
+                    result.bytes_downloaded += written
+                    progress.write(f"{chunk[0]}\n")
+                    progress.flush()
+        except (OSError, requests.RequestException) as e:
+            result.error = str(e)
+            return result
+        finally:
+            session.close()
+
+        if result.error is not None:
+            return result
+        return self._verify_download(result, size, checksum, progress_path)
+
+    def _paced(self, blocks: Iterable[bytes], priority: Priority) -> Iterable[bytes]:
+        """Pace received blocks to the bandwidth scheduler, if there is one"""
+        if self.bandwidth is None:
+            return blocks
+        return self.bandwidth.throttle(blocks, priority)
+
+    def _download_range(
+        self,
+        session: requests.Session,
+        url: str,
+        destination: str,
+        start: int,
+        end: int,
+        priority: Priority = Priority.BULK,
+    ) -> int:
+        """Fetch bytes start..end (inclusive) of url into destination at the same offset"""
+        with session.get(
+            url,
+            headers={"Range": f"bytes={start}-{end}"},
+            stream=True,
+            timeout=self.timeout,
+        ) as r:
+            r.raise_for_status()
+            if r.status_code != 206:
+                raise TransferError(f"Storage ignored range {start}-{end}")
+            written = 0
+            with open(destination, "r+b") as f:
+                f.seek(start)
+                for block in self._paced(r.iter_content(DOWNLOAD_BLOCK_SIZE), priority):
+                    f.write(block)
+                    written += len(block)
+        if written != end - start + 1:
+            raise TransferError(
+                f"Range {start}-{end} returned {written} bytes, expected {end - start + 1}"
+            )
+        return written
+
+    @staticmethod
+    def _load_download_progress(progress_path: str, size: int, chunk_size: int) -> set:
+        """Return the chunk indices a previous attempt completed, if it was compatible"""
+        try:
+            with open(progress_path) as progress:
+                header = json.loads(progress.readline() or "{}")
+                if header != {"size": size, "chunk_size": chunk_size}:
+                    return set()
+                return {int(line) for line in progress if line.strip()}
+        except (OSError, ValueError):
+            return set()
+
+    @staticmethod
+    def _verify_download(
+        result: DownloadResult, size: Optional[int], checksum: Optional[str], progress_path: str
+    ) -> DownloadResult:
+        """Check size and checksum of a finished download"""
+        actual_size = os.path.getsize(result.path)
+        result.size = actual_size
+        if size is not None and actual_size != size:
+            result.error = f"Downloaded {actual_size} bytes, expected {size}"
+            return result
+
+        if checksum:
+            md5 = hashlib.md5()
+            with open(result.path, "rb") as f:
+                for block in iter(lambda: f.read(DEFAULT_DOWNLOAD_CHUNK_SIZE), b""):
+                    md5.update(block)
+            result.checksum_verified = md5.hexdigest() == checksum.lower()
+            if not result.checksum_verified:
+                result.error = "Checksum mismatch"
+
+        # a corrupt download must not be resumed, start over next time
+        if os.path.exists(progress_path):
+            os.remove(progress_path)
+        result.success = result.error is None
+        return result
+
     def get_upload_id_for_proxy(self, asset_id: str, proxy_id: str) -> PythonikResponse:
         """
         Get upload ID for proxy. This ID is required to upload proxy files.
@@ -1,5 +1,4 @@
-from loguru import logger
-from pythonik.models.base import Response
+from pythonik.models.base import NotFoundResponse, Response, SkippedWriteResponse
 from pythonik.models.metadata.views import (
     ViewMetadata,
     CreateViewRequest,
@@ -19,8 +18,40 @@ from pythonik.models.metadata.fields import (
     FieldResponse,
     FieldListResponse,
 )
+from pythonik.models.metadata.view_metadata_set import (
+    MetadataKey,
+    ViewMetadataSet,
+)
+from pythonik.models.metadata.bulk import (
+    MetadataWriteItem,
+    MetadataWriteReport,
+    MetadataWriteResult,
+)
+from pythonik.bandwidth import BandwidthScheduler, RateLimiter
+from pythonik.cache import SchemaCache
+from pythonik.concurrency import bounded_map
+from pythonik.exceptions import MetadataValidationError
+from pythonik.paging import PageSize, adaptive_pages, as_page_size
 from pythonik.specs.base import Spec
-from typing import Literal, Union, Dict, Any, List, Optional
+from pythonik.stats import MetadataStats
+from pythonik.validation import FieldDefinition, validate_metadata_values
+from typing import (
+    Callable,
+    Hashable,
+    Iterable,
+    Iterator,
+    Literal,
+    Tuple,
+    Type,
+    Union,
+    Dict,
+    Any,
+    List,
+    Optional,
+)
+from pydantic import BaseModel
+from requests import RequestException
+import time
 
 
 # Asset metadata paths
@@ -28,6 +59,7 @@ ASSET_METADATA_FROM_VIEW_PATH = "assets/{}/views/{}"
 UPDATE_ASSET_METADATA = "assets/{}/views/{}/"
 ASSET_OBJECT_VIEW_PATH = "assets/{}/{}/{}/views/{}/"
 PUT_METADATA_DIRECT_PATH = "{}/{}/"
+OBJECT_VIEW_METADATA_PATH = "{}/{}/views/{}/"
 
 # View paths
 VIEWS_BASE = "views/"
@@ -43,10 +75,201 @@ FIELD_BY_NAME_PATH = "fields/{field_name}/"
 
 ObjectType = Literal["segments"]
 
+DEFAULT_METADATA_WRITE_WORKERS = 8
+DEFAULT_METADATA_READ_WORKERS = 8
+DEFAULT_METADATA_WRITE_RETRIES = 3
+METADATA_WRITE_BACKOFF = 0.5
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+def _field_value_list(field_values) -> List[Any]:
+    values = []
+    for field_value in field_values or []:
+        if isinstance(field_value, BaseModel):
+            values.append(field_value.value)
+        elif isinstance(field_value, dict):
+            values.append(field_value.get("value"))
+        else:
+            values.append(field_value)
+    return values
+
+
+def changed_metadata_values(
+    outgoing: Dict[str, Any], current: ViewMetadata
+) -> Dict[str, Any]:
+    """
+    Return the entries of `outgoing` (serialized metadata_values) whose
+    values differ from those in `current`.
+
+    A field without values and a missing field are treated as equal.
+    """
+    current_values = current.metadata_values.root if current.metadata_values else {}
+    changed = {}
+    for name, field in outgoing.items():
+        new = _field_value_list((field or {}).get("field_values"))
+        existing = current_values.get(name)
+        old = _field_value_list(existing.field_values if existing else None)
+        if new != old:
+            changed[name] = field
+    return changed
+
 
 class MetadataSpec(Spec):
     server = "API/metadata/"
 
+    def __init__(
+        self,
+        session,
+        timeout: int = 3,
+        base_url: str = "https://app.iconik.io",
+        bandwidth: Optional[BandwidthScheduler] = None,
+        schema_cache: Optional[SchemaCache] = None,
+        stats: Optional[MetadataStats] = None,
+    ):
+        super().__init__(session, timeout, base_url, bandwidth)
+        self.schema_cache = schema_cache
+        self.stats = stats or MetadataStats()
+
+    def _cached_get(
+        self,
+        key: Tuple[Hashable, ...],
+        path: str,
+        model: Type[BaseModel],
+        params: Optional[Dict[str, Any]] = None,
+        **kwargs,
+    ) -> Response:
+        """
+        GET a view or field definition through the schema cache, if there is one.
+
+        Fresh entries are returned without a request. Expired entries are
+        revalidated with a conditional GET when the cache allows it.
+        """
+        cache = self.schema_cache
+        if cache is None:
+            return self.parse_response(self._get(path, params=params, **kwargs), model)
+
+        entry = cache.get(key)
+        if entry is not None and cache.is_fresh(entry):
+            cache.hits += 1
+            return Response(response=entry.response, data=entry.data)
+
+        headers = dict(kwargs.pop("headers", None) or {})
+        if entry is not None and cache.revalidate:
+            headers.update(entry.conditional_headers())
+        resp = self._get(path, params=params, headers=headers, **kwargs)
+        if entry is not None and resp.status_code == 304:
+            cache.revalidations += 1
+            cache.touch(key)
+            return Response(response=entry.response, data=entry.data)
+
+        cache.misses += 1
+        parsed = self.parse_response(resp, model)
+        if resp.ok:
+            cache.put(key, resp, parsed.data)
+        return parsed
+
+    def _invalidate_views(self, view_id: Optional[str] = None) -> None:
+        """Drop cached views after a view changed"""
+        if self.schema_cache is not None:
+            self.schema_cache.invalidate("view", view_id)
+            self.schema_cache.invalidate("views")
+
+    def _invalidate_fields(self, field_name: Optional[str]) -> None:
+        """Drop cached fields, and the views embedding them, after a field changed"""
+        if self.schema_cache is not None:
+            self.schema_cache.invalidate("field", field_name)
+            self.schema_cache.invalidate("fields")
+            self._invalidate_views()
+
+    def _put_metadata(
+        self,
+        path: str,
+        metadata: Union[UpdateMetadata, Dict[str, Any]],
+        exclude_defaults: bool,
+        skip_unchanged: bool,
+        current: Optional[ViewMetadata],
+        fetch_current: Callable[..., Response],
+        validate: bool = False,
+        view_id: Optional[str] = None,
+        **kwargs,
+    ) -> Response:
+        """
+        PUT metadata values, leaving out the values the object already has
+        when skip_unchanged is set.
+
+        A write with nothing left to send is not made; it returns a Response
+        with `skipped` set, a SkippedWriteResponse, which is ok, as response
+        and the current values as data.
+        The current values are fetched with the same request kwargs as the
+        write.
+        """
+        json_data = self._prepare_model_data(
+            metadata, exclude_defaults=exclude_defaults
+        )
+        if validate:
+            self.validate_metadata(json_data, view_id)
+        if skip_unchanged:
+            if current is None:
+                current = fetch_current(**kwargs).data
+            outgoing = json_data.get("metadata_values") or {}
+            if current is not None and outgoing:
+                changed = changed_metadata_values(outgoing, current)
+                self.stats.increment("fields_skipped", len(outgoing) - len(changed))
+                if not changed:
+                    self.stats.increment("writes_skipped")
+                    return Response(
+                        response=SkippedWriteResponse(),
+                        data=UpdateMetadataResponse.model_validate(
+                            current.model_dump(exclude_none=True)
+                        ),
+                        skipped=True,
+                    )
+                json_data = {**json_data, "metadata_values": changed}
+
+        resp = self._put(path, json=json_data, **kwargs)
+        return self.parse_response(resp, UpdateMetadataResponse)
+
+    def validate_metadata(
+        self,
+        metadata: Union[UpdateMetadata, Dict[str, Any]],
+        view_id: Optional[str] = None,
+    ) -> None:
+        """Check metadata values against their field definitions before writing
+
+        Definitions come from the view when a view ID is given, otherwise
+        from each field. Both are served by the client's SchemaCache, if it
+        has one, so validating many writes costs no extra requests.
+
+        Args:
+            metadata: The metadata to check, either as UpdateMetadata model or dict
+            view_id: The view the metadata is written to
+
+        Raises:
+            MetadataValidationError: If any value does not match its field's
+                type, options, min_value/max_value, multi or required setting
+            requests.HTTPError: If the view cannot be fetched
+        """
+        json_data = self._prepare_model_data(metadata)
+        metadata_values = json_data.get("metadata_values") or {}
+        errors = validate_metadata_values(
+            metadata_values, self._field_definitions(metadata_values, view_id)
+        )
+        if errors:
+            raise MetadataValidationError(errors)
+
+    def _field_definitions(
+        self, names: Iterable[str], view_id: Optional[str]
+    ) -> Dict[str, Optional[FieldDefinition]]:
+        if view_id is not None:
+            view = self.get_view(view_id)
+            view.response.raise_for_status()
+            return {field.name: field for field in view.data.view_fields}
+        definitions = {}
+        for name in names:
+            field = self.get_field(name)
+            definitions[name] = field.data if field.response.ok else None
+        return definitions
+
     def get_object_metadata(
         self,
         object_type: Literal["assets", "collections", "segments"],
@@ -64,7 +287,8 @@ class MetadataSpec(Spec):
             view_id: ID of the view to retrieve
             intercept_404: Iconik returns a 404 when a view has no metadata,
                 intercept_404 will intercept that error and return the
-                ViewMetadata model provided
+                ViewMetadata model provided, with `not_found` set on the
+                result and a NotFoundResponse as its response
             **kwargs: Additional arguments to pass to the request
 
         Returns:
@@ -86,20 +310,83 @@ class MetadataSpec(Spec):
         )
         resp = self._get(url, **kwargs)
 
-        if intercept_404 and resp.status_code == 404:
-            parsed_response = self.parse_response(resp, ViewMetadata)
-            parsed_response.data = intercept_404
-            parsed_response.response.raise_for_status_404 = (
-                parsed_response.response.raise_for_status
-            )
+        if resp.status_code == 404:
+            self.stats.increment("not_found")
+            if intercept_404:
+                return Response(
+                    response=NotFoundResponse(resp),
+                    data=intercept_404,
+                    not_found=True,
+                )
+
+        return self.parse_response(resp, ViewMetadata)
+
+    def get_metadata_for_views(
+        self,
+        keys: Iterable[Tuple[str, str, Optional[str]]],
+        intercept_404: ViewMetadata | bool = False,
+        max_workers: int = DEFAULT_METADATA_READ_WORKERS,
+        **kwargs,
+    ) -> ViewMetadataSet:
+        """
+        Fetch metadata for many (object, view) pairs concurrently.
+
+        Useful to load every view of an asset, its segments and collections
+        in one round of parallel requests instead of one call per view.
+
+        Args:
+            keys: (object_type, object_id, view_id) tuples or MetadataKeys;
+                a view_id of None fetches the object's metadata directly
+            intercept_404: ViewMetadata model returned for pairs without
+                metadata (404); with False they map to None. Either way they
+                are listed in the result's `missing`
+            max_workers: Number of concurrent requests
+            **kwargs: Additional kwargs to pass to each request
+
+        Returns:
+            ViewMetadataSet mapping each MetadataKey to its ViewMetadata
 
-            parsed_response.response.raise_for_status = lambda: logger.warning(
-                "raise for status disabled due to intercept_404, please call"
-                " raise_for_status_404 to throw an error on 404"
+        Raises:
+            ValueError: If an object_type is not 'assets', 'collections', or
+                'segments'
+        """
+        # duplicates are fetched once
+        keys = list(dict.fromkeys(MetadataKey(*key) for key in keys))
+        for key in keys:
+            if key.object_type not in ["assets", "collections", "segments"]:
+                raise ValueError(
+                    "object_type must be one of assets, collections, or segments"
+                )
+        default = intercept_404 if isinstance(intercept_404, ViewMetadata) else None
+
+        def fetch(key: MetadataKey) -> Response:
+            return self.get_object_metadata(
+                key.object_type,
+                key.object_id,
+                key.view_id,
+                intercept_404=default or True,
+                **kwargs,
             )
-            return parsed_response
 
-        return self.parse_response(resp, ViewMetadata)
+        metadata, missing, failed = {}, set(), {}
+        for key, result, error in bounded_map(fetch, keys, max_workers):
+            if error is not None:
+                if not isinstance(error, RequestException):
+                    raise error
+                metadata[key] = None
+                failed[key] = str(error)
+            elif result.not_found:
+                metadata[key] = default
+                missing.add(key)
+            elif not result.response.ok:
+                metadata[key] = None
+                failed[key] = result.response.status_code
+            else:
+                metadata[key] = result.data
+        # keep the order the keys were given in
+        return ViewMetadataSet(
+            {key: metadata[key] for key in keys}, frozenset(missing), failed
+        )
 
     def get_asset_metadata(
         self,
@@ -299,6 +586,9 @@ class MetadataSpec(Spec):
         view_id: str,
         metadata: Union[UpdateMetadata, Dict[str, Any]],
         exclude_defaults: bool = True,
+        skip_unchanged: bool = False,
+        current: Optional[ViewMetadata] = None,
+        validate: bool = False,
         **kwargs,
     ) -> Response:
         """Given an asset's view id, update metadata in asset's view
@@ -308,23 +598,38 @@ class MetadataSpec(Spec):
             view_id: The view ID to update metadata in
             metadata: The metadata to update, either as UpdateMetadata model or dict
             exclude_defaults: Whether to exclude default values when dumping Pydantic models
+            skip_unchanged: Only send the fields whose values differ from the
+                asset's current metadata, and skip the write if none do
+            current: The asset's current metadata in the view, if already
+                known; fetched when skip_unchanged is set and this is None
+            validate: Check the values against the field definitions first
+                and raise MetadataValidationError instead of sending an
+                invalid write, see validate_metadata
             **kwargs: Additional kwargs to pass to the request
         """
-        json_data = self._prepare_model_data(
-            metadata, exclude_defaults=exclude_defaults
-        )
-        resp = self._put(
-            UPDATE_ASSET_METADATA.format(asset_id, view_id), json=json_data, **kwargs
+        return self._put_metadata(
+            UPDATE_ASSET_METADATA.format(asset_id, view_id),
+            metadata,
+            exclude_defaults,
+            skip_unchanged,
+            current,
+            lambda **kw: self.get_asset_metadata(
+                asset_id, view_id, intercept_404=ViewMetadata(), **kw
+            ),
+            validate=validate,
+            view_id=view_id,
+            **kwargs,
         )
 
-        return self.parse_response(resp, UpdateMetadataResponse)
-
     def put_metadata_direct(
         self,
         object_type: str,
         object_id: str,
         metadata: Union[UpdateMetadata, Dict[str, Any]],
         exclude_defaults: bool = True,
+        skip_unchanged: bool = False,
+        current: Optional[ViewMetadata] = None,
+        validate: bool = False,
         **kwargs,
     ) -> Response:
         """Edit metadata values directly without a view.
@@ -334,6 +639,13 @@ class MetadataSpec(Spec):
             object_id: The unique identifier of the object
             metadata: Metadata values to update, either as UpdateMetadata model or dict
             exclude_defaults: Whether to exclude default values when dumping Pydantic models
+            skip_unchanged: Only send the fields whose values differ from the
+                object's current metadata, and skip the write if none do
+            current: The object's current metadata, if already known;
+                fetched when skip_unchanged is set and this is None
+            validate: Check the values against the field definitions first
+                and raise MetadataValidationError instead of sending an
+                invalid write, see validate_metadata
             **kwargs: Additional kwargs to pass to the request
 
         Returns:
@@ -353,16 +665,292 @@ class MetadataSpec(Spec):
             and will write to the database even if the object_id doesn't exist. Admin
             access required as this is a potentially dangerous operation.
         """
-        json_data = self._prepare_model_data(
-            metadata, exclude_defaults=exclude_defaults
-        )
-        resp = self._put(
+        return self._put_metadata(
             PUT_METADATA_DIRECT_PATH.format(object_type, object_id),
-            json=json_data,
+            metadata,
+            exclude_defaults,
+            skip_unchanged,
+            current,
+            lambda **kw: self.get_object_metadata_direct(
+                object_type, object_id, intercept_404=ViewMetadata(), **kw
+            ),
+            validate=validate,
             **kwargs,
         )
 
-        return self.parse_response(resp, UpdateMetadataResponse)
+    def update_object_metadata(
+        self,
+        object_type: Literal["assets", "collections", "segments"],
+        object_id: str,
+        view_id: str,
+        metadata: Union[UpdateMetadata, Dict[str, Any]],
+        exclude_defaults: bool = True,
+        skip_unchanged: bool = False,
+        current: Optional[ViewMetadata] = None,
+        validate: bool = False,
+        **kwargs,
+    ) -> Response:
+        """Update metadata in a view of an asset, collection or segment
+
+        Args:
+            object_type: The type of object to update metadata for
+            object_id: The object ID to update metadata for
+            view_id: The view ID to update metadata in
+            metadata: The metadata to update, either as UpdateMetadata model or dict
+            exclude_defaults: Whether to exclude default values when dumping Pydantic models
+            skip_unchanged: Only send the fields whose values differ from the
+                object's current metadata, and skip the write if none do
+            current: The object's current metadata in the view, if already
+                known; fetched when skip_unchanged is set and this is None
+            validate: Check the values against the field definitions first
+                and raise MetadataValidationError instead of sending an
+                invalid write, see validate_metadata
+            **kwargs: Additional kwargs to pass to the request
+        """
+        return self._put_metadata(
+            OBJECT_VIEW_METADATA_PATH.format(object_type, object_id, view_id),
+            metadata,
+            exclude_defaults,
+            skip_unchanged,
+            current,
+            lambda **kw: self.get_object_metadata(
+                object_type, object_id, view_id, intercept_404=ViewMetadata(), **kw
+            ),
+            validate=validate,
+            view_id=view_id,
+            **kwargs,
+        )
+
+    def bulk_write_metadata(
+        self,
+        items: Iterable[Union[MetadataWriteItem, Tuple[str, str, Optional[str], Any]]],
+        concurrency: int = DEFAULT_METADATA_WRITE_WORKERS,
+        requests_per_second: Optional[float] = None,
+        retries: int = DEFAULT_METADATA_WRITE_RETRIES,
+        backoff: float = METADATA_WRITE_BACKOFF,
+        report: Optional[MetadataWriteReport] = None,
+        exclude_defaults: bool = True,
+        skip_unchanged: bool = False,
+        validate: bool = False,
+        **kwargs,
+    ) -> Iterator[MetadataWriteResult]:
+        """Write metadata to many objects concurrently
+
+        `items` is consumed lazily, so it can be a generator over millions of
+        objects. Items with a view_id are written to that view, items without
+        one are written with put_metadata_direct. Rate limited (429) and
+        server errors, as well as connection errors, are retried with
+        exponential backoff, honouring Retry-After.
+
+        Args:
+            items: MetadataWriteItem models or (object_type, object_id,
+                view_id, metadata) tuples
+            concurrency: Number of writes in flight
+            requests_per_second: Optional cap on write requests per second,
+                retries included
+            retries: How many times a failed write is retried
+            backoff: Delay in seconds before the first retry, doubled for
+                each further retry
+            report: Optional MetadataWriteReport updated with running totals
+                and throughput while results are consumed
+            exclude_defaults: Whether to exclude default values when dumping Pydantic models
+            skip_unchanged: Fetch each object's current metadata first and
+                only write the values that changed, see update_object_metadata;
+                the reads take their own turn with the rate limiter
+            validate: Check each item against the field definitions and fail
+                invalid items without sending them, see validate_metadata
+            **kwargs: Additional kwargs to pass to each request
+
+        Yields:
+            A MetadataWriteResult per item, in completion order
+        """
+        limiter = RateLimiter(requests_per_second) if requests_per_second else None
+
+        def write(item):
+            return self.write_metadata_item(
+                item,
+                limiter,
+                retries,
+                backoff,
+                exclude_defaults=exclude_defaults,
+                skip_unchanged=skip_unchanged,
+                validate=validate,
+                **kwargs,
+            )
+
+        for item, result, error in bounded_map(
+            write, (self._as_write_item(item) for item in items), concurrency
+        ):
+            if error is not None:
+                result = MetadataWriteResult(
+                    object_type=item.object_type,
+                    object_id=item.object_id,
+                    view_id=item.view_id,
+                    error=str(error),
+                )
+            if report is not None:
+                if result.skipped:
+                    report.skipped += 1
+                if result.success:
+                    report.succeeded += 1
+                else:
+                    report.failed += 1
+                report.retries += max(result.attempts - 1, 0)
+                report.elapsed = time.monotonic() - report.started
+            yield result
+
+    @staticmethod
+    def _as_write_item(item) -> MetadataWriteItem:
+        if isinstance(item, MetadataWriteItem):
+            return item
+        object_type, object_id, view_id, metadata = item
+        return MetadataWriteItem(
+            object_type=object_type,
+            object_id=object_id,
+            view_id=view_id,
+            metadata=metadata,
+        )
+
+    def write_metadata_item(
+        self,
+        item: Union[MetadataWriteItem, Tuple[str, str, Optional[str], Any]],
+        limiter: Optional[RateLimiter] = None,
+        retries: int = DEFAULT_METADATA_WRITE_RETRIES,
+        backoff: float = METADATA_WRITE_BACKOFF,
+        exclude_defaults: bool = True,
+        skip_unchanged: bool = False,
+        validate: bool = False,
+        **kwargs,
+    ) -> MetadataWriteResult:
+        """Write one item the way bulk_write_metadata does, with retries
+
+        For callers that schedule writes themselves, e.g. MetadataImporter.
+
+        Args:
+            item: A MetadataWriteItem or an (object_type, object_id, view_id,
+                metadata) tuple
+            limiter: Optional RateLimiter shared with other writes, acquired
+                before every request
+            retries: How many times a failed write is retried
+            backoff: Delay in seconds before the first retry, doubled for
+                each further retry
+            exclude_defaults: Whether to exclude default values when dumping Pydantic models
+            skip_unchanged: Fetch the object's current metadata first and
+                only write the values that changed
+            validate: Check the item against the field definitions and fail
+                it without sending it if invalid, see validate_metadata
+            **kwargs: Additional kwargs to pass to each request
+
+        Returns:
+            MetadataWriteResult
+        """
+        item = self._as_write_item(item)
+        result = MetadataWriteResult(
+            object_type=item.object_type,
+            object_id=item.object_id,
+            view_id=item.view_id,
+        )
+        current = None
+        delay = backoff
+        while True:
+            if limiter is not None:
+                limiter.acquire()
+            result.attempts += 1
+            retry_after = None
+            try:
+                written = None
+                if skip_unchanged and current is None:
+                    # fetched here, so the read is paced like the write
+                    fetched = self._fetch_current_metadata(item, **kwargs)
+                    if fetched.not_found or fetched.response.ok:
+                        current = fetched.data
+                        if limiter is not None:
+                            limiter.acquire()
+                    else:
+                        written = fetched
+                if written is None:
+                    written = self._send_metadata_item(
+                        item,
+                        exclude_defaults,
+                        skip_unchanged,
+                        current,
+                        validate,
+                        **kwargs,
+                    )
+            except MetadataValidationError as e:
+                # invalid values are not worth retrying
+                result.error = str(e)
+                return result
+            except RequestException as e:
+                result.status_code, result.error = None, str(e)
+            else:
+                if written.skipped:
+                    result.success = result.skipped = True
+                    result.status_code = result.error = None
+                    return result
+                resp = written.response
+                result.status_code = resp.status_code
+                if resp.ok:
+                    result.success, result.error = True, None
+                    return result
+                result.error = resp.text
+                if resp.status_code not in RETRYABLE_STATUS_CODES:
+                    return result
+                retry_after = resp.headers.get("Retry-After")
+
+            if result.attempts > retries:
+                return result
+            try:
+                wait = float(retry_after) if retry_after else delay
+            except ValueError:
+                wait = delay
+            time.sleep(wait)
+            delay *= 2
+
+    def _fetch_current_metadata(self, item: MetadataWriteItem, **kwargs) -> Response:
+        if item.view_id is None:
+            return self.get_object_metadata_direct(
+                item.object_type, item.object_id, intercept_404=ViewMetadata(), **kwargs
+            )
+        return self.get_object_metadata(
+            item.object_type,
+            item.object_id,
+            item.view_id,
+            intercept_404=ViewMetadata(),
+            **kwargs,
+        )
+
+    def _send_metadata_item(
+        self,
+        item: MetadataWriteItem,
+        exclude_defaults: bool,
+        skip_unchanged: bool,
+        current: Optional[ViewMetadata],
+        validate: bool,
+        **kwargs,
+    ) -> Response:
+        if item.view_id is None:
+            return self.put_metadata_direct(
+                item.object_type,
+                item.object_id,
+                item.metadata,
+                exclude_defaults=exclude_defaults,
+                skip_unchanged=skip_unchanged,
+                current=current,
+                validate=validate,
+                **kwargs,
+            )
+        return self.update_object_metadata(
+            item.object_type,
+            item.object_id,
+            item.view_id,
+            item.metadata,
+            exclude_defaults=exclude_defaults,
+            skip_unchanged=skip_unchanged,
+            current=current,
+            validate=validate,
+            **kwargs,
+        )
 
     def put_object_view_metadata(
         self,
@@ -372,6 +960,9 @@ class MetadataSpec(Spec):
         view_id: str,
         metadata: Union[UpdateMetadata, Dict[str, Any]],
         exclude_defaults: bool = True,
+        skip_unchanged: bool = False,
+        current: Optional[ViewMetadata] = None,
+        validate: bool = False,
         **kwargs,
     ) -> Response:
         """Put metadata for a specific sub-object view of an asset
@@ -383,17 +974,36 @@ class MetadataSpec(Spec):
             view_id: The view ID to update metadata in
             metadata: The metadata to update, either as UpdateMetadata model or dict
             exclude_defaults: Whether to exclude default values when dumping Pydantic models
+            skip_unchanged: Only send the fields whose values differ from the
+                object's current metadata, and skip the write if none do
+            current: The object's current metadata in the view, if already
+                known; fetched when skip_unchanged is set and this is None
+            validate: Check the values against the field definitions first
+                and raise MetadataValidationError instead of sending an
+                invalid write, see validate_metadata
             **kwargs: Additional kwargs to pass to the request
         """
-        json_data = self._prepare_model_data(
-            metadata, exclude_defaults=exclude_defaults
-        )
         endpoint = ASSET_OBJECT_VIEW_PATH.format(
             asset_id, object_type, object_id, view_id
         )
-        resp = self._put(endpoint, json=json_data, **kwargs)
 
-        return self.parse_response(resp, UpdateMetadataResponse)
+        def fetch_current(**kw):
+            resp = self._get(endpoint, **kw)
+            if resp.status_code == 404:
+                return Response(response=resp, data=ViewMetadata())
+            return self.parse_response(resp, ViewMetadata)
+
+        return self._put_metadata(
+            endpoint,
+            metadata,
+            exclude_defaults,
+            skip_unchanged,
+            current,
+            fetch_current,
+            validate=validate,
+            view_id=view_id,
+            **kwargs,
+        )
 
     def put_segment_view_metadata(
         self,
@@ -478,6 +1088,7 @@ class MetadataSpec(Spec):
         """
         json_data = self._prepare_model_data(view, exclude_defaults=exclude_defaults)
         resp = self._post(CREATE_VIEW_PATH, json=json_data, **kwargs)
+        self._invalidate_views()
         return self.parse_response(resp, ViewResponse)
 
     def update_view(
@@ -510,6 +1121,7 @@ class MetadataSpec(Spec):
         resp = self._patch(
             UPDATE_VIEW_PATH.format(view_id=view_id), json=json_data, **kwargs
         )
+        self._invalidate_views(view_id)
         return self.parse_response(resp, ViewResponse)
 
     def replace_view(
@@ -545,6 +1157,7 @@ class MetadataSpec(Spec):
         resp = self._put(
             UPDATE_VIEW_PATH.format(view_id=view_id), json=json_data, **kwargs
         )
+        self._invalidate_views(view_id)
         return self.parse_response(resp, ViewResponse)
 
     def get_views(self, **kwargs) -> Response:
@@ -563,8 +1176,7 @@ class MetadataSpec(Spec):
             - 400 Bad request
             - 401 Token is invalid
         """
-        resp = self._get(VIEWS_BASE, **kwargs)
-        return self.parse_response(resp, ViewListResponse)
+        return self._cached_get(("views",), VIEWS_BASE, ViewListResponse, **kwargs)
 
     def get_view(self, view_id: str, merge_fields: bool = None, **kwargs) -> Response:
         """Get a specific view from Iconik.
@@ -589,8 +1201,13 @@ class MetadataSpec(Spec):
         if merge_fields is not None:
             params["merge_fields"] = merge_fields
 
-        resp = self._get(GET_VIEW_PATH.format(view_id=view_id), params=params, **kwargs)
-        return self.parse_response(resp, ViewResponse)
+        return self._cached_get(
+            ("view", view_id, merge_fields),
+            GET_VIEW_PATH.format(view_id=view_id),
+            ViewResponse,
+            params=params,
+            **kwargs,
+        )
 
     def delete_view(self, view_id: str, **kwargs) -> Response:
         """Delete a view from Iconik.
@@ -611,6 +1228,7 @@ class MetadataSpec(Spec):
             - 404 Metadata view doesn't exist
         """
         resp = self._delete(DELETE_VIEW_PATH.format(view_id=view_id), **kwargs)
+        self._invalidate_views(view_id)
         return self.parse_response(resp, None)
 
     # Metadata Field Management
@@ -618,14 +1236,14 @@ class MetadataSpec(Spec):
 
     def create_field(
         self,
-        field_data: FieldCreate,
+        field_data: Union[FieldCreate, Dict[str, Any]],
         exclude_defaults: bool = True,
         **kwargs,
     ) -> Response:
         """Create a new metadata field.
 
         Args:
-            field_data: The data for the new field.
+            field_data: The data for the new field, as FieldCreate model or dict.
             exclude_defaults: Whether to exclude default values when dumping Pydantic models.
             **kwargs: Additional kwargs to pass to the request.
 
@@ -637,6 +1255,8 @@ class MetadataSpec(Spec):
             field_data, exclude_defaults=exclude_defaults
         )
         resp = self._post(FIELDS_BASE_PATH, json=json_data, **kwargs)
+        if self.schema_cache is not None:
+            self._invalidate_fields(json_data.get("name"))
         return self.parse_response(resp, FieldResponse)
 
     def get_field(
@@ -663,8 +1283,7 @@ class MetadataSpec(Spec):
             - 404 Metadata field doesn't exist
         """
         endpoint = FIELD_BY_NAME_PATH.format(field_name=field_name)
-        resp = self._get(endpoint, **kwargs)
-        return self.parse_response(resp, FieldResponse)
+        return self._cached_get(("field", field_name), endpoint, FieldResponse, **kwargs)
 
     def update_field(
         self,
@@ -690,6 +1309,7 @@ class MetadataSpec(Spec):
         )
         endpoint = FIELD_BY_NAME_PATH.format(field_name=field_name)
         resp = self._put(endpoint, json=json_data, **kwargs)
+        self._invalidate_fields(field_name)
         return self.parse_response(resp, FieldResponse)
 
     def delete_field(
@@ -708,6 +1328,7 @@ class MetadataSpec(Spec):
         """
         endpoint = FIELD_BY_NAME_PATH.format(field_name=field_name)
         resp = self._delete(endpoint, **kwargs)
+        self._invalidate_fields(field_name)
         return self.parse_response(resp)
 
     def list_fields(
@@ -740,8 +1361,61 @@ class MetadataSpec(Spec):
         # Add any additional params from kwargs
         params.update(kwargs)
 
-        resp = self._get(FIELDS_BASE_PATH, params=params)
-        return self.parse_response(resp, FieldListResponse)
+        return self._cached_get(
+            ("fields", tuple(sorted(params.items()))),
+            FIELDS_BASE_PATH,
+            FieldListResponse,
+            params=params,
+        )
+
+    def iter_fields(
+        self,
+        per_page: Optional[PageSize] = None,
+        filter: Optional[str] = None,
+        params: Optional[Dict[str, Any]] = None,
+        **kwargs,
+    ) -> Iterator[List[FieldResponse]]:
+        """Iterate over every page of metadata fields, following last_field_name.
+
+        Pages are fetched like list_fields, through the client's SchemaCache
+        if it has one.
+
+        Args:
+            per_page: Optional The number of items for each page, or an
+                AdaptivePageSize; an AdaptivePageSize with default settings
+                if None.
+            filter: Optional A comma separated list of fieldnames to filter by.
+            params: Optional Additional query parameters of every page request.
+            **kwargs: Additional kwargs to pass to each request.
+
+        Yields:
+            Lists of FieldResponse objects.
+
+        Raises:
+            requests.HTTPError: If a request fails.
+            requests.Timeout: If a request times out at the smallest page size.
+        """
+        params = dict(params or {})
+        if filter:
+            params["filter"] = filter
+
+        def send(size, page, last_field_name):
+            page_params = {**params, "per_page": size}
+            if last_field_name:
+                page_params["last_field_name"] = last_field_name
+            return self._cached_get(
+                ("fields", tuple(sorted(page_params.items()))),
+                FIELDS_BASE_PATH,
+                FieldListResponse,
+                params=page_params,
+                **kwargs,
+            ).response
+
+        def next_field_name(objects):
+            return objects[-1].get("name")
+
+        for objects in adaptive_pages(as_page_size(per_page), send, next_field_name):
+            yield [FieldResponse.model_validate(obj) for obj in objects]
 
     def create_metadata_field(
         self,
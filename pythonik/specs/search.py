@@ -1,17 +1,73 @@
-from typing import Union, Dict, Any, Optional
+from typing import Union, Dict, Any, Iterator, List, Optional
 
+from pythonik.bandwidth import BandwidthScheduler
+from pythonik.cache import SearchCache, search_cache_key
+from pythonik.columnar import MetadataTable
+from pythonik.exceptions import ChangeFeedError
+from pythonik.ids import IdArray
 from pythonik.models.base import Response
+from pythonik.models.search.facets import SearchFacets
+from pythonik.models.search.profile import SearchProfile
 from pythonik.models.search.search_body import SearchBody
 from pythonik.models.search.search_response import SearchResponse
+from pythonik.models.search.watermark import Watermark
+from pythonik.paging import PageSize, adaptive_pages, as_page_size
+from pythonik.query import CompiledSearch
 from pythonik.specs.base import Spec
+from pythonik.specs.metadata import MetadataSpec
+from pythonik.watermarks import WatermarkStore
 
 
 SEARCH_PATH = "search/"
+JSON_HEADERS = {"Content-Type": "application/json"}
+# page size of searches that only need the total or facets
+MIN_SEARCH_PAGE_SIZE = 1
+# query parameters of searches read by machines only
+LEAN_SEARCH_PARAMS = {
+    "generate_signed_url": False,
+    "generate_signed_download_url": False,
+    "generate_signed_proxy_url": False,
+    "save_search_history": False,
+}
+# query parameters of searches whose objects are not used
+SUMMARY_SEARCH_PARAMS = {"per_page": MIN_SEARCH_PAGE_SIZE, **LEAN_SEARCH_PARAMS}
+ID_SCAN_SORT = [{"name": "id", "order": "asc"}]
+CHANGE_FEED_SORT = [
+    {"name": "date_modified", "order": "asc"},
+    {"name": "id", "order": "asc"},
+]
 
 
 class SearchSpec(Spec):
     server = "API/search/"
 
+    def __init__(
+        self,
+        session,
+        timeout: int = 3,
+        base_url: str = "https://app.iconik.io",
+        bandwidth: Optional[BandwidthScheduler] = None,
+        metadata: Optional[MetadataSpec] = None,
+        cache: Optional[SearchCache] = None,
+        profile: Optional[SearchProfile] = None,
+    ):
+        self.cache = cache
+        self.profile = profile
+        self._metadata_spec = metadata or MetadataSpec(
+            session, timeout, base_url, bandwidth
+        )
+        super().__init__(session, timeout, base_url, bandwidth)
+
+    @property
+    def metadata(self) -> MetadataSpec:
+        """
+        Access the metadata API, used for field definitions
+
+        Returns:
+            MetadataSpec: The MetadataSpec this SearchSpec was created with
+        """
+        return self._metadata_spec
+
     def search(
         self,
         search_body: Union[SearchBody, Dict[str, Any]],
@@ -24,14 +80,19 @@ class SearchSpec(Spec):
         generate_signed_proxy_url: Optional[bool] = None,
         save_search_history: Optional[bool] = None,
         exclude_defaults: bool = True,
+        use_cache: bool = True,
         **kwargs,
     ) -> Response:  # Response.data will be SearchResponse
         """
         Search iconik.
         Corresponds to POST /v1/search/
 
+        Options left as None, and include_fields/exclude_fields not set in
+        the body, are taken from the SearchProfile this spec was created with.
+
         Args:
-            search_body: Search parameters, either as SearchBody model or dict.
+            search_body: Search parameters, either as SearchBody model, dict or
+                CompiledSearch, which is sent without serializing it again.
             per_page: The number of documents for each page.
             page: Which page number to fetch.
             scroll: If true, uses scroll pagination. (Deprecated, use search_after in body).
@@ -41,16 +102,30 @@ class SearchSpec(Spec):
             generate_signed_proxy_url: Set to true if you want to generate signed download urls for proxies.
             save_search_history: Set to false if you don't want to save the search to the history.
             exclude_defaults: Whether to exclude default values when dumping Pydantic models for the request body.
+            use_cache: Set to false to bypass the SearchCache this spec was
+                created with. Scroll searches and searches with extra request
+                kwargs are never cached.
             **kwargs: Additional kwargs to pass to the request (e.g., headers).
 
         Returns:
-            Response with SearchResponse data model.
+            Response with SearchResponse data model. Responses served from the
+            cache are shared and must not be modified.
         """
-        json_data = self._prepare_model_data(
-            search_body, exclude_defaults=exclude_defaults
-        )
+        compiled = None
+        if isinstance(search_body, CompiledSearch):
+            compiled = search_body
+            json_data = compiled
+        else:
+            json_data = self._prepare_model_data(
+                search_body, exclude_defaults=exclude_defaults
+            )
 
         params = {}
+        if self.profile is not None:
+            json_data = self.profile.apply_projection(json_data)
+            if compiled is not None and json_data is not compiled:
+                compiled = json_data = CompiledSearch(json_data)
+            params.update(self.profile.params())
         if per_page is not None:
             params["per_page"] = per_page
         if page is not None:
@@ -68,10 +143,395 @@ class SearchSpec(Spec):
         if save_search_history is not None:
             params["save_search_history"] = save_search_history
 
+        def fetch():
+            if compiled is not None:
+                body = {
+                    "data": compiled.encode(),
+                    "headers": {**JSON_HEADERS, **(kwargs.get("headers") or {})},
+                }
+            else:
+                body = {"json": json_data}
+            resp = self._post(
+                SEARCH_PATH,  # Use the new path constant, which is ""
+                params=params if params else None,
+                **{**kwargs, **body},
+            )
+            parsed = self.parse_response(resp, SearchResponse)
+            return parsed.response, parsed.data
+
+        if (
+            self.cache is None
+            or not use_cache
+            or scroll
+            or scroll_id is not None
+            or kwargs
+        ):
+            resp, data = fetch()
+        else:
+            signed_urls = any(
+                (
+                    params.get("generate_signed_url") is not False,
+                    params.get("generate_signed_download_url"),
+                    params.get("generate_signed_proxy_url"),
+                )
+            )
+            resp, data = self.cache.get_or_fetch(
+                search_cache_key(
+                    compiled.json if compiled is not None else json_data,
+                    params,
+                    self._cache_identity(),
+                ),
+                fetch,
+                signed_urls=signed_urls,
+            )
+        return Response(response=resp, data=data)
+
+    def _cache_identity(self) -> Dict[str, Any]:
+        """Who a cached search is for: its URL and the session's credentials"""
+        headers = self.session.headers
+        return {
+            "url": self.gen_url(SEARCH_PATH),
+            "app_id": headers.get("App-ID"),
+            "auth_token": headers.get("Auth-Token"),
+        }
+
+    def _profile_params(self) -> Dict[str, Any]:
+        return self.profile.params() if self.profile is not None else {}
+
+    def _summary_search(
+        self, body: Dict[str, Any], params: Optional[Dict[str, Any]] = None, **kwargs
+    ) -> Response:
+        """POST a search for its total and facets, returning them as SearchFacets"""
+        # a single id is the smallest projection that still returns a page
+        body = {**body, "include_fields": ["id"]}
+        for key in ("sort", "search_after", "exclude_fields"):
+            body.pop(key, None)
         resp = self._post(
-            SEARCH_PATH,  # Use the new path constant, which is ""
-            json=json_data,
-            params=params if params else None,
+            SEARCH_PATH,
+            json=body,
+            params={**SUMMARY_SEARCH_PARAMS, **(params or {})},
+            **kwargs,
+        )
+        data = None
+        if resp.ok:
+            raw = resp.json()
+            data = SearchFacets.model_validate(
+                {"total": raw.get("total") or 0, "facets": raw.get("facets") or {}}
+            )
+        return Response(response=resp, data=data)
+
+    def count(
+        self,
+        search_body: Union[SearchBody, Dict[str, Any]],
+        exclude_defaults: bool = True,
+        params: Optional[Dict[str, Any]] = None,
+        **kwargs,
+    ) -> Response:  # Response.data will be SearchFacets
+        """
+        Count the objects matching a search.
+
+        Requests a single result with no signed URLs and no search history,
+        and does not parse the returned objects.
+
+        Args:
+            search_body: Search parameters, either as SearchBody model or dict
+            exclude_defaults: Whether to exclude default values when dumping Pydantic models for the request body
+            params: Additional query parameters of the search
+            **kwargs: Additional kwargs to pass to the request (e.g., headers)
+
+        Returns:
+            Response with SearchFacets data holding the total, or None data
+            if the search failed
+        """
+        body = dict(
+            self._prepare_model_data(search_body, exclude_defaults=exclude_defaults)
+        )
+        body.pop("facets", None)
+        return self._summary_search(body, params, **kwargs)
+
+    def facets(
+        self,
+        search_body: Union[SearchBody, Dict[str, Any]],
+        names: List[str],
+        exclude_defaults: bool = True,
+        params: Optional[Dict[str, Any]] = None,
+        **kwargs,
+    ) -> Response:  # Response.data will be SearchFacets
+        """
+        Get the facet buckets of a search without its objects.
+
+        Requests a single result with no signed URLs and no search history,
+        and only validates the total and the facets.
+
+        Args:
+            search_body: Search parameters, either as SearchBody model or dict
+            names: The fields to facet on, replacing the body's facets
+            exclude_defaults: Whether to exclude default values when dumping Pydantic models for the request body
+            params: Additional query parameters of the search
+            **kwargs: Additional kwargs to pass to the request (e.g., headers)
+
+        Returns:
+            Response with SearchFacets data holding the total and a Facet of
+            buckets per field, or None data if the search failed
+        """
+        body = dict(
+            self._prepare_model_data(search_body, exclude_defaults=exclude_defaults)
+        )
+        body["facets"] = list(names)
+        return self._summary_search(body, params, **kwargs)
+
+    def iter_pages(
+        self,
+        search_body: Union[SearchBody, Dict[str, Any]],
+        per_page: Optional[PageSize] = None,
+        exclude_defaults: bool = True,
+        params: Optional[Dict[str, Any]] = None,
+        **kwargs,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Iterate over every page of a search as lists of raw objects.
+
+        Objects are returned as plain dicts, skipping model validation. When
+        the search body has a sort, pages are fetched with search_after
+        using the `_sort` values of the last object; otherwise page numbers
+        are used. The body is serialized once, as a CompiledSearch, and only
+        its search_after changes between pages.
+
+        Args:
+            search_body: Search parameters, either as SearchBody model, dict or
+                CompiledSearch
+            per_page: The number of documents for each page, or an
+                AdaptivePageSize to tune it from the latency and size of
+                each page; an AdaptivePageSize with default settings if None
+            exclude_defaults: Whether to exclude default values when dumping Pydantic models for the request body
+            params: Additional query parameters of every page request, e.g.
+                {"generate_signed_url": False}, overriding the SearchProfile
+            **kwargs: Additional kwargs to pass to each request (e.g., headers)
+
+        Yields:
+            Lists of search result objects
+
+        Raises:
+            requests.HTTPError: If a search request fails
+            requests.Timeout: If a request times out at the smallest
+                AdaptivePageSize
+        """
+        if not isinstance(search_body, CompiledSearch):
+            search_body = CompiledSearch(search_body, exclude_defaults=exclude_defaults)
+        pager = as_page_size(per_page)
+        params = {**self._profile_params(), **(params or {})}
+        headers = {**JSON_HEADERS, **(kwargs.pop("headers", None) or {})}
+
+        def send(size, page, search_after):
+            page_params = {**params, "per_page": size}
+            if page is not None:
+                page_params["page"] = page
+            return self._post(
+                SEARCH_PATH,
+                data=search_body.encode(search_after),
+                params=page_params,
+                headers=headers,
+                **kwargs,
+            )
+
+        def next_search_after(objects):
+            return objects[-1].get("_sort")
+
+        yield from adaptive_pages(
+            pager, send, next_search_after if search_body.get("sort") else None
+        )
+
+    def scan_ids(
+        self,
+        search_body: Union[SearchBody, Dict[str, Any]],
+        per_page: Optional[PageSize] = None,
+        exclude_defaults: bool = True,
+        params: Optional[Dict[str, Any]] = None,
+        **kwargs,
+    ) -> IdArray:
+        """
+        Collect the IDs of every object matching a search.
+
+        Only `id` is requested, sorted by id and paged with search_after,
+        with no signed URLs and no search history. The IDs are kept in an
+        IdArray, which needs 16 bytes per ID, sorted and without duplicates.
+
+        Args:
+            search_body: Search parameters, either as SearchBody model or dict;
+                its projections and sort are replaced
+            per_page: The number of documents for each page, or an
+                AdaptivePageSize; an AdaptivePageSize with default settings
+                if None
+            exclude_defaults: Whether to exclude default values when dumping Pydantic models for the request body
+            params: Additional query parameters of every page request
+            **kwargs: Additional kwargs to pass to each request (e.g., headers)
+
+        Returns:
+            IdArray of the matching object IDs
+
+        Raises:
+            requests.HTTPError: If a search request fails
+            ValueError: If an ID is not a UUID
+        """
+        body = dict(
+            self._prepare_model_data(search_body, exclude_defaults=exclude_defaults)
+        )
+        body.pop("exclude_fields", None)
+        body.update(include_fields=["id"], sort=ID_SCAN_SORT, search_after=[])
+        ids = IdArray()
+        for objects in self.iter_pages(
+            body,
+            per_page=per_page,
+            params={**LEAN_SEARCH_PARAMS, **(params or {})},
             **kwargs,
+        ):
+            ids.extend(obj["id"] for obj in objects)
+        return ids
+
+    def export_metadata(
+        self,
+        search_body: Union[SearchBody, Dict[str, Any]],
+        fields: Optional[List[str]] = None,
+        per_page: Optional[PageSize] = None,
+        exclude_defaults: bool = True,
+        params: Optional[Dict[str, Any]] = None,
+        **kwargs,
+    ) -> MetadataTable:
+        """
+        Export the metadata of every object matching a search into a
+        columnar MetadataTable.
+
+        Column types are taken from the field definitions returned by
+        MetadataSpec.get_field, which a client-wide SchemaCache serves
+        without extra requests. Results are streamed page by page as raw
+        dicts, so no per-object models are built.
+
+        Args:
+            search_body: Search parameters, either as SearchBody model or dict
+            fields: Names of the fields to export; defaults to the fields of
+                the search body's metadata_view_id
+            per_page: The number of documents for each page, or an
+                AdaptivePageSize; an AdaptivePageSize with default settings
+                if None
+            exclude_defaults: Whether to exclude default values when dumping Pydantic models for the request body
+            params: Additional query parameters of every page request
+            **kwargs: Additional kwargs to pass to each request (e.g., headers)
+
+        Returns:
+            MetadataTable with an `id` column and one column per field
+
+        Raises:
+            ValueError: If no fields are given and the search body has no
+                metadata_view_id
+            requests.HTTPError: If a search or view request fails
+        """
+        body = self._prepare_model_data(search_body, exclude_defaults=exclude_defaults)
+        if fields is None:
+            view_id = body.get("metadata_view_id")
+            if not view_id:
+                raise ValueError("fields are required without a metadata_view_id")
+            view = self.metadata.get_view(view_id)
+            view.response.raise_for_status()
+            fields = [field.name for field in view.data.view_fields]
+
+        definitions = {}
+        for name in fields:
+            field = self.metadata.get_field(name)
+            definitions[name] = field.data if field.response.ok else None
+
+        table = MetadataTable(definitions)
+        for objects in self.iter_pages(
+            body, per_page=per_page, params=params, **kwargs
+        ):
+            table.extend(objects)
+        return table
+
+    def changes(
+        self,
+        search_body: Union[SearchBody, Dict[str, Any]],
+        store: WatermarkStore,
+        key: str = "default",
+        since: Optional[str] = None,
+        per_page: Optional[PageSize] = None,
+        exclude_defaults: bool = True,
+        params: Optional[Dict[str, Any]] = None,
+        **kwargs,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream the objects matching a search that were modified since the
+        last run.
+
+        Objects are returned in (date_modified, id) order. The feed's
+        watermark, the date_modified, id and `_sort` values of the last
+        object, is saved to `store` under `key` after every page, once all of
+        its objects were consumed. The next run filters on date_modified
+        from the watermark and continues with search_after from its `_sort`
+        values, so objects sharing the watermark's timestamp are neither
+        missed nor returned twice. An object is returned again if it is
+        modified after it was seen, and the objects of a page that was not
+        fully consumed are returned again by the next run.
+
+        Args:
+            search_body: Search parameters, either as SearchBody model or
+                dict; its sort is replaced, and id and date_modified are
+                added to a non-empty include_fields
+            store: WatermarkStore keeping the watermark between runs
+            key: Name of this feed's watermark in the store
+            since: date_modified to start from when there is no watermark
+                yet; everything matching the search when None
+            per_page: The number of documents for each page, or an
+                AdaptivePageSize; an AdaptivePageSize with default settings
+                if None
+            exclude_defaults: Whether to exclude default values when dumping Pydantic models for the request body
+            params: Additional query parameters of every page request
+            **kwargs: Additional kwargs to pass to each request (e.g., headers)
+
+        Yields:
+            Search result objects as plain dicts
+
+        Raises:
+            requests.HTTPError: If a search request fails
+            ChangeFeedError: If a page's last object has no `_sort` values,
+                so the feed's position cannot be saved
+        """
+        body = dict(
+            self._prepare_model_data(search_body, exclude_defaults=exclude_defaults)
         )
-        return self.parse_response(resp, SearchResponse)
+        if body.get("include_fields"):
+            # the watermark is taken from these fields of the last object
+            body["include_fields"] = list(
+                dict.fromkeys([*body["include_fields"], "id", "date_modified"])
+            )
+        watermark = store.load(key)
+        start = watermark.date_modified if watermark is not None else since
+        if start is not None:
+            terms = [{"name": "date_modified", "range": {"min": start}}]
+            original = body.get("filter")
+            body["filter"] = {
+                "operator": "AND",
+                "terms": terms,
+                "filters": [original] if original else [],
+            }
+        body["sort"] = CHANGE_FEED_SORT
+        body["search_after"] = watermark.search_after if watermark is not None else []
+
+        for objects in self.iter_pages(
+            body, per_page=per_page, params=params, **kwargs
+        ):
+            last = objects[-1]
+            if not last.get("_sort"):
+                # an empty search_after would start the next run over at the
+                # watermark's timestamp and return its objects again
+                raise ChangeFeedError(
+                    "The search returned no _sort values, the change feed "
+                    "position cannot be saved"
+                )
+            yield from objects
+            store.save(
+                key,
+                Watermark(
+                    date_modified=last["date_modified"],
+                    object_id=last.get("id"),
+                    search_after=last["_sort"],
+                ),
+            )
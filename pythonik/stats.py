@@ -0,0 +1,23 @@
+import threading
+
+
+class MetadataStats:
+    """
+    Thread-safe counters for metadata requests: writes the client avoided
+    by skipping unchanged values or coalescing buffered writes, and reads
+    that found no metadata (404).
+
+    A PythonikClient shares one instance between every MetadataSpec it
+    creates, so the counters cover all metadata calls made through it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.writes_skipped = 0
+        self.fields_skipped = 0
+        self.writes_coalesced = 0
+        self.not_found = 0
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
@@ -9,6 +9,9 @@ from pythonik.models.assets.assets import (
     BulkDelete,
     BulkDeleteObjectType,
 )
+from pythonik.models.assets.ingest import IngestItem
+from pythonik.models.files.file import FileSet
+from pythonik.models.files.format import Format
 from pythonik.models.assets.versions import (
     AssetVersionCreate,
     AssetVersionResponse,
@@ -38,6 +41,15 @@ from pythonik.specs.assets import (
     VERSIONS_FROM_ASSET_URL,
     BULK_DELETE_SEGMENTS_URL,
 )
+from pythonik.specs.files import (
+    FilesSpec,
+    DELETE_ASSETS_FILE_PATH,
+    DELETE_ASSETS_FILE_SET_PATH,
+    GET_ASSETS_FILE_PATH,
+    GET_ASSETS_FILES_PATH,
+    GET_ASSETS_FILE_SETS_PATH,
+    GET_ASSETS_FORMATS_PATH,
+)
 
 
 def test_partial_update_asset():
@@ -489,3 +501,146 @@ def test_get_segments():
         assert "per_page=5" in last_request.url
         assert "segment_type=MARKER" in last_request.url
         assert "time_start_milliseconds__gte=500" in last_request.url
+
+
+def test_ingest(tmp_path):
+    with requests_mock.Mocker() as m:
+        app_id = str(uuid.uuid4())
+        auth_token = str(uuid.uuid4())
+        storage_id = str(uuid.uuid4())
+        upload_url = "https://storage.googleapis.com/bucket/upload"
+        location = "https://storage.googleapis.com/upload/session"
+
+        def create_asset(request, context):
+            return Asset(id=request.json()["title"], title=request.json()["title"]).model_dump()
+
+        def create_file(request, context):
+            if request.json()["name"] == "broken.mov":
+                context.status_code = 400
+                return {"errors": ["bad file"]}
+            return {"id": str(uuid.uuid4()), "upload_url": upload_url, "storage_method": "GCS"}
+
+        m.patch(requests_mock.ANY, json={"status": "CLOSED"})
+        m.post(AssetSpec.gen_url(BASE), json=create_asset)
+        for asset_id in ("good", "bad"):
+            m.post(
+                FilesSpec.gen_url(GET_ASSETS_FORMATS_PATH.format(asset_id)),
+                json=Format(id=str(uuid.uuid4())).model_dump(),
+            )
+            m.post(
+                FilesSpec.gen_url(GET_ASSETS_FILE_SETS_PATH.format(asset_id)),
+                json=FileSet(id=f"{asset_id}-file-set").model_dump(),
+            )
+            m.post(FilesSpec.gen_url(GET_ASSETS_FILES_PATH.format(asset_id)), json=create_file)
+            m.patch(AssetSpec.gen_url(GET_URL.format(asset_id)), json=Asset().model_dump())
+            m.delete(AssetSpec.gen_url(GET_URL.format(asset_id)), status_code=204)
+        m.delete(
+            FilesSpec.gen_url(DELETE_ASSETS_FILE_SET_PATH.format("bad", "bad-file-set")),
+            status_code=204,
+        )
+        m.post(upload_url, headers={"Location": location})
+        m.put(location, status_code=200)
+
+        good_path = tmp_path / "good.mov"
+        good_path.write_bytes(b"original")
+        bad_path = tmp_path / "broken.mov"
+        bad_path.write_bytes(b"broken")
+
+        client = PythonikClient(app_id=app_id, auth_token=auth_token, timeout=3)
+        report = client.assets().ingest(
+            [
+                IngestItem(
+                    asset=AssetCreate(title="good"),
+                    file_path=str(good_path),
+                    storage_id=storage_id,
+                ),
+                {
+                    "asset": {"title": "bad"},
+                    "file_path": str(bad_path),
+                    "storage_id": storage_id,
+                },
+            ],
+            max_workers=2,
+        )
+
+        results = {result.asset_id: result for result in report.results}
+        assert report.succeeded == 1 and report.failed == 1
+        assert results["good"].success
+        assert results["good"].file_set_id == "good-file-set"
+        assert set(results["good"].timings) == {
+            "create_asset",
+            "create_format",
+            "create_file_set",
+            "create_file",
+            "upload",
+            "close_file",
+            "activate_asset",
+        }
+        assert not results["bad"].success
+        assert results["bad"].stage == "create_file"
+        assert results["bad"].status_code == 400
+        assert results["bad"].rolled_back
+        assert report.stage_seconds["create_asset"] > 0
+
+        deleted = [r.url for r in m.request_history if r.method == "DELETE"]
+        assert deleted == [
+            FilesSpec.gen_url(DELETE_ASSETS_FILE_SET_PATH.format("bad", "bad-file-set")),
+            AssetSpec.gen_url(GET_URL.format("bad")),
+        ]
+
+
+def test_ingest_close_file_fails(tmp_path):
+    with requests_mock.Mocker() as m:
+        app_id = str(uuid.uuid4())
+        auth_token = str(uuid.uuid4())
+        asset_id = str(uuid.uuid4())
+        file_id = str(uuid.uuid4())
+        upload_url = "https://storage.googleapis.com/bucket/upload"
+        location = "https://storage.googleapis.com/upload/session"
+
+        m.post(AssetSpec.gen_url(BASE), json=Asset(id=asset_id).model_dump())
+        m.post(
+            FilesSpec.gen_url(GET_ASSETS_FORMATS_PATH.format(asset_id)),
+            json=Format(id=str(uuid.uuid4())).model_dump(),
+        )
+        m.post(
+            FilesSpec.gen_url(GET_ASSETS_FILE_SETS_PATH.format(asset_id)),
+            json=FileSet(id="file-set").model_dump(),
+        )
+        m.post(
+            FilesSpec.gen_url(GET_ASSETS_FILES_PATH.format(asset_id)),
+            json={"id": file_id, "upload_url": upload_url, "storage_method": "GCS"},
+        )
+        m.post(upload_url, headers={"Location": location})
+        m.put(location, status_code=200)
+        m.patch(
+            FilesSpec.gen_url(GET_ASSETS_FILE_PATH.format(asset_id, file_id)),
+            status_code=500,
+            text="closing failed",
+        )
+        m.patch(AssetSpec.gen_url(GET_URL.format(asset_id)), json=Asset().model_dump())
+        m.delete(
+            FilesSpec.gen_url(DELETE_ASSETS_FILE_PATH.format(asset_id, file_id)),
+            status_code=204,
+        )
+        m.delete(
+            FilesSpec.gen_url(DELETE_ASSETS_FILE_SET_PATH.format(asset_id, "file-set")),
+            status_code=204,
+        )
+        m.delete(AssetSpec.gen_url(GET_URL.format(asset_id)), status_code=204)
+
+        path = tmp_path / "original.mov"
+        path.write_bytes(b"original")
+
+        client = PythonikClient(app_id=app_id, auth_token=auth_token, timeout=3)
+        report = client.assets().ingest(
+            [IngestItem(asset=AssetCreate(title="a"), file_path=str(path), storage_id="s")]
+        )
+
+        result = report.results[0]
+        assert not result.success
+        assert result.stage == "close_file"
+        assert result.status_code == 500
+        assert result.error == "closing failed"
+        assert {"close_file", "activate_asset"} <= set(result.timings)
+        assert result.rolled_back
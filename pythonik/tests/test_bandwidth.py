@@ -0,0 +1,190 @@
+import threading
+import time
+import uuid
+
+import pytest
+import requests_mock
+
+from pythonik.bandwidth import BandwidthScheduler, Priority
+from pythonik.client import PythonikClient
+from pythonik.specs.search import SEARCH_PATH, SearchSpec
+
+
+# seconds a test waits for transfer threads before failing
+WAIT_DEADLINE = 5
+
+
+class FakeTimeScheduler(BandwidthScheduler):
+    """
+    BandwidthScheduler on a fake clock. With `auto`, waiting moves the
+    clock forward instead of sleeping; otherwise waiting blocks until the
+    test advances the clock.
+    """
+
+    def __init__(self, auto: bool = True, **kwargs):
+        self.now = 0.0
+        self.auto = auto
+        self.waiting = 0
+        super().__init__(clock=lambda: self.now, **kwargs)
+
+    def _wait(self, timeout):
+        if self.auto and timeout is not None:
+            self.now += timeout
+            return
+        self.waiting += 1
+        try:
+            self._condition.wait(WAIT_DEADLINE)
+        finally:
+            self.waiting -= 1
+
+    def advance(self, seconds: float) -> None:
+        with self._condition:
+            self.now += seconds
+            self._condition.notify_all()
+
+    def wait_for(self, waiting: int) -> None:
+        """Block until `waiting` transfers are waiting for the clock"""
+        deadline = time.monotonic() + WAIT_DEADLINE
+        while self.waiting < waiting:
+            assert time.monotonic() < deadline, "transfers did not start waiting"
+            time.sleep(0.001)
+
+    def run(self, threads) -> None:
+        """Advance the clock in small steps until `threads` are done"""
+        deadline = time.monotonic() + WAIT_DEADLINE
+        while any(thread.is_alive() for thread in threads):
+            assert time.monotonic() < deadline, "transfers did not finish"
+            self.advance(0.005)
+            time.sleep(0.001)
+        for thread in threads:
+            thread.join()
+
+
+def test_unlimited_scheduler_does_not_block():
+    scheduler = FakeTimeScheduler()
+    scheduler.acquire(10 * 1024 * 1024)
+    assert scheduler.now == 0
+    assert scheduler.bytes_granted[Priority.BULK] == 10 * 1024 * 1024
+
+
+def test_overall_cap_paces_transfers():
+    scheduler = FakeTimeScheduler(max_bytes_per_second=10_000, burst=0.1, quantum=500)
+    # 1000 bytes of burst, the remaining 2000 take 0.2s at 10kB/s
+    scheduler.acquire(3000)
+    assert scheduler.now == pytest.approx(0.2)
+
+
+def test_control_traffic_is_never_delayed_but_counted():
+    scheduler = FakeTimeScheduler(max_bytes_per_second=10_000, burst=0.1)
+    scheduler.acquire(5000, Priority.CONTROL)
+    assert scheduler.now == 0
+    # bulk has to wait for the 4000 bytes of debt left by control traffic
+    scheduler.acquire(100, Priority.BULK)
+    assert scheduler.now == pytest.approx(0.41)
+
+
+def test_fair_sharing_between_transfers():
+    scheduler = FakeTimeScheduler(
+        auto=False, max_bytes_per_second=20_000, burst=0.01, quantum=200
+    )
+    scheduler.acquire(200)  # drain the bucket
+    order = []
+
+    def transfer(name):
+        for _ in range(5):
+            scheduler.acquire(200)
+            order.append(name)
+
+    threads = [threading.Thread(target=transfer, args=(name,)) for name in "ab"]
+    for thread in threads:
+        thread.start()
+    scheduler.wait_for(2)
+    scheduler.run(threads)
+
+    # neither transfer finishes before the other has started
+    assert set(order[:4]) == {"a", "b"}
+    assert sorted(order) == ["a"] * 5 + ["b"] * 5
+
+
+def test_priority_classes():
+    scheduler = FakeTimeScheduler(
+        auto=False, max_bytes_per_second=20_000, burst=0.01, quantum=200
+    )
+    scheduler.acquire(200)  # drain the bucket
+    finished = []
+
+    def transfer(priority):
+        scheduler.acquire(1000, priority)
+        finished.append(priority)
+
+    bulk = threading.Thread(target=transfer, args=(Priority.BULK,))
+    bulk.start()
+    scheduler.wait_for(1)
+    interactive = threading.Thread(target=transfer, args=(Priority.INTERACTIVE,))
+    interactive.start()
+    scheduler.wait_for(2)
+    scheduler.run([bulk, interactive])
+
+    assert finished == [Priority.INTERACTIVE, Priority.BULK]
+
+
+def test_priority_limit_leaves_capacity_to_lower_classes():
+    scheduler = FakeTimeScheduler(
+        auto=False,
+        priority_limits={Priority.INTERACTIVE: 5_000},
+        burst=0.01,
+        quantum=100,
+    )
+    finished = []
+
+    def transfer(priority, nbytes):
+        scheduler.acquire(nbytes, priority)
+        finished.append(priority)
+
+    interactive = threading.Thread(target=transfer, args=(Priority.INTERACTIVE, 1000))
+    interactive.start()
+    scheduler.wait_for(1)
+    # bulk has no cap and is not held back by the capped interactive transfer
+    transfer(Priority.BULK, 1000)
+    scheduler.run([interactive])
+
+    assert finished == [Priority.BULK, Priority.INTERACTIVE]
+
+
+def test_client_without_limits_has_no_scheduler():
+    with requests_mock.Mocker() as m:
+        m.post(SearchSpec.gen_url(SEARCH_PATH), json={})
+        client = PythonikClient(
+            app_id=str(uuid.uuid4()), auth_token=str(uuid.uuid4()), timeout=3
+        )
+        assert client.bandwidth is None
+        assert client.search().search({"query": "title:proxy"}).response.ok
+
+        scheduler = BandwidthScheduler()
+        shared = PythonikClient(
+            app_id=str(uuid.uuid4()),
+            auth_token=str(uuid.uuid4()),
+            timeout=3,
+            bandwidth=scheduler,
+        )
+        assert shared.bandwidth is scheduler
+
+
+def test_client_shares_scheduler_with_specs(tmp_path):
+    with requests_mock.Mocker() as m:
+        payload = b"x" * 1000
+        url = "https://storage.example.com/proxy.mp4"
+        m.get(url, content=payload)
+        m.post(SearchSpec.gen_url(SEARCH_PATH), json={})
+
+        client = PythonikClient(
+            app_id=str(uuid.uuid4()),
+            auth_token=str(uuid.uuid4()),
+            timeout=3,
+            max_bandwidth=1_000_000,
+        )
+        client.files().download(url, str(tmp_path / "proxy.mp4"))
+        client.search().search({"query": "title:proxy"})
+
+        assert client.bandwidth.bytes_granted[Priority.BULK] == len(payload)
+        assert client.bandwidth.bytes_granted[Priority.CONTROL] > 0
@@ -0,0 +1,110 @@
+import io
+import json
+import uuid
+
+import pytest
+
+from pythonik.client import PythonikClient
+from pythonik.columnar import MetadataTable
+from pythonik.models.metadata.fields import FieldResponse
+from pythonik.models.search.search_body import SearchBody, SortItem
+from pythonik.specs.metadata import FIELD_BY_NAME_PATH, MetadataSpec
+from pythonik.specs.search import SEARCH_PATH, SearchSpec
+
+
+def _table():
+    table = MetadataTable(
+        {
+            "count": FieldResponse(name="count", field_type="integer"),
+            "tags": FieldResponse(name="tags", field_type="tag_cloud", multi=True),
+            "approved": "boolean",
+            "shot_date": "date",
+            "notes": None,
+        }
+    )
+    table.append(
+        "a1",
+        {
+            "count": ["3"],
+            "tags": ["x", "y"],
+            "approved": ["true"],
+            "shot_date": ["2024-05-01"],
+            "notes": ["hello"],
+        },
+    )
+    table.append("a2", {"count": ["not a number"], "tags": []})
+    table.append(
+        "a3", {"count": {"field_values": [{"value": 7}]}, "approved": [False]}
+    )
+    return table
+
+
+def test_metadata_table_columns():
+    table = _table()
+
+    assert len(table) == 3
+    assert table.to_pydict() == {
+        "id": ["a1", "a2", "a3"],
+        "count": [3, None, 7],
+        "tags": [["x", "y"], None, None],
+        "approved": [True, None, False],
+        "shot_date": ["2024-05-01", None, None],
+        "notes": ["hello", None, None],
+    }
+    assert table.columns["count"].invalid == 1
+
+
+def test_metadata_table_to_csv():
+    output = io.StringIO(newline="")
+    _table().to_csv(output)
+
+    lines = output.getvalue().splitlines()
+    assert lines[0] == "id,count,tags,approved,shot_date,notes"
+    assert lines[1] == "a1,3,x|y,True,2024-05-01,hello"
+    assert lines[2] == "a2,,,,,"
+
+
+def test_metadata_table_to_arrow():
+    pa = pytest.importorskip("pyarrow")
+
+    arrow_table = _table().to_arrow()
+
+    assert arrow_table.schema.field("count").type == pa.int64()
+    assert arrow_table.schema.field("tags").type == pa.list_(pa.string())
+    assert arrow_table.schema.field("shot_date").type == pa.date32()
+    assert arrow_table.column("count").to_pylist() == [3, None, 7]
+
+
+def test_export_metadata(requests_mock):
+    field = json.loads(
+        FieldResponse(name="count", field_type="integer").model_dump_json()
+    )
+    requests_mock.get(
+        MetadataSpec.gen_url(FIELD_BY_NAME_PATH.format(field_name="count")),
+        json=field,
+    )
+    pages = [
+        {
+            "objects": [
+                {"id": "a1", "metadata": {"count": [1]}, "_sort": ["a1"]},
+                {"id": "a2", "metadata": {"count": [2]}, "_sort": ["a2"]},
+            ]
+        },
+        {"objects": [{"id": "a3", "metadata": {}, "_sort": ["a3"]}]},
+    ]
+    search = requests_mock.post(
+        SearchSpec.gen_url(SEARCH_PATH), [{"json": page} for page in pages]
+    )
+
+    client = PythonikClient(app_id=str(uuid.uuid4()), auth_token="token", timeout=3)
+    table = client.search().export_metadata(
+        SearchBody(doc_types=["assets"], sort=[SortItem(name="id", order="asc")]),
+        fields=["count"],
+        per_page=2,
+        params={"generate_signed_url": False},
+    )
+
+    assert table.to_pydict() == {"id": ["a1", "a2", "a3"], "count": [1, 2, None]}
+    assert search.call_count == 2
+    assert search.request_history[1].json()["search_after"] == ["a2"]
+    assert search.request_history[0].qs["generate_signed_url"] == ["false"]
@@ -0,0 +1,176 @@
+import gzip
+import json
+import pickle
+import uuid
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+import requests_mock
+
+from pythonik.client import PythonikClient
+from pythonik.export import (
+    SearchExporter,
+    ShardTask,
+    _export_shard,
+    date_shards,
+    id_shards,
+)
+from pythonik.models.search.export import ExportManifest
+from pythonik.paging import AdaptivePageSize
+from pythonik.specs.search import SEARCH_PATH, SearchSpec
+from pythonik.tests.utils import local_server
+
+
+def _client():
+    return PythonikClient(app_id="app", auth_token="token", timeout=3)
+
+
+def test_id_shards_cover_the_id_range():
+    shards = id_shards(4)
+    assert [shard.min for shard in shards] == [
+        "00000000-0000-0000-0000-000000000000",
+        "40000000-0000-0000-0000-000000000000",
+        "80000000-0000-0000-0000-000000000000",
+        "c0000000-0000-0000-0000-000000000000",
+    ]
+    assert shards[-1].max == "ffffffff-ffff-ffff-ffff-ffffffffffff"
+    assert [shard.include_max for shard in shards] == [False, False, False, True]
+
+
+def _search_callback(objects_by_shard):
+    """Answer each shard's search with its objects, one page per shard"""
+
+    def callback(request, context):
+        term = request.json()["filter"]["terms"][0]
+        return {
+            "objects": [
+                {**obj, "_sort": [obj["id"]]}
+                for obj in objects_by_shard.get(term["range"]["min"], [])
+            ]
+        }
+
+    return callback
+
+
+def test_export_ndjson_with_manifest(tmp_path):
+    shards = date_shards("date_created", ["2024-01-01", "2024-02-01", "2024-03-01"])
+    january = [
+        {"id": str(uuid.uuid4()), "date_created": "2024-01-05T00:00:00Z"},
+        # on the upper bound, belongs to the next shard
+        {"id": str(uuid.uuid4()), "date_created": "2024-02-01T00:00:00Z"},
+    ]
+    february = [
+        {"id": str(uuid.uuid4()), "date_created": "2024-02-01T00:00:00Z"},
+        {"id": str(uuid.uuid4()), "date_created": "2024-03-01T00:00:00Z"},
+    ]
+
+    with requests_mock.Mocker() as m:
+        matcher = m.post(
+            SearchSpec.gen_url(SEARCH_PATH),
+            json=_search_callback({"2024-01-01": january, "2024-02-01": february}),
+        )
+        exporter = SearchExporter(_client(), str(tmp_path), processes=1)
+        manifest = exporter.run(
+            {"doc_types": ["assets"], "filter": {"operator": "AND", "terms": [{"name": "status", "value": "ACTIVE"}]}},
+            shards,
+        )
+
+    assert manifest.success
+    assert [shard.objects for shard in manifest.shards] == [1, 2]
+    assert manifest.objects == 3
+    with gzip.open(tmp_path / "date_created-0000.ndjson.gz", "rt") as f:
+        assert [json.loads(line)["id"] for line in f] == [january[0]["id"]]
+
+    sent = matcher.request_history[0]
+    assert sent.json()["sort"] == [{"name": "id", "order": "asc"}]
+    assert sent.json()["filter"]["filters"][0]["terms"][0]["value"] == "ACTIVE"
+    assert sent.qs["generate_signed_url"] == ["false"]
+
+    saved = ExportManifest.model_validate_json((tmp_path / "manifest.json").read_text())
+    assert saved.shards[1].path == "date_created-0001.ndjson.gz"
+    assert saved.shards[1].bytes > 0
+
+
+def test_export_records_failed_shards(tmp_path):
+    with requests_mock.Mocker() as m:
+        m.post(SearchSpec.gen_url(SEARCH_PATH), status_code=500)
+        manifest = SearchExporter(
+            _client(), str(tmp_path), file_format="ndjson", processes=1
+        ).run({"doc_types": ["assets"]}, id_shards(2))
+
+    assert not manifest.success
+    assert all(shard.error for shard in manifest.shards)
+
+    # a worker that cannot even create its client reports it on the shard
+    result = _export_shard(
+        ({}, {}, id_shards(1)[0], str(tmp_path / "id-0000.ndjson"), "ndjson", None)
+    )
+    assert result.error
+
+
+def test_export_parquet(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    objects = [
+        {"id": str(uuid.uuid4()), "title": "one", "metadata": {"genre": ["drama"]}},
+        {"id": str(uuid.uuid4()), "title": "two"},
+    ]
+    with requests_mock.Mocker() as m:
+        m.post(
+            SearchSpec.gen_url(SEARCH_PATH),
+            json=_search_callback({"00000000-0000-0000-0000-000000000000": objects}),
+        )
+        SearchExporter(
+            _client(), str(tmp_path), file_format="parquet", processes=1
+        ).run({"doc_types": ["assets"]}, id_shards(1))
+
+    table = pq.read_table(tmp_path / "id-0000.parquet")
+    assert table.column("title").to_pylist() == ["one", "two"]
+    assert json.loads(table.column("json")[0].as_py())["metadata"] == {"genre": ["drama"]}
+
+
+def test_export_in_worker_processes(tmp_path):
+    shards = id_shards(2)
+    objects = {shard.min: [{"id": shard.min}] for shard in shards}
+
+    class Iconik(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            term = body["filter"]["terms"][0]
+            page = [] if body.get("search_after") else objects[term["range"]["min"]]
+            data = json.dumps(
+                {"objects": [{**obj, "_sort": [obj["id"]]} for obj in page]}
+            ).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    with local_server(Iconik) as url:
+        client = PythonikClient(
+            app_id="app", auth_token="token", timeout=3, base_url=url
+        )
+        exporter = SearchExporter(
+            client, str(tmp_path), file_format="ndjson", processes=2
+        )
+        # what the pool sends to each worker
+        task: ShardTask = (
+            exporter.settings,
+            {"doc_types": ["assets"]},
+            shards[0],
+            str(tmp_path / "shard.ndjson"),
+            exporter.file_format,
+            AdaptivePageSize(),
+        )
+        assert pickle.loads(pickle.dumps(task))[2] == shards[0]
+
+        manifest = exporter.run({"doc_types": ["assets"]}, shards)
+
+    assert manifest.success, [shard.error for shard in manifest.shards]
+    assert [shard.objects for shard in manifest.shards] == [1, 1]
+    for shard in shards:
+        with open(tmp_path / f"{shard.name}.ndjson") as f:
+            assert [json.loads(line)["id"] for line in f] == [shard.min]
@@ -1,13 +1,18 @@
+import hashlib
+import os
 import uuid
 from enum import Enum
+from http.server import BaseHTTPRequestHandler
 
 import pytest
 import requests_mock
 
+from pythonik.bandwidth import Priority
 from pythonik.client import PythonikClient
 from pythonik.exceptions import UnexpectedStorageMethodForProxy
-from pythonik.models.files.keyframe import Keyframe, Keyframes
+from pythonik.models.files.keyframe import Keyframe, Keyframes, KeyframeUploadItem
 from pythonik.models.files.file import (
+    File,
     FileSetsFilesResponse,
     Files,
     FileSets,
@@ -48,6 +53,7 @@ from pythonik.tests.utils import (
     generate_mock_gcs_upload_url,
     generate_mock_s3_multipart_upload_url,
     generate_mock_s3_multipart_upload_start_response,
+    local_server,
 )
 
 
@@ -315,6 +321,75 @@ def test_get_upload_id_for_keyframe(storage_method, exception):
 
         client = PythonikClient(app_id=app_id, auth_token=auth_token, timeout=3)
         client.files().get_upload_id_for_keyframe(keyframe=kf)
+        assert m.last_request.timeout == 3
+
+
+def test_upload_keyframes(tmp_path):
+    with requests_mock.Mocker() as m:
+        app_id = str(uuid.uuid4())
+        auth_token = str(uuid.uuid4())
+        asset_id = str(uuid.uuid4())
+        bucket_name = str(uuid.uuid4())
+
+        frames = []
+        uploaded_sizes = []
+
+        def receive_upload(request, context):
+            uploaded_sizes.append(len(request.body.read()))
+            context.status_code = 500 if uploaded_sizes[-1] == 3 else 200
+            return ""
+
+        for n in range(3):
+            keyframe_id = str(uuid.uuid4())
+            upload_url = generate_mock_gcs_upload_url(bucket_name, f"{keyframe_id}.jpg")
+            location = f"https://storage.googleapis.com/upload/{keyframe_id}"
+            frame_path = tmp_path / f"frame_{n}.jpg"
+            frame_path.write_bytes(b"x" * (n + 1))
+            frames.append((keyframe_id, upload_url, location, str(frame_path)))
+
+            m.post(
+                upload_url,
+                headers={"X-GUploader-UploadID": keyframe_id, "Location": location},
+            )
+            # the last (3 byte) frame fails to upload
+            m.put(location, text=receive_upload)
+            m.post(
+                FilesSpec.gen_url(GET_ASSET_KEYFRAME.format(asset_id, keyframe_id)),
+                json=Keyframe(id=keyframe_id, status="CLOSED").model_dump(),
+            )
+
+        def create_keyframe(request, context):
+            name = request.json()["name"]
+            keyframe_id, upload_url, _, _ = frames[int(name)]
+            return Keyframe(
+                id=keyframe_id,
+                name=name,
+                upload_url=upload_url,
+                storage_method="GCS",
+            ).model_dump()
+
+        m.post(
+            FilesSpec.gen_url(GET_ASSET_KEYFRAMES.format(asset_id)),
+            json=create_keyframe,
+        )
+
+        client = PythonikClient(app_id=app_id, auth_token=auth_token, timeout=3)
+        results = client.files().upload_keyframes(
+            asset_id,
+            [
+                KeyframeUploadItem(keyframe=Keyframe(name=str(n)), file_path=path)
+                for n, (_, _, _, path) in enumerate(frames)
+            ],
+            max_workers=2,
+        )
+
+        assert [r.file_path for r in results] == [f[3] for f in frames]
+        assert [r.success for r in results] == [True, True, False]
+        assert results[0].keyframe_id == frames[0][0]
+        assert results[0].stage == "update"
+        assert results[2].stage == "upload"
+        assert results[2].status_code == 500
+        assert sorted(uploaded_sizes) == [1, 2, 3]
 
 
 @pytest.mark.parametrize(
@@ -855,3 +930,299 @@ def test_get_asset_files_by_version():
             generate_signed_url=False,
             content_disposition="attachment",
         )
+
+
+def _ranged_storage(m, url, payload, fail_ranges=()):
+    """Mock a storage URL that honours Range requests"""
+    requested = []
+
+    def serve(request, context):
+        start, end = (int(n) for n in request.headers["Range"][6:].split("-"))
+        requested.append((start, end))
+        if (start, end) in fail_ranges:
+            context.status_code = 503
+            return b""
+        context.status_code = 206
+        context.headers["Content-Range"] = f"bytes {start}-{end}/{len(payload)}"
+        return payload[start:end + 1]
+
+    m.get(url, content=serve)
+    return requested
+
+
+def test_download_ranged(tmp_path):
+    with requests_mock.Mocker() as m:
+        payload = bytes(range(256)) * 4
+        url = "https://storage.example.com/original.mov"
+        requested = _ranged_storage(m, url, payload)
+        destination = str(tmp_path / "original.mov")
+
+        client = PythonikClient(app_id=str(uuid.uuid4()), auth_token=str(uuid.uuid4()), timeout=3)
+        result = client.files().download(
+            File(url=url, size=len(payload), checksum=hashlib.md5(payload).hexdigest()),
+            destination,
+            chunk_size=100,
+            max_workers=4,
+        )
+
+        assert result.success
+        assert result.checksum_verified
+        assert result.chunks == 11
+        assert result.bytes_downloaded == len(payload)
+        assert open(destination, "rb").read() == payload
+        assert not os.path.exists(destination + ".progress")
+        # probe plus one request per chunk
+        assert len(requested) == 12
+        assert all(r.timeout == 3 for r in m.request_history)
+
+
+def test_download_resumes_partial(tmp_path):
+    with requests_mock.Mocker() as m:
+        payload = os.urandom(1000)
+        url = "https://storage.example.com/proxy.mp4"
+        destination = str(tmp_path / "proxy.mp4")
+        client = PythonikClient(app_id=str(uuid.uuid4()), auth_token=str(uuid.uuid4()), timeout=3)
+
+        requested = _ranged_storage(m, url, payload, fail_ranges={(500, 749)})
+        result = client.files().download(url, destination, chunk_size=250)
+        assert not result.success
+        assert result.status_code == 503
+        assert os.path.exists(destination + ".progress")
+
+        requested = _ranged_storage(m, url, payload)
+        result = client.files().download(url, destination, chunk_size=250)
+        assert result.success
+        assert result.resumed_chunks == 3
+        assert requested == [(0, 0), (500, 749)]
+        assert open(destination, "rb").read() == payload
+
+
+def test_download_without_range_support(tmp_path):
+    with requests_mock.Mocker() as m:
+        payload = b"keyframe bytes"
+        url = "https://storage.example.com/keyframe.jpg"
+        m.get(url, content=payload)
+        destination = str(tmp_path / "keyframe.jpg")
+
+        client = PythonikClient(app_id=str(uuid.uuid4()), auth_token=str(uuid.uuid4()), timeout=3)
+        result = client.files().download(
+            Keyframe(url=url, size=len(payload)), destination
+        )
+
+        assert result.success
+        assert result.chunks == 1
+        assert open(destination, "rb").read() == payload
+
+
+def test_download_empty_file(tmp_path):
+    with requests_mock.Mocker() as m:
+        url = "https://storage.example.com/empty.bin"
+        # S3-style storage rejects bytes=0-0 of an empty object
+        m.get(url, status_code=416, headers={"Content-Range": "bytes */0"})
+        destination = str(tmp_path / "empty.bin")
+
+        client = PythonikClient(app_id=str(uuid.uuid4()), auth_token=str(uuid.uuid4()), timeout=3)
+        result = client.files().download(
+            File(url=url, checksum=hashlib.md5(b"").hexdigest()), destination
+        )
+
+        assert result.success
+        assert result.size == 0
+        assert result.checksum_verified
+        assert open(destination, "rb").read() == b""
+
+
+def test_download_checksum_mismatch(tmp_path):
+    with requests_mock.Mocker() as m:
+        payload = b"0123456789"
+        url = "https://storage.example.com/file.bin"
+        _ranged_storage(m, url, payload)
+        destination = str(tmp_path / "file.bin")
+
+        client = PythonikClient(app_id=str(uuid.uuid4()), auth_token=str(uuid.uuid4()), timeout=3)
+        result = client.files().download(url, destination, checksum="0" * 32, chunk_size=4)
+
+        assert not result.success
+        assert result.checksum_verified is False
+
+
+def test_ingest_directory(tmp_path):
+    with requests_mock.Mocker() as m:
+        app_id = str(uuid.uuid4())
+        auth_token = str(uuid.uuid4())
+        asset_id = str(uuid.uuid4())
+        format_id = str(uuid.uuid4())
+        storage_id = str(uuid.uuid4())
+        file_set_id = str(uuid.uuid4())
+
+        root = tmp_path / "DCP"
+        (root / "reels" / "r1").mkdir(parents=True)
+        (root / "ASSETMAP.xml").write_bytes(b"a" * 10)
+        (root / "reels" / "video.mxf").write_bytes(b"v" * 100)
+        (root / "reels" / "r1" / "audio.mxf").write_bytes(b"s" * 50)
+        (root / "reels" / "r1" / "bad.mxf").write_bytes(b"")
+
+        m.post(
+            FilesSpec.gen_url(GET_ASSETS_FILE_SETS_PATH.format(asset_id)),
+            json=FileSet(id=file_set_id).model_dump(),
+        )
+
+        def create_file(request, context):
+            if request.json()["name"] == "bad.mxf":
+                context.status_code = 400
+                return {"errors": ["bad"]}
+            return {"id": str(uuid.uuid4()), "name": request.json()["name"]}
+
+        files_address = FilesSpec.gen_url(GET_ASSETS_FILES_PATH.format(asset_id))
+        m.post(files_address, json=create_file)
+
+        client = PythonikClient(app_id=app_id, auth_token=auth_token, timeout=3)
+        result = client.files().ingest_directory(
+            asset_id, str(root), format_id, storage_id, max_workers=2
+        )
+
+        assert result.file_set_id == file_set_id
+        assert result.files_created == 3
+        assert result.directories_created == 2
+        assert result.bytes_registered == 160
+        assert result.failed == 1
+        assert result.failures[0].path.endswith("bad.mxf")
+        assert result.failures[0].status_code == 400
+        assert not result.success
+
+        file_set_body = m.request_history[0].json()
+        assert file_set_body["name"] == "DCP"
+        created = {
+            r.json()["name"]: r.json()
+            for r in m.request_history
+            if r.url == files_address
+        }
+        assert created["audio.mxf"]["directory_path"] == "reels/r1"
+        assert created["r1"]["type"] == FileType.DIRECTORY.value
+        assert created["r1"]["directory_path"] == "reels"
+        assert created["ASSETMAP.xml"].get("directory_path", "") == ""
+        assert created["ASSETMAP.xml"]["status"] == "CLOSED"
+
+
+def test_ingest_directory_skips_unreadable(tmp_path, monkeypatch):
+    with requests_mock.Mocker() as m:
+        asset_id = str(uuid.uuid4())
+
+        (tmp_path / "locked").mkdir()
+        (tmp_path / "locked" / "hidden.mxf").write_bytes(b"h")
+        (tmp_path / "open").mkdir()
+        (tmp_path / "open" / "video.mxf").write_bytes(b"v" * 10)
+        locked = str(tmp_path / "locked")
+        os.chmod(locked, 0)
+        if os.access(locked, os.R_OK):
+            # running as root, chmod doesn't deny access
+            scandir = os.scandir
+
+            def denied_scandir(path):
+                if path == locked:
+                    raise PermissionError(13, "Permission denied", path)
+                return scandir(path)
+
+            monkeypatch.setattr(os, "scandir", denied_scandir)
+
+        m.post(
+            FilesSpec.gen_url(GET_ASSETS_FILE_SETS_PATH.format(asset_id)),
+            json=FileSet(id="file-set").model_dump(),
+        )
+        m.post(
+            FilesSpec.gen_url(GET_ASSETS_FILES_PATH.format(asset_id)),
+            json={"id": str(uuid.uuid4())},
+        )
+
+        client = PythonikClient(app_id=str(uuid.uuid4()), auth_token=str(uuid.uuid4()), timeout=3)
+        try:
+            result = client.files().ingest_directory(
+                asset_id, str(tmp_path), "format-id", "storage-id", max_workers=2
+            )
+        finally:
+            os.chmod(locked, 0o755)
+
+        assert result.directories_created == 2
+        assert result.files_created == 1
+        assert result.failed == 1
+        assert result.failures[0].path == locked
+        assert result.failures[0].stage == "scan_directory"
+        assert "Permission denied" in result.failures[0].error
+        assert not result.success
+
+
+def test_ingest_directory_with_upload(tmp_path):
+    with requests_mock.Mocker() as m:
+        app_id = str(uuid.uuid4())
+        auth_token = str(uuid.uuid4())
+        asset_id = str(uuid.uuid4())
+        file_set_id = str(uuid.uuid4())
+        upload_url = "https://storage.googleapis.com/bucket/upload"
+        location = "https://storage.googleapis.com/upload/session"
+
+        (tmp_path / "frame_0001.exr").write_bytes(b"1" * 5)
+        (tmp_path / "frame_0002.exr").write_bytes(b"2" * 5)
+
+        m.post(
+            FilesSpec.gen_url(GET_ASSETS_FILE_SETS_PATH.format(asset_id)),
+            json=FileSet(id=file_set_id).model_dump(),
+        )
+        m.post(
+            FilesSpec.gen_url(GET_ASSETS_FILES_PATH.format(asset_id)),
+            json={"id": "file-id", "upload_url": upload_url, "storage_method": "GCS"},
+        )
+        m.post(upload_url, headers={"Location": location})
+        m.put(location)
+        close = m.patch(
+            FilesSpec.gen_url(GET_ASSETS_FILE_PATH.format(asset_id, "file-id")),
+            json={"id": "file-id", "status": "CLOSED"},
+        )
+
+        client = PythonikClient(app_id=app_id, auth_token=auth_token, timeout=3)
+        result = client.files().ingest_directory(
+            asset_id, str(tmp_path), "format-id", "storage-id", upload=True
+        )
+
+        assert result.success
+        assert result.uploaded == 2
+        assert close.call_count == 2
+        assert close.last_request.json() == {"status": "CLOSED"}
+
+
+def test_upload_asset_file_streams_through_scheduler(tmp_path):
+    received = []
+
+    class Storage(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.send_response(200)
+            self.send_header("Location", f"http://{self.headers['Host']}/session")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def do_PUT(self):
+            received.append(self.rfile.read(int(self.headers["Content-Length"])))
+            self.send_response(200)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    payload = os.urandom(256 * 1024)
+    path = tmp_path / "original.mov"
+    path.write_bytes(payload)
+
+    with local_server(Storage) as url:
+        client = PythonikClient(
+            app_id=str(uuid.uuid4()),
+            auth_token=str(uuid.uuid4()),
+            timeout=3,
+            max_bandwidth=10_000_000,
+        )
+        response = client.files().upload_asset_file(
+            File(upload_url=url + "/upload", storage_method="GCS"), str(path)
+        )
+
+    assert response.response.ok
+    assert received == [payload]
+    assert client.bandwidth.bytes_granted[Priority.BULK] == len(payload)
@@ -465,3 +465,90 @@ def test_get_object_metadata_segments_direct():
             response.data.metadata_values["segment_direct_field"].field_values[0].value
             == "segment_direct_value"
         )
+
+
+def test_get_metadata_for_views():
+    """Test fetching metadata for many (object, view) pairs at once."""
+    with requests_mock.Mocker() as m:
+        # Arrange
+        asset_id = str(uuid.uuid4())
+        segment_id = str(uuid.uuid4())
+        views = [str(uuid.uuid4()) for _ in range(4)]
+        values = {"metadata_values": {"title": {"field_values": [{"value": "A"}]}}}
+
+        m.get(
+            MetadataSpec.gen_url(f"assets/{asset_id}/views/{views[0]}/"), json=values
+        )
+        m.get(
+            MetadataSpec.gen_url(f"assets/{asset_id}/views/{views[1]}/"),
+            status_code=404,
+            json={"error": "Not found"},
+        )
+        m.get(
+            MetadataSpec.gen_url(f"assets/{asset_id}/views/{views[2]}/"),
+            status_code=500,
+        )
+        m.get(
+            MetadataSpec.gen_url(f"segments/{segment_id}/views/{views[3]}/"),
+            json=values,
+        )
+        default_model = ViewMetadata()
+
+        # Act
+        client = PythonikClient(app_id="app", auth_token="token", timeout=3)
+        result = client.metadata().get_metadata_for_views(
+            [
+                ("assets", asset_id, views[0]),
+                ("assets", asset_id, views[1]),
+                ("assets", asset_id, views[2]),
+                ("segments", segment_id, views[3]),
+                ("assets", asset_id, views[0]),
+            ],
+            intercept_404=default_model,
+        )
+
+        # Assert
+        assert len(result) == 4
+        assert m.call_count == 4
+        asset_views = result.views("assets", asset_id)
+        assert list(asset_views) == views[:3]
+        assert asset_views[views[0]].metadata_values["title"].field_values[0].value == "A"
+        assert asset_views[views[1]] is default_model
+        assert asset_views[views[2]] is None
+        assert result["segments", segment_id, views[3]].metadata_values is not None
+        assert result.missing == {("assets", asset_id, views[1])}
+        assert result.failed == {("assets", asset_id, views[2]): 500}
+        assert not result.ok
+        with pytest.raises(TypeError):
+            asset_views["other"] = default_model
+
+
+def test_get_object_metadata_not_found_result():
+    """Test that intercepted 404s are flagged, counted and leave the response untouched."""
+    with requests_mock.Mocker() as m:
+        # Arrange
+        object_id = str(uuid.uuid4())
+        view_id = str(uuid.uuid4())
+        m.get(
+            MetadataSpec.gen_url(f"assets/{object_id}/views/{view_id}/"),
+            status_code=404,
+            json={"error": "Not found"},
+        )
+        default_model = ViewMetadata()
+        client = PythonikClient(app_id="app", auth_token="token", timeout=3)
+
+        # Act
+        intercepted = client.metadata().get_object_metadata(
+            "assets", object_id, view_id, intercept_404=default_model
+        )
+        plain = client.metadata().get_object_metadata("assets", object_id, view_id)
+
+        # Assert
+        assert intercepted.not_found
+        assert intercepted.data is default_model
+        assert intercepted.response.status_code == 404
+        intercepted.response.raise_for_status()
+        assert not hasattr(intercepted.response._response, "raise_for_status_404")
+        assert not plain.not_found
+        assert plain.data is None
+        assert client.metadata_stats.not_found == 2
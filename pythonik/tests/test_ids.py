@@ -0,0 +1,66 @@
+import uuid
+
+import pytest
+import requests_mock
+
+from pythonik.client import PythonikClient
+from pythonik.ids import IdArray
+from pythonik.specs.search import SEARCH_PATH, SearchSpec
+
+
+def test_id_array_dedupes_and_searches():
+    ids = sorted(str(uuid.uuid4()) for _ in range(100))
+    array = IdArray()
+    assert array.extend(ids) == 100
+    assert not array.append(ids[-1])
+
+    assert len(array) == 100
+    assert array.nbytes == 1600
+    assert array.sorted
+    assert array[0] == ids[0] and array[-1] == ids[-1]
+    assert array[:3] == ids[:3]
+    assert list(array) == ids
+    assert all(object_id in array for object_id in ids)
+    assert str(uuid.uuid4()) not in array
+    assert "not-an-id" not in array
+    with pytest.raises(ValueError):
+        array.append("not-an-id")
+
+
+def test_id_array_unsorted_membership():
+    ids = sorted((str(uuid.uuid4()) for _ in range(20)), reverse=True)
+    array = IdArray(ids)
+    assert not array.sorted
+    assert all(object_id in array for object_id in ids)
+    assert str(uuid.uuid4()) not in array
+
+
+def test_scan_ids():
+    ids = sorted(str(uuid.uuid4()) for _ in range(5))
+
+    def page(*page_ids):
+        return {"json": {"objects": [{"id": i, "_sort": [i]} for i in page_ids]}}
+
+    with requests_mock.Mocker() as m:
+        matcher = m.post(
+            SearchSpec.gen_url(SEARCH_PATH),
+            [page(*ids[:2]), page(*ids[1:3]), page(*ids[3:]), page()],
+        )
+        client = PythonikClient(app_id="app", auth_token="token", timeout=3)
+
+        result = client.search().scan_ids(
+            {"doc_types": ["assets"], "exclude_fields": ["files"], "sort": [{"name": "title"}]},
+            per_page=2,
+        )
+
+        # the repeated ID at the page boundary is kept once
+        assert list(result) == ids
+        first = matcher.request_history[0]
+        assert first.json() == {
+            "doc_types": ["assets"],
+            "include_fields": ["id"],
+            "sort": [{"name": "id", "order": "asc"}],
+        }
+        assert first.qs["generate_signed_url"] == ["false"]
+        assert first.qs["save_search_history"] == ["false"]
+        assert matcher.request_history[1].json()["search_after"] == [ids[1]]
@@ -0,0 +1,140 @@
+import json
+import uuid
+
+from pythonik.client import PythonikClient
+from pythonik.importer import MetadataImporter
+from pythonik.models.metadata.view_responses import ViewResponse
+from pythonik.models.metadata.views import ViewField
+from pythonik.specs.metadata import (
+    GET_VIEW_PATH,
+    OBJECT_VIEW_METADATA_PATH,
+    MetadataSpec,
+)
+
+
+VIEW_ID = str(uuid.uuid4())
+
+
+def _mock_view(requests_mock):
+    view = ViewResponse(
+        id=VIEW_ID,
+        name="Import",
+        date_created="2024-01-01",
+        date_modified="2024-01-01",
+        view_fields=[
+            ViewField(name="title", label="Title"),
+            ViewField(name="tags", label="Keywords", multi=True),
+        ],
+    )
+    requests_mock.get(
+        MetadataSpec.gen_url(GET_VIEW_PATH.format(view_id=VIEW_ID)),
+        json=view.model_dump(),
+    )
+
+
+def _mock_put(requests_mock, asset_id, **kwargs):
+    return requests_mock.put(
+        MetadataSpec.gen_url(
+            OBJECT_VIEW_METADATA_PATH.format("assets", asset_id, VIEW_ID)
+        ),
+        **kwargs,
+    )
+
+
+def test_import_csv(tmp_path, requests_mock):
+    _mock_view(requests_mock)
+    puts = [_mock_put(requests_mock, f"a{i}", json={}) for i in range(3)]
+    _mock_put(requests_mock, "bad", status_code=400, json={"errors": ["invalid"]})
+    path = tmp_path / "dump.csv"
+    path.write_text(
+        "id,Title,keywords,legacy_code\n"
+        "a0,First,x|y,L1\n"
+        "a1,,z,L2\n"
+        ",Orphan,,\n"
+        "a2,,,L3\n"
+        "bad,Broken,,\n"
+    )
+
+    client = PythonikClient(app_id="app", auth_token="token", timeout=3)
+    report = MetadataImporter(client.metadata(), VIEW_ID, concurrency=2).run(
+        str(path)
+    )
+
+    assert (report.records, report.written, report.skipped, report.failed) == (
+        5,
+        2,
+        1,
+        2,
+    )
+    assert report.unmapped_columns == ["legacy_code"]
+    assert sorted(f.record for f in report.failures) == [3, 5]
+    assert puts[0].last_request.json() == {
+        "metadata_values": {
+            "title": {"field_values": [{"value": "First"}]},
+            "tags": {"field_values": [{"value": "x"}, {"value": "y"}]},
+        }
+    }
+    assert puts[1].last_request.json() == {
+        "metadata_values": {"tags": {"field_values": [{"value": "z"}]}}
+    }
+    assert not puts[2].called
+
+
+def test_import_ndjson_resumes_from_checkpoint(tmp_path, requests_mock):
+    _mock_view(requests_mock)
+    puts = [_mock_put(requests_mock, f"a{i}", json={}) for i in range(5)]
+    path = tmp_path / "dump.ndjson"
+    path.write_text(
+        "\n".join(json.dumps({"id": f"a{i}", "title": f"T{i}"}) for i in range(5))
+    )
+    checkpoint = tmp_path / "dump.checkpoint"
+
+    client = PythonikClient(app_id="app", auth_token="token", timeout=3)
+    importer = MetadataImporter(
+        client.metadata(),
+        VIEW_ID,
+        checkpoint_path=str(checkpoint),
+        checkpoint_every=1,
+        concurrency=1,
+    )
+
+    # a run that stops after three records
+    lines = path.read_text().splitlines()
+    partial = tmp_path / "partial.ndjson"
+    partial.write_text("\n".join(lines[:3]) + "\n")
+    importer.run(str(partial))
+    saved = json.loads(checkpoint.read_text())
+    assert saved["records"] == 3
+
+    # pretend the checkpoint belongs to the full file and run again
+    saved["path"] = str(path)
+    checkpoint.write_text(json.dumps(saved))
+    report = importer.run(str(path))
+
+    assert report.resumed_from == 3
+    assert (report.records, report.written) == (2, 2)
+    assert [put.call_count for put in puts] == [1, 1, 1, 1, 1]
+    assert json.loads(checkpoint.read_text())["records"] == 5
+
+
+def test_import_ndjson_skips_malformed_lines(tmp_path, requests_mock):
+    _mock_view(requests_mock)
+    puts = [_mock_put(requests_mock, f"a{i}", json={}) for i in range(2)]
+    path = tmp_path / "dump.ndjson"
+    path.write_text(
+        json.dumps({"id": "a0", "title": "First"})
+        + '\n{"id": "broken", "title": \n'
+        + '["a list", "not an object"]\n'
+        + json.dumps({"id": "a1", "title": "Last"})
+        + "\n"
+    )
+
+    client = PythonikClient(app_id="app", auth_token="token", timeout=3)
+    report = MetadataImporter(client.metadata(), VIEW_ID).run(str(path))
+
+    assert (report.records, report.written, report.failed) == (4, 2, 2)
+    failures = sorted(report.failures, key=lambda f: f.record)
+    assert [f.record for f in failures] == [2, 3]
+    assert failures[0].error.startswith("Invalid JSON")
+    assert failures[1].error == "Expected a JSON object, got list"
+    assert [put.call_count for put in puts] == [1, 1]
@@ -0,0 +1,112 @@
+import pytest
+
+from pythonik.index import ObjectIndex
+from pythonik.models.search.search_response import Object
+from pythonik.query import Q
+
+
+OBJECTS = [
+    {
+        "id": "a",
+        "media_type": "video",
+        "status": "ACTIVE",
+        "in_collections": ["c1", "c2"],
+        "file_names": ["a.mov"],
+        "date_created": "2024-01-05T00:00:00Z",
+        "metadata": {"genre": ["drama", "comedy"], "rating": ["4"]},
+    },
+    {
+        "id": "b",
+        "media_type": "image",
+        "status": "ACTIVE",
+        "in_collections": ["c2"],
+        "date_created": "2024-02-10T00:00:00Z",
+        "metadata": {"genre": ["drama"], "rating": ["10"]},
+    },
+    {
+        "id": "c",
+        "media_type": "video",
+        "status": "DELETED",
+        "date_created": "2024-03-01T00:00:00Z",
+        "metadata": {"rating": [{"value": 7}]},
+    },
+]
+
+
+@pytest.fixture
+def index():
+    index = ObjectIndex(metadata_fields=["genre", "rating"])
+    index.extend(OBJECTS)
+    return index
+
+
+def test_term_queries(index):
+    assert index.search_ids(Q.term("media_type", "video")) == ["a", "c"]
+    assert index.search_ids(Q.term("in_collections", "c2") & Q.term("status", "ACTIVE")) == ["a", "b"]
+    assert index.search_ids(Q.term("metadata.genre", value_in=["comedy", "horror"])) == ["a"]
+    assert index.search_ids(Q.term("file_names", missing=True)) == ["b", "c"]
+    assert index.search_ids(Q.term("metadata.genre", exists=True)) == ["a", "b"]
+    assert index.count(Q.term("media_type", "image") | Q.term("status", "DELETED")) == 2
+    assert index.values("media_type") == {"video": 2, "image": 1}
+
+
+def test_range_queries(index):
+    # numeric values compare as numbers, "10" > "7"
+    assert index.search_ids(Q.range("metadata.rating", min=5)) == ["b", "c"]
+    assert index.search_ids(
+        Q.range("date_created", min="2024-02-01", max="2024-03-01T00:00:00Z")
+    ) == ["b", "c"]
+    nested = Q.term("status", "ACTIVE") & (
+        Q.term("media_type", "image") | Q.range("metadata.rating", max=4)
+    )
+    assert index.search_ids(nested) == ["a", "b"]
+
+
+def test_index_accepts_models_and_drops_objects():
+    index = ObjectIndex(keep_objects=False)
+    index.add(Object(id="x", media_type="video", _sort=[1]))
+    assert index.search_ids(Q.term("media_type", "video")) == ["x"]
+    with pytest.raises(ValueError):
+        index.objects(Q.term("media_type", "video"))
+    with pytest.raises(ValueError):
+        index.search(Q.term("title", "x"))
+
+
+def test_objects_are_returned(index):
+    assert index.objects(Q.term("status", "DELETED")) == [OBJECTS[2]]
+    index.add({"id": "d", "metadata": {"rating": ["8"]}})
+    assert index.search_ids(Q.range("metadata.rating", min=7, max=8)) == ["c", "d"]
+
+
+def test_queries_match_a_scan_as_the_index_grows():
+    # large enough for cached bitmaps and several range blocks
+    def make(i):
+        obj = {"id": str(i), "status": "ACTIVE" if i % 3 else "DELETED"}
+        if i % 5:
+            obj["metadata"] = {"rating": [str(i % 11), str(i % 7)]}
+        return obj
+
+    def scan(objects, predicate):
+        return [obj["id"] for obj in objects if predicate(obj)]
+
+    def ratings(obj):
+        return [int(value) for value in obj.get("metadata", {}).get("rating", [])]
+
+    index = ObjectIndex(fields=["status"], metadata_fields=["rating"])
+    objects = []
+    for size in (20000, 30000):
+        new = [make(i) for i in range(len(objects), size)]
+        objects.extend(new)
+        index.extend(new)
+        query = Q.term("status", "ACTIVE") & Q.range("metadata.rating", min=2, max=8)
+        expected = scan(
+            objects,
+            lambda obj: obj["status"] == "ACTIVE" and any(2 <= r <= 8 for r in ratings(obj)),
+        )
+        assert index.search_ids(query) == expected
+        assert index.count(query) == len(expected)
+        missing = scan(objects, lambda obj: not ratings(obj))
+        assert index.search_ids(Q.term("metadata.rating", missing=True)) == missing
+        assert index.count(Q.term("status", "DELETED") | Q.term("metadata.rating", "10")) == len(
+            scan(objects, lambda obj: obj["status"] == "DELETED" or 10 in ratings(obj))
+        )
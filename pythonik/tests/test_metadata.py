@@ -21,6 +21,7 @@ from pythonik.models.mutation.metadata.mutate import (
     UpdateMetadataResponse,
 )
 from pythonik.models.metadata.view_responses import ViewResponse, ViewListResponse
+from pythonik.models.metadata.bulk import MetadataWriteReport
 from pythonik.specs.metadata import (
     ASSET_METADATA_FROM_VIEW_PATH,
     UPDATE_ASSET_METADATA,
@@ -34,6 +35,7 @@ from pythonik.specs.metadata import (
     GET_VIEW_PATH,
     FIELDS_BASE_PATH,
     FIELD_BY_NAME_PATH,
+    OBJECT_VIEW_METADATA_PATH,
 )
 
 from pythonik.models.metadata.fields import (
@@ -2218,3 +2220,168 @@ def test_delete_metadata_field_alias(requests_mock):
     # Verify results
     assert result.response.ok
     assert result.response.status_code == 204
+
+
+def test_bulk_write_metadata(requests_mock):
+    """Test bulk writes to views and directly, with retries and a report."""
+    view_id = str(uuid.uuid4())
+    asset_ids = [str(uuid.uuid4()) for _ in range(3)]
+    collection_id = str(uuid.uuid4())
+    values = {"metadata_values": {"field1": {"field_values": [{"value": "x"}]}}}
+
+    # the first asset is rate limited once, the second one is rejected
+    requests_mock.put(
+        MetadataSpec.gen_url(
+            OBJECT_VIEW_METADATA_PATH.format("assets", asset_ids[0], view_id)
+        ),
+        [
+            {"status_code": 429, "headers": {"Retry-After": "0"}},
+            {"json": {"object_id": asset_ids[0]}},
+        ],
+    )
+    requests_mock.put(
+        MetadataSpec.gen_url(
+            OBJECT_VIEW_METADATA_PATH.format("assets", asset_ids[1], view_id)
+        ),
+        status_code=400,
+        json={"errors": ["bad value"]},
+    )
+    requests_mock.put(
+        MetadataSpec.gen_url(
+            OBJECT_VIEW_METADATA_PATH.format("assets", asset_ids[2], view_id)
+        ),
+        json={"object_id": asset_ids[2]},
+    )
+    direct = requests_mock.put(
+        MetadataSpec.gen_url(
+            PUT_METADATA_DIRECT_PATH.format("collections", collection_id)
+        ),
+        json={"object_id": collection_id},
+    )
+
+    def items():
+        for asset_id in asset_ids:
+            yield ("assets", asset_id, view_id, values)
+        yield ("collections", collection_id, None, UpdateMetadata(**values))
+
+    client = PythonikClient(app_id="app", auth_token="token", timeout=3)
+    report = MetadataWriteReport()
+    results = {
+        r.object_id: r
+        for r in client.metadata().bulk_write_metadata(
+            items(), concurrency=2, requests_per_second=1000, backoff=0, report=report
+        )
+    }
+
+    assert results[asset_ids[0]].success
+    assert results[asset_ids[0]].attempts == 2
+    assert not results[asset_ids[1]].success
+    assert results[asset_ids[1]].status_code == 400
+    assert results[asset_ids[1]].attempts == 1
+    assert results[asset_ids[2]].success
+    assert results[collection_id].success
+    assert direct.last_request.json() == values
+    assert (report.succeeded, report.failed, report.retries) == (3, 1, 1)
+    assert report.throughput > 0
+
+
+def test_bulk_write_metadata_skip_unchanged(requests_mock):
+    """Test that the current values are read with the write's kwargs."""
+    view_id = str(uuid.uuid4())
+    unchanged_id, new_id = str(uuid.uuid4()), str(uuid.uuid4())
+    values = {"metadata_values": {"title": {"field_values": [{"value": "A"}]}}}
+    reads = {
+        object_id: requests_mock.get(
+            MetadataSpec.gen_url(f"assets/{object_id}/views/{view_id}/"), **response
+        )
+        for object_id, response in (
+            (unchanged_id, {"json": values}),
+            (new_id, {"status_code": 404, "json": {"errors": ["not found"]}}),
+        )
+    }
+    writes = {
+        object_id: requests_mock.put(
+            MetadataSpec.gen_url(
+                OBJECT_VIEW_METADATA_PATH.format("assets", object_id, view_id)
+            ),
+            json={"object_id": object_id},
+        )
+        for object_id in (unchanged_id, new_id)
+    }
+
+    client = PythonikClient(app_id="app", auth_token="token", timeout=3)
+    report = MetadataWriteReport()
+    results = {
+        r.object_id: r
+        for r in client.metadata().bulk_write_metadata(
+            [("assets", object_id, view_id, values) for object_id in writes],
+            requests_per_second=1000,
+            report=report,
+            skip_unchanged=True,
+            headers={"X-Trace": "import"},
+        )
+    }
+
+    assert results[unchanged_id].success and results[unchanged_id].skipped
+    assert results[unchanged_id].status_code is None
+    assert not writes[unchanged_id].called
+    assert results[new_id].success and not results[new_id].skipped
+    assert writes[new_id].last_request.json() == values
+    for read in reads.values():
+        assert read.call_count == 1
+        assert read.last_request.headers["X-Trace"] == "import"
+    assert (report.succeeded, report.skipped) == (2, 1)
+
+
+def test_update_asset_metadata_skip_unchanged(requests_mock):
+    """Test that unchanged fields are dropped and unchanged writes skipped."""
+    asset_id = str(uuid.uuid4())
+    view_id = str(uuid.uuid4())
+    current = {
+        "metadata_values": {
+            "title": {"field_values": [{"value": "A"}]},
+            "tags": {"field_values": [{"value": "x"}, {"value": "y"}]},
+        }
+    }
+    requests_mock.get(
+        MetadataSpec.gen_url(f"assets/{asset_id}/views/{view_id}/"), json=current
+    )
+    put = requests_mock.put(
+        MetadataSpec.gen_url(UPDATE_ASSET_METADATA.format(asset_id, view_id)),
+        json={"object_id": asset_id},
+    )
+    client = PythonikClient(app_id="app", auth_token="token", timeout=3)
+
+    # one changed field, one unchanged field and one empty field that is unset
+    update = {
+        "metadata_values": {
+            "title": {"field_values": [{"value": "B"}]},
+            "tags": {"field_values": [{"value": "x"}, {"value": "y"}]},
+            "notes": {"field_values": []},
+        }
+    }
+    result = client.metadata().update_asset_metadata(
+        asset_id, view_id, update, skip_unchanged=True
+    )
+    assert result.response.ok
+    assert put.call_count == 1
+    assert put.last_request.json() == {
+        "metadata_values": {"title": {"field_values": [{"value": "B"}]}}
+    }
+    assert client.metadata_stats.fields_skipped == 2
+
+    # a write matching the cached state makes no request at all
+    unchanged = UpdateMetadata.model_validate(current)
+    result = client.metadata().update_asset_metadata(
+        asset_id,
+        view_id,
+        unchanged,
+        skip_unchanged=True,
+        current=ViewMetadata.model_validate(current),
+    )
+    assert result.skipped
+    assert result.response.ok
+    assert result.response.status_code is None
+    assert result.data.metadata_values["title"] == current["metadata_values"]["title"]
+    assert put.call_count == 1
+    assert client.metadata_stats.writes_skipped == 1
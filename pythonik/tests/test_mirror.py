@@ -0,0 +1,82 @@
+import pytest
+import requests_mock
+
+from pythonik.client import PythonikClient
+from pythonik.mirror import LocalMirror
+from pythonik.models.assets.assets import Asset
+from pythonik.models.search.search_body import SearchBody
+from pythonik.specs.metadata import MetadataSpec
+from pythonik.specs.search import SEARCH_PATH, SearchSpec
+
+
+def _asset(object_id, title, day, collections=(), genre=None, status="ACTIVE"):
+    return {
+        "id": object_id,
+        "object_type": "assets",
+        "title": title,
+        "status": status,
+        "date_modified": f"2024-01-0{day}T00:00:00Z",
+        "in_collections": list(collections),
+        "metadata": {"genre": [genre]} if genre else {},
+        "_sort": [day, object_id],
+    }
+
+
+def test_sync_and_query():
+    with requests_mock.Mocker() as m:
+        pages = [
+            {
+                "objects": [
+                    _asset("a1", "Trailer One", 1, ["c1"], "drama"),
+                    _asset("a2", "Interview", 2, ["c1", "c2"], "news"),
+                ]
+            },
+            # incremental sync: a1 was renamed and left c1, a3 is new
+            {
+                "objects": [
+                    _asset("a1", "Trailer Final", 3, [], "drama"),
+                    _asset("a3", "Trailer Two", 3, ["c2"], "drama", "DELETED"),
+                ]
+            },
+        ]
+        search = m.post(SearchSpec.gen_url(SEARCH_PATH), [{"json": p} for p in pages])
+        client = PythonikClient(app_id="app", auth_token="token", timeout=3)
+        body = SearchBody(doc_types=["assets"])
+
+        with LocalMirror(indexed_fields=["genre"]) as mirror:
+            assert mirror.sync(client.search(), body, per_page=10) == 2
+            assert mirror.sync(client.search(), body, per_page=10) == 2
+            assert search.request_history[1].json()["search_after"] == [2, "a2"]
+
+            assert len(mirror) == 3
+            assert mirror.get("a1")["title"] == "Trailer Final"
+            assert mirror.get("missing") is None
+            assert mirror.collection_members("c1") == ["a2"]
+            assert [o["id"] for o in mirror.find(title_like="Trailer%")] == [
+                "a1",
+                "a3",
+            ]
+            drama = mirror.find(metadata={"genre": "drama"}, status="ACTIVE")
+            assert [o["id"] for o in drama] == ["a1"]
+            assert [o["id"] for o in mirror.find(collection_id="c2", limit=1)] == [
+                "a2"
+            ]
+            with pytest.raises(ValueError):
+                mirror.find(metadata={"mood": "calm"})
+
+
+def test_upsert_models_and_view_metadata():
+    with requests_mock.Mocker() as m:
+        values = {"metadata_values": {"genre": {"field_values": [{"value": "news"}]}}}
+        m.get(MetadataSpec.gen_url("assets/a1/views/v1/"), json=values)
+        client = PythonikClient(app_id="app", auth_token="token", timeout=3)
+
+        with LocalMirror(indexed_fields=["genre"]) as mirror:
+            mirror.upsert([Asset(id="a1", title="From get", in_collections=["c9"])])
+            mirror.load_view_metadata(client.metadata(), [("assets", "a1", "v1")])
+
+            assert mirror.find(title="From get")[0]["id"] == "a1"
+            assert mirror.collection_members("c9") == ["a1"]
+            view_metadata = mirror.get_view_metadata("a1", "v1")
+            assert view_metadata.metadata_values["genre"].field_values[0].value == "news"
+            assert mirror.get_view_metadata("a1", "v2") is None
@@ -0,0 +1,125 @@
+import requests
+import requests_mock
+
+from pythonik.cache import SchemaCache
+from pythonik.client import PythonikClient
+from pythonik.paging import AdaptivePageSize
+from pythonik.specs.assets import GET_SEGMENTS_URL, AssetSpec
+from pythonik.specs.metadata import FIELDS_BASE_PATH, MetadataSpec
+from pythonik.specs.search import SEARCH_PATH, SearchSpec
+
+
+def _client():
+    return PythonikClient(app_id="app", auth_token="token", timeout=3)
+
+
+def test_cursor_mode_grows_towards_target():
+    pager = AdaptivePageSize(initial=100, minimum=10, maximum=1000, target_seconds=1.0)
+
+    # 1 ms per object: 1000 objects would take a second, growth is capped at 2x
+    assert pager.observe(0.1, 10_000, 100) == 200
+    assert pager.observe(0.2, 20_000, 200) == 400
+    assert pager.observe(0.4, 40_000, 400) == 800
+    assert pager.observe(0.8, 80_000, 800) == 1000
+    # slow pages shrink straight to the target
+    assert pager.observe(5.0, 100_000, 1000) == 200
+
+
+def test_byte_cap_limits_page_size():
+    pager = AdaptivePageSize(initial=100, maximum=1000, max_page_bytes=50_000)
+    # fast, but 1 KB per object
+    assert pager.observe(0.01, 100_000, 100) == 50
+
+
+def test_page_mode_keeps_offset_aligned():
+    pager = AdaptivePageSize(initial=100, minimum=10, maximum=1000)
+    # next offset 100 is not a multiple of 200
+    assert pager.observe(0.01, 1000, 100, offset=100) == 100
+    assert pager.observe(0.01, 1000, 100, offset=200) == 200
+    assert pager.observe(0.01, 1000, 200, offset=400) == 400
+    # halving always keeps the offset aligned
+    assert pager.observe(10.0, 1000, 400, offset=800) == 50
+
+
+def test_shrink_on_timeout():
+    pager = AdaptivePageSize(initial=40, minimum=10)
+    assert pager.shrink() and pager.size == 20
+    assert pager.shrink() and pager.size == 10
+    assert not pager.shrink()
+    assert pager.timeouts == 3
+    assert not AdaptivePageSize.fixed(50).shrink()
+
+
+def test_iter_pages_backs_off_on_timeout():
+    objects = [{"id": str(i), "_sort": [i]} for i in range(30)]
+
+    def callback(request, context):
+        per_page = int(request.qs["per_page"][0])
+        if per_page > 10:
+            raise requests.exceptions.ReadTimeout("slow page")
+        start = (request.json().get("search_after") or [-1])[0] + 1
+        return {"objects": objects[start : start + per_page]}
+
+    with requests_mock.Mocker() as m:
+        m.post(SearchSpec.gen_url(SEARCH_PATH), json=callback)
+        pager = AdaptivePageSize(initial=40, minimum=5, maximum=40, target_seconds=1e-9)
+        pages = list(
+            _client().search().iter_pages({"sort": [{"name": "id"}]}, per_page=pager)
+        )
+
+    assert [o["id"] for page in pages for o in page] == [o["id"] for o in objects]
+    assert pager.timeouts == 2
+
+
+def test_iter_segments_adapts_page_size_with_page_numbers():
+    segments = [{"id": f"segment-{i}"} for i in range(70)]
+    requested = []
+
+    def callback(request, context):
+        per_page = int(request.qs["per_page"][0])
+        page = int(request.qs["page"][0])
+        requested.append((page, per_page))
+        assert request.qs["segment_type"] == ["marker"]
+        assert request.headers["X-Trace"] == "segments"
+        start = (page - 1) * per_page
+        return {"objects": segments[start : start + per_page], "pages": -(-70 // per_page)}
+
+    with requests_mock.Mocker() as m:
+        m.get(AssetSpec.gen_url(GET_SEGMENTS_URL.format("asset")), json=callback)
+        pager = AdaptivePageSize(initial=10, minimum=10, maximum=40, target_seconds=60)
+        pages = list(
+            _client().assets().iter_segments(
+                "asset",
+                per_page=pager,
+                params={"segment_type": "MARKER"},
+                headers={"X-Trace": "segments"},
+            )
+        )
+
+    assert [s.id for page in pages for s in page] == [s["id"] for s in segments]
+    # grows only at offsets that are multiples of the new size
+    assert requested == [(1, 10), (2, 10), (2, 20), (2, 40)]
+
+
+def test_iter_fields_follows_last_field_name():
+    fields = [{"name": f"field{i:02d}", "label": f"Field {i}"} for i in range(25)]
+
+    def callback(request, context):
+        per_page = int(request.qs["per_page"][0])
+        last = request.qs.get("last_field_name", [None])[0]
+        start = 0 if last is None else [f["name"] for f in fields].index(last) + 1
+        return {"objects": fields[start : start + per_page]}
+
+    with requests_mock.Mocker() as m:
+        listing = m.get(MetadataSpec.gen_url(FIELDS_BASE_PATH), json=callback)
+        client = PythonikClient(
+            app_id="app", auth_token="token", timeout=3, schema_cache=SchemaCache()
+        )
+        pages = list(client.metadata().iter_fields(per_page=10))
+        # the second listing is served by the schema cache
+        again = list(client.metadata().iter_fields(per_page=10))
+
+    assert [len(page) for page in pages] == [10, 10, 5]
+    assert pages[-1][-1].name == "field24"
+    assert again == pages
+    assert listing.call_count == 3
@@ -0,0 +1,90 @@
+import json
+from datetime import date
+
+import pytest
+import requests_mock
+
+from pythonik.client import PythonikClient
+from pythonik.models.search.search_body import SearchBody
+from pythonik.query import CompiledSearch, Q
+from pythonik.specs.search import SEARCH_PATH, SearchSpec
+
+
+def test_q_combines_and_flattens():
+    f = (
+        Q.term("status", "ACTIVE")
+        & Q.range("date_created", min=date(2024, 1, 1))
+        & (Q.term("media_type", "video") | Q.term("media_type", "image"))
+    )
+
+    assert f.to_filter() == {
+        "operator": "AND",
+        "terms": [
+            {"name": "status", "value": "ACTIVE"},
+            {"name": "date_created", "range": {"min": "2024-01-01"}},
+        ],
+        "filters": [
+            {
+                "operator": "OR",
+                "terms": [
+                    {"name": "media_type", "value": "video"},
+                    {"name": "media_type", "value": "image"},
+                ],
+            }
+        ],
+    }
+
+
+def test_compiled_search_is_frozen_and_matches_search_body():
+    compiled = Q.term("status", value_in=["ACTIVE", "CLOSED"]).compile(
+        doc_types=["assets"], sort=[{"name": "id", "order": "asc"}]
+    )
+
+    assert compiled["doc_types"] == ["assets"]
+    assert SearchBody.model_validate(dict(compiled)).filter.terms[0].value_in == [
+        "ACTIVE",
+        "CLOSED",
+    ]
+    with pytest.raises(AttributeError):
+        compiled.json = "{}"
+    with pytest.raises(TypeError):
+        compiled["query"] = "x"
+
+    assert json.loads(compiled.encode()) == dict(compiled)
+    patched = json.loads(compiled.encode(["a", 1]))
+    assert patched == {**compiled, "search_after": ["a", 1]}
+    assert json.loads(CompiledSearch({}).encode([1])) == {"search_after": [1]}
+
+
+def test_compiled_search_copies_its_body():
+    body = {"query": "one"}
+    compiled = CompiledSearch(body)
+    body["query"] = "two"
+    assert compiled["query"] == "one"
+
+
+def test_search_and_iter_pages_send_compiled_body():
+    compiled = Q.term("status", "ACTIVE").compile(
+        doc_types=["assets"], sort=[{"name": "id", "order": "asc"}]
+    )
+    with requests_mock.Mocker() as m:
+        matcher = m.post(
+            SearchSpec.gen_url(SEARCH_PATH),
+            [
+                {"json": {"objects": [{"id": "a", "_sort": ["a"]}]}},
+                {"json": {"objects": [{"id": "a", "_sort": ["a"]}, {"id": "b", "_sort": ["b"]}]}},
+                {"json": {"objects": [{"id": "c", "_sort": ["c"]}]}},
+            ],
+        )
+        client = PythonikClient(app_id="app", auth_token="token", timeout=3)
+
+        result = client.search().search(compiled, per_page=2)
+        assert result.data.objects[0].id == "a"
+        assert m.last_request.headers["Content-Type"] == "application/json"
+        assert m.last_request.json() == dict(compiled)
+
+        pages = list(client.search().iter_pages(compiled, per_page=2))
+        assert [[o["id"] for o in page] for page in pages] == [["a", "b"], ["c"]]
+        bodies = [r.json() for r in matcher.request_history[1:]]
+        assert "search_after" not in bodies[0]
+        assert bodies[1] == {**compiled, "search_after": ["b"]}
@@ -0,0 +1,165 @@
+import json
+import uuid
+
+from pythonik.cache import SchemaCache
+from pythonik.client import PythonikClient
+from pythonik.models.metadata.fields import FieldResponse, FieldUpdate
+from pythonik.models.metadata.view_responses import ViewResponse
+from pythonik.models.metadata.views import UpdateViewRequest, ViewField
+from pythonik.specs.metadata import (
+    FIELD_BY_NAME_PATH,
+    FIELDS_BASE_PATH,
+    GET_VIEW_PATH,
+    MetadataSpec,
+)
+
+
+def _view(view_id, name="Test View"):
+    return ViewResponse(
+        id=view_id,
+        name=name,
+        date_created="2024-12-20T18:40:03.279Z",
+        date_modified="2024-12-20T18:40:03.279Z",
+        view_fields=[ViewField(name="field1", label="Field 1", field_type="string")],
+    ).model_dump()
+
+
+def _field(name, label="Label"):
+    return json.loads(
+        FieldResponse(
+            name=name,
+            label=label,
+            field_type="string",
+            date_created="2024-01-01T00:00:00Z",
+            date_modified="2024-01-01T00:00:00Z",
+        ).model_dump_json()
+    )
+
+
+def _client(cache):
+    return PythonikClient(
+        app_id=str(uuid.uuid4()),
+        auth_token=str(uuid.uuid4()),
+        timeout=3,
+        schema_cache=cache,
+    )
+
+
+def test_get_view_served_from_cache(requests_mock):
+    view_id = str(uuid.uuid4())
+    cache = SchemaCache(ttl=60)
+    mock_address = MetadataSpec.gen_url(GET_VIEW_PATH.format(view_id=view_id))
+    requests_mock.get(mock_address, json=_view(view_id))
+
+    client = _client(cache)
+    first = client.metadata().get_view(view_id)
+    second = client.metadata().get_view(view_id)
+
+    assert requests_mock.call_count == 1
+    assert second.data.id == view_id
+    assert second.data is first.data
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_expired_entry_is_fetched_again(requests_mock):
+    field_name = "cached_field"
+    cache = SchemaCache(ttl=0)
+    mock_address = MetadataSpec.gen_url(FIELD_BY_NAME_PATH.format(field_name=field_name))
+    requests_mock.get(mock_address, json=_field(field_name))
+
+    client = _client(cache)
+    client.metadata().get_field(field_name)
+    client.metadata().get_field(field_name)
+
+    assert requests_mock.call_count == 2
+    assert cache.misses == 2
+
+
+def test_expired_entry_revalidated_with_etag(requests_mock):
+    view_id = str(uuid.uuid4())
+    cache = SchemaCache(ttl=0, revalidate=True)
+    mock_address = MetadataSpec.gen_url(GET_VIEW_PATH.format(view_id=view_id))
+    requests_mock.get(
+        mock_address,
+        [
+            {"json": _view(view_id), "headers": {"ETag": '"v1"'}},
+            {"status_code": 304},
+        ],
+    )
+
+    client = _client(cache)
+    client.metadata().get_view(view_id)
+    result = client.metadata().get_view(view_id)
+
+    assert requests_mock.call_count == 2
+    assert requests_mock.request_history[1].headers["If-None-Match"] == '"v1"'
+    assert result.response.ok
+    assert result.data.id == view_id
+    assert cache.revalidations == 1
+
+
+def test_update_view_invalidates_cache(requests_mock):
+    view_id = str(uuid.uuid4())
+    cache = SchemaCache(ttl=60)
+    mock_address = MetadataSpec.gen_url(GET_VIEW_PATH.format(view_id=view_id))
+    requests_mock.get(
+        mock_address,
+        [{"json": _view(view_id)}, {"json": _view(view_id, "Renamed")}],
+    )
+    requests_mock.patch(mock_address, json=_view(view_id, "Renamed"))
+
+    client = _client(cache)
+    client.metadata().get_view(view_id)
+    client.metadata().update_view(view_id, UpdateViewRequest(name="Renamed"))
+    result = client.metadata().get_view(view_id)
+
+    assert result.data.name == "Renamed"
+    assert len(requests_mock.request_history) == 3
+
+
+def test_update_field_invalidates_fields_and_views(requests_mock):
+    view_id = str(uuid.uuid4())
+    field_name = "field1"
+    cache = SchemaCache(ttl=60)
+    requests_mock.get(
+        MetadataSpec.gen_url(GET_VIEW_PATH.format(view_id=view_id)), json=_view(view_id)
+    )
+    field_address = MetadataSpec.gen_url(FIELD_BY_NAME_PATH.format(field_name=field_name))
+    requests_mock.get(field_address, json=_field(field_name))
+    requests_mock.put(field_address, json=_field(field_name, "New"))
+    requests_mock.get(
+        MetadataSpec.gen_url(FIELDS_BASE_PATH),
+        json={"objects": [_field(field_name)], "per_page": 10},
+    )
+
+    client = _client(cache)
+    client.metadata().get_view(view_id)
+    client.metadata().get_field(field_name)
+    client.metadata().list_fields(per_page=10)
+    assert len(cache) == 3
+
+    client.metadata().update_field(field_name, FieldUpdate(label="New"))
+
+    assert len(cache) == 0
+
+
+def test_create_field_with_dict_body(requests_mock):
+    field_name = "field1"
+    requests_mock.post(MetadataSpec.gen_url(FIELDS_BASE_PATH), json=_field(field_name))
+    requests_mock.get(
+        MetadataSpec.gen_url(FIELDS_BASE_PATH), json={"objects": [], "per_page": 10}
+    )
+
+    body = {"name": field_name, "label": "Label", "field_type": "string"}
+    result = _client(None).metadata().create_field(body)
+    assert result.data.name == field_name
+
+    # the cached listing without the new field is dropped
+    cache = SchemaCache(ttl=60)
+    client = _client(cache)
+    client.metadata().list_fields(per_page=10)
+    assert len(cache) == 1
+    client.metadata().create_field(body)
+
+    assert len(cache) == 0
+    assert requests_mock.last_request.json() == body
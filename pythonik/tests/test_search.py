@@ -4,8 +4,11 @@ import requests_mock
 # from urllib.parse import parse_qs # Unused import removed
 
 from pythonik.client import PythonikClient
+from pythonik.exceptions import ChangeFeedError
+from pythonik.models.search.profile import SearchProfile
 from pythonik.models.search.search_body import Filter, SearchBody, SortItem, Term
 from pythonik.specs.search import SEARCH_PATH, SearchSpec
+from pythonik.watermarks import FileWatermarkStore, MemoryWatermarkStore, WatermarkStore
 
 # Unused imports removed by Cascade:
 # from pythonik.models.metadata.views import ViewMetadata
@@ -121,3 +124,185 @@ def test_search_with_various_query_params(test_id, query_params, expected_qs_dic
 
         assert matcher.called_once
         assert m.last_request.qs == expected_qs_dict
+
+
+def test_changes_resumes_from_watermark(tmp_path):
+    """Test the change feed saves a watermark and continues from it."""
+    def obj(object_id, day):
+        return {
+            "id": object_id,
+            "date_modified": f"2024-01-0{day}T00:00:00Z",
+            "_sort": [day, object_id],
+        }
+
+    with requests_mock.Mocker() as m:
+        # b and c share a timestamp across the page boundary
+        first_run = [{"objects": [obj("a", 1), obj("b", 2)]}, {"objects": [obj("c", 2)]}]
+        second_run = [{"objects": [obj("d", 3)]}]
+        matcher = m.post(
+            SearchSpec.gen_url(SEARCH_PATH),
+            [{"json": page} for page in first_run + second_run],
+        )
+        store = FileWatermarkStore(str(tmp_path / "watermarks.json"))
+        client = PythonikClient(app_id="app", auth_token="token", timeout=3)
+        body = SearchBody(
+            doc_types=["assets"],
+            filter=Filter(operator="AND", terms=[Term(name="status", value="ACTIVE")]),
+        )
+
+        seen = [o["id"] for o in client.search().changes(body, store, per_page=2)]
+        assert seen == ["a", "b", "c"]
+        assert store.load("default").search_after == [2, "c"]
+        first_body = matcher.request_history[0].json()
+        assert first_body["sort"][0] == {"name": "date_modified", "order": "asc"}
+        assert first_body["filter"]["terms"][0]["name"] == "status"
+
+        seen = [o["id"] for o in client.search().changes(body, store, per_page=2)]
+        assert seen == ["d"]
+        resumed_body = matcher.request_history[2].json()
+        assert resumed_body["search_after"] == [2, "c"]
+        assert resumed_body["filter"]["terms"] == [
+            {"name": "date_modified", "range": {"min": "2024-01-02T00:00:00Z"}}
+        ]
+        assert resumed_body["filter"]["filters"][0]["terms"][0]["value"] == "ACTIVE"
+        assert store.load("default").object_id == "d"
+
+
+def test_changes_keeps_watermark_fields_and_needs_sort_values():
+    """Test the feed requests its watermark fields and refuses pages without _sort."""
+    with requests_mock.Mocker() as m:
+        matcher = m.post(
+            SearchSpec.gen_url(SEARCH_PATH),
+            [
+                {"json": {"objects": [{"id": "a", "date_modified": "2024-01-01", "_sort": [1, "a"]}]}},
+                {"json": {"objects": []}},
+                {"json": {"objects": [{"id": "b", "date_modified": "2024-01-02"}]}},
+            ],
+        )
+        store = MemoryWatermarkStore()
+        client = PythonikClient(app_id="app", auth_token="token", timeout=3)
+
+        body = {"doc_types": ["assets"], "include_fields": ["id", "title"]}
+        seen = [o["id"] for o in client.search().changes(body, store, per_page=1)]
+        assert seen == ["a"]
+        assert matcher.last_request.json()["include_fields"] == ["id", "title", "date_modified"]
+
+        with pytest.raises(ChangeFeedError):
+            list(client.search().changes(body, store, per_page=1))
+        assert store.load("default").search_after == [1, "a"]
+
+
+def test_watermark_store_requires_load_and_save():
+    """Test an incomplete WatermarkStore fails when it is created."""
+
+    class LoadOnly(WatermarkStore):
+        def load(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        LoadOnly()
+
+
+def test_count_and_facets():
+    """Test count and facets send a minimal search and skip the objects."""
+    with requests_mock.Mocker() as m:
+        matcher = m.post(
+            SearchSpec.gen_url(SEARCH_PATH),
+            json={
+                "objects": [{"id": "not-a-valid-object", "files": "ignored"}],
+                "total": 42,
+                "facets": {
+                    "media_type": {
+                        "buckets": [
+                            {"key": "video", "doc_count": 40},
+                            {"key": "image", "doc_count": 2},
+                        ],
+                        "sum_other_doc_count": 0,
+                    }
+                },
+            },
+        )
+        client = PythonikClient(app_id="app", auth_token="token", timeout=3)
+        body = {"doc_types": ["assets"], "query": "trailer", "sort": [{"name": "title"}]}
+
+        resp = client.search().count(body)
+        assert resp.response.ok
+        assert resp.data.total == 42
+        qs = m.last_request.qs
+        assert qs["per_page"] == ["1"]
+        assert qs["generate_signed_url"] == ["false"]
+        assert qs["save_search_history"] == ["false"]
+        sent = m.last_request.json()
+        assert sent["include_fields"] == ["id"]
+        assert "sort" not in sent and "facets" not in sent
+
+        facets = client.search().facets(body, ["media_type"]).data
+        assert facets.total == 42
+        buckets = facets.facets["media_type"].buckets
+        assert [(b.key, b.doc_count) for b in buckets] == [("video", 40), ("image", 2)]
+        assert m.last_request.json()["facets"] == ["media_type"]
+        assert body == {"doc_types": ["assets"], "query": "trailer", "sort": [{"name": "title"}]}
+        assert matcher.call_count == 2
+
+
+def test_count_and_facets_failed_search():
+    """Test a failed count or facets search returns its response without data."""
+    with requests_mock.Mocker() as m:
+        m.post(
+            SearchSpec.gen_url(SEARCH_PATH),
+            status_code=500,
+            json={"errors": ["search unavailable"]},
+        )
+        client = PythonikClient(app_id="app", auth_token="token", timeout=3)
+        body = {"doc_types": ["assets"]}
+
+        counted = client.search().count(body)
+        assert counted.response.status_code == 500
+        assert counted.data is None
+
+        faceted = client.search().facets(body, ["media_type"])
+        assert faceted.response.status_code == 500
+        assert faceted.data is None
+
+
+def test_search_profile_defaults_and_overrides():
+    """Test a client search profile applies unless a call opts back in."""
+    with requests_mock.Mocker() as m:
+        m.post(SearchSpec.gen_url(SEARCH_PATH), json={"objects": []})
+        client = PythonikClient(
+            app_id="app",
+            auth_token="token",
+            timeout=3,
+            search_profile=SearchProfile.lean(include_fields=["id", "title"]),
+        )
+
+        client.search().search({"query": "x"})
+        assert m.last_request.qs == {
+            "generate_signed_url": ["false"],
+            "generate_signed_download_url": ["false"],
+            "generate_signed_proxy_url": ["false"],
+            "save_search_history": ["false"],
+        }
+        assert m.last_request.json()["include_fields"] == ["id", "title"]
+
+        client.search().search(
+            {"query": "x", "include_fields": ["files"]},
+            generate_signed_download_url=True,
+            save_search_history=True,
+        )
+        assert m.last_request.qs["generate_signed_download_url"] == ["true"]
+        assert m.last_request.qs["save_search_history"] == ["true"]
+        assert m.last_request.qs["generate_signed_url"] == ["false"]
+        assert m.last_request.json()["include_fields"] == ["files"]
+
+        list(
+            client.search().iter_pages(
+                {"query": "x"},
+                params={"generate_signed_url": True},
+                headers={"X-Trace": "export"},
+            )
+        )
+        assert m.last_request.qs["generate_signed_url"] == ["true"]
+        assert m.last_request.qs["save_search_history"] == ["false"]
+        assert m.last_request.headers["X-Trace"] == "export"
+        assert m.last_request.headers["Content-Type"] == "application/json"
@@ -0,0 +1,183 @@
+import json
+import threading
+import time
+import uuid
+
+from pythonik.cache import SearchCache, search_cache_key, signed_url_expiry
+from pythonik.client import PythonikClient
+from pythonik.models.search.search_body import SearchBody
+from pythonik.specs.search import SEARCH_PATH, SearchSpec
+
+
+def _client(cache):
+    return PythonikClient(
+        app_id=str(uuid.uuid4()),
+        auth_token=str(uuid.uuid4()),
+        timeout=3,
+        search_cache=cache,
+    )
+
+
+def _results(*titles, url=None):
+    objects = []
+    for title in titles:
+        obj = {"id": str(uuid.uuid4()), "title": title, "object_type": "assets"}
+        if url:
+            obj["proxy_url"] = url
+        objects.append(obj)
+    return {"objects": objects, "total": len(objects), "page": 1, "pages": 1}
+
+
+def test_cache_key_ignores_key_order():
+    a = search_cache_key({"query": "x", "doc_types": ["assets"]}, {"page": 1, "per_page": 10})
+    b = search_cache_key({"doc_types": ["assets"], "query": "x"}, {"per_page": 10, "page": 1})
+    c = search_cache_key({"doc_types": ["assets"], "query": "x"}, {"per_page": 10, "page": 2})
+    assert a == b
+    assert a != c
+
+
+def test_cache_is_not_shared_between_credentials(requests_mock):
+    cache = SearchCache(ttl=60)
+    mock = requests_mock.post(
+        SearchSpec.gen_url(SEARCH_PATH),
+        [{"json": _results("first")}, {"json": _results("second")}],
+    )
+    body = {"query": "one", "doc_types": ["assets"]}
+
+    first = _client(cache).search().search(body, generate_signed_url=False)
+    second = _client(cache).search().search(body, generate_signed_url=False)
+
+    assert mock.call_count == 2
+    assert mock.request_history[0].headers["Auth-Token"] != mock.request_history[1].headers["Auth-Token"]
+    assert first.data.objects[0].title == "first"
+    assert second.data.objects[0].title == "second"
+
+
+def test_signed_url_expiry():
+    gcs = (
+        "https://storage.googleapis.com/b/o?X-Goog-Algorithm=GOOG4-RSA-SHA256"
+        "&X-Goog-Date=20240101T000000Z&X-Goog-Expires=3600&X-Goog-Signature=abc"
+    )
+    cloudfront = "https://cdn.example.com/o.mp4?Expires=1704060000&Signature=abc"
+    assert signed_url_expiry(gcs) == 1704067200 + 3600
+    assert signed_url_expiry(f'["{gcs}", "{cloudfront}"]') == 1704060000
+    assert signed_url_expiry("https://example.com/plain") is None
+
+
+def test_identical_searches_served_from_cache(requests_mock):
+    client = _client(SearchCache(ttl=60))
+    mock = requests_mock.post(
+        SearchSpec.gen_url(SEARCH_PATH), json=_results("one", "two")
+    )
+
+    body = SearchBody(doc_types=["assets"], query="one")
+    first = client.search().search(body, per_page=10, generate_signed_url=False)
+    second = client.search().search(
+        {"query": "one", "doc_types": ["assets"]}, per_page=10, generate_signed_url=False
+    )
+
+    assert mock.call_count == 1
+    assert second.data is first.data
+    assert client.search_cache.hits == 1
+
+    client.search().search(body, per_page=10, page=2, generate_signed_url=False)
+    client.search().search(body, per_page=10, generate_signed_url=False, use_cache=False)
+    assert mock.call_count == 3
+
+
+def test_errors_are_not_cached(requests_mock):
+    client = _client(SearchCache(ttl=60))
+    mock = requests_mock.post(
+        SearchSpec.gen_url(SEARCH_PATH),
+        [{"status_code": 500, "json": {}}, {"json": _results("one")}],
+    )
+
+    body = SearchBody(query="one")
+    assert client.search().search(body, generate_signed_url=False).response.status_code == 500
+    assert client.search().search(body, generate_signed_url=False).response.ok
+    assert mock.call_count == 2
+
+
+def test_expired_entries_are_refetched(requests_mock):
+    client = _client(SearchCache(ttl=0.05))
+    mock = requests_mock.post(SearchSpec.gen_url(SEARCH_PATH), json=_results("one"))
+
+    body = SearchBody(query="one")
+    client.search().search(body, generate_signed_url=False)
+    time.sleep(0.1)
+    client.search().search(body, generate_signed_url=False)
+
+    assert mock.call_count == 2
+
+
+def test_signed_urls_shorten_ttl(requests_mock):
+    cache = SearchCache(ttl=3600, signed_url_ttl=3600)
+    client = _client(cache)
+    # expires 3 seconds from now, inside the safety margin
+    url = f"https://cdn.example.com/o.mp4?Expires={int(time.time()) + 3}&Signature=x"
+    mock = requests_mock.post(
+        SearchSpec.gen_url(SEARCH_PATH), json=_results("one", url=url)
+    )
+
+    body = SearchBody(query="one")
+    client.search().search(body, generate_signed_proxy_url=True)
+    client.search().search(body, generate_signed_proxy_url=True)
+
+    assert mock.call_count == 2
+    assert len(cache) == 0
+
+
+def test_lru_eviction_by_size(requests_mock):
+    response = _results("x" * 100)
+    size = len(json.dumps(response))
+    cache = SearchCache(ttl=60, max_bytes=size * 2 + size // 2)
+    client = _client(cache)
+    mock = requests_mock.post(SearchSpec.gen_url(SEARCH_PATH), json=response)
+
+    for query in ("a", "b", "a", "c"):
+        client.search().search(SearchBody(query=query), generate_signed_url=False)
+
+    assert len(cache) == 2
+    assert cache.bytes == size * 2
+    # "a" was used after "b", so "b" was evicted to make room for "c"
+    client.search().search(SearchBody(query="a"), generate_signed_url=False)
+    assert mock.call_count == 3
+    client.search().search(SearchBody(query="b"), generate_signed_url=False)
+    assert mock.call_count == 4
+
+
+def test_concurrent_identical_searches_share_one_request(requests_mock):
+    cache = SearchCache(ttl=60)
+    client = _client(cache)
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_response(request, context):
+        started.set()
+        release.wait(5)
+        return _results("one")
+
+    mock = requests_mock.post(SearchSpec.gen_url(SEARCH_PATH), json=slow_response)
+    body = SearchBody(query="one")
+    results = []
+
+    def search():
+        results.append(client.search().search(body, generate_signed_url=False))
+
+    leader = threading.Thread(target=search)
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=search) for _ in range(3)]
+    for thread in followers:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while cache.shared < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    release.set()
+    assert cache.shared == 3
+    for thread in [leader, *followers]:
+        thread.join(5)
+
+    assert mock.call_count == 1
+    assert len(results) == 4
+    assert all(result.data is results[0].data for result in results)
@@ -0,0 +1,124 @@
+import uuid
+
+import pytest
+
+from pythonik.cache import SchemaCache
+from pythonik.client import PythonikClient
+from pythonik.exceptions import MetadataValidationError
+from pythonik.models.metadata.fields import FieldOption, FieldResponse
+from pythonik.models.metadata.view_responses import ViewResponse
+from pythonik.models.metadata.views import ViewField, ViewOption
+from pythonik.specs.metadata import (
+    GET_VIEW_PATH,
+    OBJECT_VIEW_METADATA_PATH,
+    MetadataSpec,
+)
+from pythonik.validation import validate_metadata_values
+
+
+def _values(**fields):
+    return {
+        name: {"field_values": [{"value": value} for value in values]}
+        for name, values in fields.items()
+    }
+
+
+FIELDS = {
+    "count": FieldResponse(name="count", field_type="integer", min_value=0, max_value=10),
+    "ratio": FieldResponse(name="ratio", field_type="float"),
+    "status": FieldResponse(
+        name="status",
+        field_type="drop_down",
+        options=[
+            FieldOption(label="New", value="new"),
+            FieldOption(label="Done", value="done"),
+        ],
+    ),
+    "tags": FieldResponse(name="tags", field_type="tag_cloud", multi=True),
+    "title": FieldResponse(name="title", field_type="string", required=True),
+    "shot_on": FieldResponse(name="shot_on", field_type="date"),
+    "contact": FieldResponse(name="contact", field_type="email"),
+}
+
+
+def test_valid_values():
+    values = _values(
+        count=[3],
+        ratio=["0.5"],
+        status=["done"],
+        tags=["a", "b"],
+        title=["A title"],
+        shot_on=["2024-05-01"],
+        contact=["someone@example.com"],
+    )
+    assert validate_metadata_values(values, FIELDS) == []
+
+
+@pytest.mark.parametrize(
+    "values, error",
+    [
+        (_values(count=["three"]), "count: 'three' is not a valid integer"),
+        (_values(count=[11]), "count: 11 is above 10.0"),
+        (_values(count=[-1]), "count: -1 is below 0.0"),
+        (_values(status=["lost"]), "status: 'lost' is not one of the field's options"),
+        (_values(title=["a", "b"]), "title: field takes a single value, got 2"),
+        (_values(title=[]), "title: field is required"),
+        (_values(shot_on=["yesterday"]), "shot_on: 'yesterday' is not a valid date"),
+        (_values(contact=["nobody"]), "contact: 'nobody' is not a valid email"),
+        (_values(missing=["x"]), "missing: unknown field"),
+    ],
+)
+def test_invalid_values(values, error):
+    assert validate_metadata_values(values, FIELDS) == [error]
+
+
+def test_update_object_metadata_validates_against_view(requests_mock):
+    view_id = str(uuid.uuid4())
+    asset_id = str(uuid.uuid4())
+    view = ViewResponse(
+        id=view_id,
+        name="View",
+        date_created="2024-01-01",
+        date_modified="2024-01-01",
+        view_fields=[
+            ViewField(
+                name="status",
+                field_type="drop_down",
+                options=[ViewOption(label="New", value="new")],
+            )
+        ],
+    )
+    get_view = requests_mock.get(
+        MetadataSpec.gen_url(GET_VIEW_PATH.format(view_id=view_id)),
+        json=view.model_dump(),
+    )
+    put = requests_mock.put(
+        MetadataSpec.gen_url(
+            OBJECT_VIEW_METADATA_PATH.format("assets", asset_id, view_id)
+        ),
+        json={"object_id": asset_id},
+    )
+    client = PythonikClient(
+        app_id="app", auth_token="token", timeout=3, schema_cache=SchemaCache()
+    )
+
+    with pytest.raises(MetadataValidationError) as error:
+        client.metadata().update_object_metadata(
+            "assets",
+            asset_id,
+            view_id,
+            {"metadata_values": _values(status=["lost"])},
+            validate=True,
+        )
+    assert error.value.errors == ["status: 'lost' is not one of the field's options"]
+    assert put.call_count == 0
+
+    # invalid bulk items fail locally, valid ones are written
+    items = [
+        ("assets", asset_id, view_id, {"metadata_values": _values(status=[value])})
+        for value in ("new", "x")
+    ]
+    results = list(client.metadata().bulk_write_metadata(items, validate=True))
+    assert sorted(result.success for result in results) == [False, True]
+    assert put.call_count == 1
+    assert get_view.call_count == 1
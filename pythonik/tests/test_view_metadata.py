@@ -123,3 +123,20 @@ def test_view_metadata_init_with_empty_values():
     assert view_metadata.metadata_values["field1"].field_values == []
     # The None value is preserved as None (not converted to empty list)
     assert view_metadata.metadata_values["field2"].field_values is None
+
+
+def test_view_metadata_model_validate_with_legacy_format():
+    """Test that model_validate, as used for API responses, converts the legacy format."""
+    # Arrange
+    data = {f"field{i}": {"values": [{"value": i}]} for i in range(250)}
+    data["object_id"] = "123"
+
+    # Act
+    view_metadata = ViewMetadata.model_validate(data)
+
+    # Assert
+    assert view_metadata.object_id == "123"
+    assert len(view_metadata.metadata_values.root) == 250
+    assert view_metadata.metadata_values["field249"].field_values[0].value == 249
+    # the input is left untouched
+    assert "metadata_values" not in data
@@ -0,0 +1,112 @@
+import uuid
+
+from pythonik.client import PythonikClient
+from pythonik.specs.metadata import (
+    ASSET_OBJECT_VIEW_PATH,
+    UPDATE_ASSET_METADATA,
+    MetadataSpec,
+)
+from pythonik.write_buffer import MetadataWriteBuffer
+
+
+def _values(**fields):
+    return {
+        "metadata_values": {
+            name: {"field_values": [{"value": value}]} for name, value in fields.items()
+        }
+    }
+
+
+def test_updates_coalesced_into_one_put(requests_mock):
+    asset_id = str(uuid.uuid4())
+    view_id = str(uuid.uuid4())
+    put = requests_mock.put(
+        MetadataSpec.gen_url(UPDATE_ASSET_METADATA.format(asset_id, view_id)),
+        json={"object_id": asset_id},
+    )
+    client = PythonikClient(app_id="app", auth_token="token", timeout=3)
+
+    with MetadataWriteBuffer(client.metadata(), window=60) as buffer:
+        first = buffer.update_asset_metadata(asset_id, view_id, _values(title="A"))
+        second = buffer.update_asset_metadata(asset_id, view_id, _values(status="new"))
+        third = buffer.update_asset_metadata(asset_id, view_id, _values(title="B"))
+        assert put.call_count == 0
+        assert len(buffer) == 1
+
+    assert put.call_count == 1
+    assert put.last_request.json() == _values(title="B", status="new")
+    assert first.result().response.ok
+    assert first.result() is third.result() is second.result()
+    assert client.metadata_stats.writes_coalesced == 2
+
+
+def test_write_sent_after_window(requests_mock):
+    asset_id = str(uuid.uuid4())
+    segment_id = str(uuid.uuid4())
+    view_id = str(uuid.uuid4())
+    put = requests_mock.put(
+        MetadataSpec.gen_url(
+            ASSET_OBJECT_VIEW_PATH.format(asset_id, "segments", segment_id, view_id)
+        ),
+        json={"object_id": segment_id},
+    )
+    client = PythonikClient(app_id="app", auth_token="token", timeout=3)
+    buffer = MetadataWriteBuffer(client.metadata(), window=0.01)
+    try:
+        future = buffer.put_object_view_metadata(
+            asset_id, "segments", segment_id, view_id, _values(title="A")
+        )
+        assert future.result(timeout=5).response.ok
+        assert put.call_count == 1
+    finally:
+        buffer.close()
+
+
+def test_full_buffer_sends_oldest_write(requests_mock):
+    view_id = str(uuid.uuid4())
+    asset_ids = [str(uuid.uuid4()) for _ in range(3)]
+    for asset_id in asset_ids:
+        requests_mock.put(
+            MetadataSpec.gen_url(UPDATE_ASSET_METADATA.format(asset_id, view_id)),
+            json={"object_id": asset_id},
+        )
+    client = PythonikClient(app_id="app", auth_token="token", timeout=3)
+    buffer = MetadataWriteBuffer(client.metadata(), window=60, max_pending=2)
+    try:
+        futures = [
+            buffer.update_asset_metadata(asset_id, view_id, _values(title="A"))
+            for asset_id in asset_ids
+        ]
+        # the first write made room for the third
+        assert futures[0].result(timeout=5).response.ok
+        assert len(buffer) == 2
+    finally:
+        buffer.close()
+    assert all(future.done() for future in futures)
+
+
+def test_skipped_write_resolves_with_ok_response(requests_mock):
+    asset_id = str(uuid.uuid4())
+    view_id = str(uuid.uuid4())
+    requests_mock.get(
+        MetadataSpec.gen_url(f"assets/{asset_id}/views/{view_id}/"),
+        json=_values(title="A", status="new"),
+    )
+    put = requests_mock.put(
+        MetadataSpec.gen_url(UPDATE_ASSET_METADATA.format(asset_id, view_id)),
+        json={"object_id": asset_id},
+    )
+    client = PythonikClient(app_id="app", auth_token="token", timeout=3)
+
+    with MetadataWriteBuffer(client.metadata(), window=60, skip_unchanged=True) as buffer:
+        first = buffer.update_asset_metadata(asset_id, view_id, _values(title="A"))
+        second = buffer.update_asset_metadata(asset_id, view_id, _values(status="new"))
+
+    # the merged write matches the current values and is not sent
+    assert put.call_count == 0
+    result = first.result()
+    assert result is second.result()
+    assert result.skipped
+    assert result.response.ok
+    result.response.raise_for_status()
+    assert client.metadata_stats.writes_skipped == 1
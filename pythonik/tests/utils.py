@@ -1,9 +1,13 @@
 import base64
 import hashlib
 import urllib.parse
+import threading
 import uuid
 import xml.etree.ElementTree as ET
+from contextlib import contextmanager
 from datetime import datetime, UTC
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator, Type
 from xml.dom import minidom
 
 
@@ -96,3 +100,16 @@ def generate_mock_gcs_upload_url(
     final_url = f"{base_url}?{encoded_params}"
 
     return final_url
+
+
+@contextmanager
+def local_server(handler: Type[BaseHTTPRequestHandler]) -> Iterator[str]:
+    """Serve `handler` on a free local port in a thread; yields the base URL"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,161 @@
+import re
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Mapping, Optional, Union
+
+from pythonik.models.metadata.fields import FieldResponse, IconikFieldType
+from pythonik.models.metadata.views import ViewField
+
+
+FieldDefinition = Union[FieldResponse, ViewField]
+
+EMAIL_PATTERN = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+
+def _is_integer(value: Any) -> bool:
+    if isinstance(value, bool):
+        return False
+    if isinstance(value, int):
+        return True
+    if isinstance(value, float):
+        return value.is_integer()
+    try:
+        int(value)
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
+def _is_number(value: Any) -> bool:
+    if isinstance(value, bool):
+        return False
+    try:
+        float(value)
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
+def _is_boolean(value: Any) -> bool:
+    return isinstance(value, bool) or (
+        isinstance(value, str) and value.lower() in ("true", "false")
+    )
+
+
+def _is_date(value: Any) -> bool:
+    try:
+        date.fromisoformat(value[:10])
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
+def _is_datetime(value: Any) -> bool:
+    try:
+        datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (AttributeError, TypeError, ValueError):
+        return False
+    return True
+
+
+def _is_url(value: Any) -> bool:
+    return isinstance(value, str) and value.startswith(("http://", "https://"))
+
+
+def _is_email(value: Any) -> bool:
+    return isinstance(value, str) and bool(EMAIL_PATTERN.match(value))
+
+
+TYPE_CHECKS: Dict[str, Callable[[Any], bool]] = {
+    IconikFieldType.INTEGER.value: _is_integer,
+    IconikFieldType.FLOAT.value: _is_number,
+    IconikFieldType.BOOLEAN.value: _is_boolean,
+    IconikFieldType.DATE.value: _is_date,
+    IconikFieldType.DATETIME.value: _is_datetime,
+    IconikFieldType.URL.value: _is_url,
+    IconikFieldType.EMAIL.value: _is_email,
+}
+
+NUMERIC_FIELD_TYPES = frozenset(
+    {IconikFieldType.INTEGER.value, IconikFieldType.FLOAT.value}
+)
+
+
+def _field_type(definition: FieldDefinition) -> Optional[str]:
+    field_type = definition.field_type
+    return field_type.value if isinstance(field_type, IconikFieldType) else field_type
+
+
+def validate_field_values(
+    name: str, values: List[Any], definition: FieldDefinition
+) -> List[str]:
+    """
+    Check the values written to one field against its definition.
+
+    Args:
+        name: Name of the field
+        values: The values being written, an empty list clears the field
+        definition: The field's FieldResponse or ViewField definition
+
+    Returns:
+        A list of error messages, empty if the values are valid
+    """
+    errors = []
+    if not values:
+        if definition.required:
+            errors.append(f"{name}: field is required")
+        return errors
+    if len(values) > 1 and not definition.multi:
+        errors.append(f"{name}: field takes a single value, got {len(values)}")
+
+    field_type = _field_type(definition)
+    check = TYPE_CHECKS.get(field_type)
+    options = {option.value for option in definition.options or []}
+    for value in values:
+        if value is None:
+            continue
+        if check is not None and not check(value):
+            errors.append(f"{name}: {value!r} is not a valid {field_type}")
+            continue
+        if options and str(value) not in options:
+            errors.append(f"{name}: {value!r} is not one of the field's options")
+        if field_type in NUMERIC_FIELD_TYPES:
+            number = float(value)
+            if definition.min_value is not None and number < definition.min_value:
+                errors.append(f"{name}: {value!r} is below {definition.min_value}")
+            if definition.max_value is not None and number > definition.max_value:
+                errors.append(f"{name}: {value!r} is above {definition.max_value}")
+    return errors
+
+
+def validate_metadata_values(
+    metadata_values: Mapping[str, Any],
+    fields: Mapping[str, Optional[FieldDefinition]],
+) -> List[str]:
+    """
+    Check serialized metadata_values against field definitions.
+
+    Fields without a definition are reported as unknown. Required fields
+    are only checked when they are being cleared, since a write does not
+    have to include every field.
+
+    Args:
+        metadata_values: Metadata values by field name, as
+            {"field_values": [{"value": ...}]} entries
+        fields: Field definitions by field name
+
+    Returns:
+        A list of error messages, empty if the values are valid
+    """
+    errors = []
+    for name, entry in metadata_values.items():
+        definition = fields.get(name)
+        if definition is None:
+            errors.append(f"{name}: unknown field")
+            continue
+        field_values = (entry or {}).get("field_values") or []
+        values = [
+            value.get("value") if isinstance(value, dict) else value
+            for value in field_values
+        ]
+        errors.extend(validate_field_values(name, values, definition))
+    return errors
@@ -0,0 +1,70 @@
+import json
+import os
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, Optional
+
+from pythonik.models.search.watermark import Watermark
+
+
+class WatermarkStore(ABC):
+    """
+    Where change feeds keep their watermarks, one per key.
+
+    Subclass and implement `load` and `save` to keep watermarks elsewhere,
+    e.g. in a database shared by several workers.
+    """
+
+    @abstractmethod
+    def load(self, key: str) -> Optional[Watermark]:
+        """Return the watermark saved under `key`, None if there is none"""
+
+    @abstractmethod
+    def save(self, key: str, watermark: Watermark) -> None:
+        """Save the watermark under `key`, replacing the previous one"""
+
+
+class MemoryWatermarkStore(WatermarkStore):
+    """Keeps watermarks for the lifetime of the process."""
+
+    def __init__(self):
+        self._watermarks: Dict[str, Watermark] = {}
+
+    def load(self, key: str) -> Optional[Watermark]:
+        return self._watermarks.get(key)
+
+    def save(self, key: str, watermark: Watermark) -> None:
+        self._watermarks[key] = watermark
+
+
+class FileWatermarkStore(WatermarkStore):
+    """
+    Keeps watermarks in a JSON file, replaced atomically on every save.
+
+    Args:
+        path: Path of the JSON file
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _read(self) -> Dict[str, dict]:
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path) as f:
+            return json.load(f)
+
+    def load(self, key: str) -> Optional[Watermark]:
+        with self._lock:
+            data = self._read().get(key)
+        return Watermark.model_validate(data) if data is not None else None
+
+    def save(self, key: str, watermark: Watermark) -> None:
+        with self._lock:
+            data = self._read()
+            data[key] = watermark.model_dump()
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
@@ -0,0 +1,234 @@
+import atexit
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from loguru import logger
+
+from pythonik.models.mutation.metadata.mutate import UpdateMetadata
+from pythonik.specs.base import Spec
+from pythonik.specs.metadata import MetadataSpec
+
+
+DEFAULT_WRITE_WINDOW = 1.0
+DEFAULT_MAX_WRITE_DELAY = 5.0
+DEFAULT_MAX_PENDING_WRITES = 1000
+
+
+class _PendingWrite:
+    __slots__ = ("target", "metadata_values", "futures", "first_at", "last_at")
+
+    def __init__(self, target: Tuple[Any, ...]):
+        self.target = target
+        self.metadata_values: Dict[str, Any] = {}
+        self.futures: List[Future] = []
+        self.first_at = self.last_at = time.monotonic()
+
+
+class MetadataWriteBuffer:
+    """
+    Write-behind buffer that coalesces metadata updates per (object, view).
+
+    Updates for the same object and view that arrive within `window`
+    seconds of each other are merged field by field, later values winning,
+    and sent as one PUT. A pending write is sent at the latest `max_delay`
+    seconds after its first update, and no more than `max_pending` writes
+    are held: callers block until a slot frees up. Pending writes are
+    flushed by `close()`, when leaving a `with` block, and at interpreter
+    exit.
+
+    Each update returns a Future resolved with the Response of the PUT that
+    carried it.
+
+    Args:
+        spec: The MetadataSpec used to send writes
+        window: Seconds of quiet after which a pending write is sent
+        max_delay: Longest time in seconds a write is held back
+        max_pending: Most (object, view) writes held at once
+        **kwargs: Additional kwargs passed to every write, e.g.
+            skip_unchanged=True
+    """
+
+    def __init__(
+        self,
+        spec: MetadataSpec,
+        window: float = DEFAULT_WRITE_WINDOW,
+        max_delay: float = DEFAULT_MAX_WRITE_DELAY,
+        max_pending: int = DEFAULT_MAX_PENDING_WRITES,
+        **kwargs,
+    ):
+        if max_pending < 1:
+            raise ValueError("max_pending must be at least 1")
+        self.spec = spec
+        self.window = window
+        self.max_delay = max(max_delay, window)
+        self.max_pending = max_pending
+        self.write_kwargs = kwargs
+        self._pending: "OrderedDict[Tuple[Any, ...], _PendingWrite]" = OrderedDict()
+        self._condition = threading.Condition()
+        self._send_lock = threading.Lock()
+        self._waiting = 0
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name="pythonik-metadata-writer", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    def update_asset_metadata(
+        self,
+        asset_id: str,
+        view_id: str,
+        metadata: Union[UpdateMetadata, Dict[str, Any]],
+    ) -> Future:
+        """Queue an update of an asset's view, see MetadataSpec.update_asset_metadata"""
+        return self._enqueue(("asset", asset_id, view_id), metadata)
+
+    def put_object_view_metadata(
+        self,
+        asset_id: str,
+        object_type: str,
+        object_id: str,
+        view_id: str,
+        metadata: Union[UpdateMetadata, Dict[str, Any]],
+    ) -> Future:
+        """Queue an update of a sub-object view, see MetadataSpec.put_object_view_metadata"""
+        return self._enqueue(
+            ("object", asset_id, object_type, object_id, view_id), metadata
+        )
+
+    def _enqueue(self, target: Tuple[Any, ...], metadata) -> Future:
+        values = Spec._prepare_model_data(metadata).get("metadata_values") or {}
+        future = Future()
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("MetadataWriteBuffer is closed")
+            self._waiting += 1
+            try:
+                while (
+                    target not in self._pending
+                    and len(self._pending) >= self.max_pending
+                ):
+                    self._condition.notify_all()
+                    self._condition.wait()
+            finally:
+                self._waiting -= 1
+            write = self._pending.get(target)
+            if write is None:
+                write = self._pending[target] = _PendingWrite(target)
+            else:
+                self.spec.stats.increment("writes_coalesced")
+            write.metadata_values.update(values)
+            write.futures.append(future)
+            write.last_at = time.monotonic()
+            self._condition.notify_all()
+        return future
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def _deadline(self, write: _PendingWrite) -> float:
+        return min(write.last_at + self.window, write.first_at + self.max_delay)
+
+    def _take_due(self) -> List[_PendingWrite]:
+        """Remove and return the writes that are due"""
+        now = time.monotonic()
+        due = [
+            target
+            for target, write in self._pending.items()
+            if self._closed or self._deadline(write) <= now
+        ]
+        if not due and self._full():
+            # callers are blocked on a full buffer, make room with the oldest write
+            due = [next(iter(self._pending))]
+        writes = [self._pending.pop(target) for target in due]
+        if writes:
+            self._condition.notify_all()
+        return writes
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._closed and not self._has_due():
+                    self._condition.wait(self._next_wait())
+                if self._closed and not self._pending:
+                    return
+            # writes are taken and sent under the send lock so that writes to
+            # the same object and view are always sent in order
+            with self._send_lock:
+                with self._condition:
+                    due = self._take_due()
+                for write in due:
+                    self._send(write)
+
+    def _has_due(self) -> bool:
+        if self._full():
+            return True
+        now = time.monotonic()
+        return any(self._deadline(write) <= now for write in self._pending.values())
+
+    def _full(self) -> bool:
+        """Whether callers are blocked waiting for room"""
+        return bool(self._waiting) and len(self._pending) >= self.max_pending
+
+    def _next_wait(self) -> Optional[float]:
+        now = time.monotonic()
+        return min(
+            (self._deadline(write) - now for write in self._pending.values()),
+            default=None,
+        )
+
+    def _send(self, write: _PendingWrite) -> None:
+        metadata = {"metadata_values": write.metadata_values}
+        try:
+            if write.target[0] == "asset":
+                _, asset_id, view_id = write.target
+                response = self.spec.update_asset_metadata(
+                    asset_id, view_id, metadata, **self.write_kwargs
+                )
+            else:
+                _, asset_id, object_type, object_id, view_id = write.target
+                response = self.spec.put_object_view_metadata(
+                    asset_id,
+                    object_type,
+                    object_id,
+                    view_id,
+                    metadata,
+                    **self.write_kwargs,
+                )
+        except Exception as e:
+            logger.error("Buffered metadata write to {} failed: {}", write.target, e)
+            for future in write.futures:
+                future.set_exception(e)
+            return
+        for future in write.futures:
+            future.set_result(response)
+
+    def flush(self) -> None:
+        """Send every pending write now and wait for them to complete"""
+        with self._send_lock:
+            with self._condition:
+                writes = list(self._pending.values())
+                self._pending.clear()
+                self._condition.notify_all()
+            for write in writes:
+                self._send(write)
+
+    def close(self) -> None:
+        """Flush pending writes and stop the background writer"""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+        atexit.unregister(self.close)
+        self._thread.join()
+        self.flush()
+
+    def __enter__(self) -> "MetadataWriteBuffer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()